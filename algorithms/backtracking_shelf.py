@@ -1,51 +1,130 @@
 """
 Algoritmo de Backtracking para encontrar la combinación óptima de libros en una estantería
 sin exceder el peso máximo y maximizando el valor total.
+
+Se resuelve con ramificación y poda "best-first" (problema de la mochila 0/1):
+
+- Los libros se ordenan por densidad de valor (valor / peso).
+- Cada nodo decide incluir o no el siguiente libro; su cota superior es la
+  relajación fraccionaria (llenar el peso restante con los libros más
+  densos, el último de forma parcial).
+- Siempre se expande el nodo con la mejor cota y se descartan las ramas
+  cuya cota no supera la mejor solución encontrada.
+
+Así se trabaja con todo el inventario (sin límite de 10 libros) y el
+resultado es el óptimo exacto. La búsqueda no imprime nada; mostrar la
+solución le corresponde a quien la llama.
 """
 
-from models.book import Book
-from services.book_service import get_all_books
+import heapq
 
-MAX_WEIGHT = 8.0  # kg
+from algorithms.shelf_constants import MAX_WEIGHT, WEIGHT_EPSILON
 
-def optimal_shelf_backtracking(books, max_weight=MAX_WEIGHT):
-    # Limitar a los primeros 10 libros para evitar combinaciones excesivas
-    books = books[:10]
-    n = len(books)
+
+def _density(book):
+    if book.weight <= 0:
+        return float("inf")
+    return book.value / book.weight
+
+
+def _upper_bound(items, level, weight, value, max_weight):
+    """Valor máximo alcanzable desde el nodo permitiendo fracciones de libro."""
+    remaining = max_weight - weight
+    bound = value
+    for i in range(level, len(items)):
+        book = items[i]
+        if book.weight <= remaining + WEIGHT_EPSILON:
+            remaining -= book.weight
+            bound += book.value
+        else:
+            bound += book.value * remaining / book.weight
+            break
+    return bound
+
+
+def _taken_books(items, taken):
+    """Reconstruye la lista de libros desde la lista enlazada (índice, padre)."""
+    chosen = []
+    while taken is not None:
+        index, taken = taken
+        chosen.append(items[index])
+    chosen.reverse()
+    return chosen
+
+
+def optimal_shelf_branch_and_bound(books, max_weight=MAX_WEIGHT):
+    """
+    Combinación de libros de mayor valor total con peso <= max_weight.
+
+    Returns:
+        (list[Book], valor_total). Lista vacía y 0 si ningún libro cabe.
+    """
+    items = [b for b in books if b.weight <= max_weight + WEIGHT_EPSILON and b.value > 0]
+    items.sort(key=_density, reverse=True)
+    n = len(items)
+    if n == 0:
+        return [], 0
+
+    # Solución inicial voraz (por densidad): da una cota inferior para podar
     best_value = 0
-    best_combination = []
-    soluciones_validas = []
-
-    def backtrack(index, current_combination, current_weight, current_value):
-        nonlocal best_value, best_combination
-        if current_weight > max_weight:
-            return
-        if index == n:
-            # Solo mostrar soluciones con al menos un libro
-            if current_weight <= max_weight and len(current_combination) > 0:
-                soluciones_validas.append((current_combination[:], current_weight, current_value))
-                print(f"✔️ Solución válida: {[b.title for b in current_combination]} | Peso: {current_weight:.2f} kg | Valor: {current_value}")
-            if current_value > best_value and len(current_combination) > 0:
-                best_value = current_value
-                best_combination = current_combination[:]
-            return
-        # Opción 1: incluir el libro actual
-        book = books[index]
-        backtrack(index + 1,
-                  current_combination + [book],
-                  current_weight + book.weight,
-                  current_value + book.value)
-        # Opción 2: no incluir el libro actual
-        backtrack(index + 1,
-                  current_combination,  
-                  current_weight,
-                  current_value)
-
-    backtrack(0, [], 0, 0)
-    print(f"\nMejor combinación encontrada:")
-    print(f"Libros: {[b.title for b in best_combination]}")
-    print(f"Valor total: ${best_value}")
-    print(f"Peso total: {sum(b.weight for b in best_combination):.2f} kg")
-    return best_combination, best_value
+    best_taken = None
+    weight = 0.0
+    for i, book in enumerate(items):
+        if weight + book.weight <= max_weight + WEIGHT_EPSILON:
+            weight += book.weight
+            best_value += book.value
+            best_taken = (i, best_taken)
+
+    # Cola de prioridad por cota (heapq es de mínimos: se guarda -cota).
+    # Los libros elegidos se guardan como lista enlazada (índice, padre)
+    # para no copiar listas en cada nodo.
+    counter = 0
+    root_bound = _upper_bound(items, 0, 0.0, 0, max_weight)
+    heap = [(-root_bound, counter, 0, 0.0, 0, None)]
+
+    while heap:
+        neg_bound, _, level, weight, value, taken = heapq.heappop(heap)
+        if -neg_bound <= best_value:
+            break  # Ningún nodo pendiente puede mejorar la solución
+        if level == n:
+            continue
+
+        book = items[level]
+
+        # Rama 1: incluir el libro
+        new_weight = weight + book.weight
+        if new_weight <= max_weight + WEIGHT_EPSILON:
+            new_value = value + book.value
+            new_taken = (level, taken)
+            if new_value > best_value:
+                best_value = new_value
+                best_taken = new_taken
+            bound = _upper_bound(items, level + 1, new_weight, new_value, max_weight)
+            if bound > best_value:
+                counter += 1
+                heapq.heappush(heap, (-bound, counter, level + 1, new_weight, new_value, new_taken))
 
+        # Rama 2: no incluir el libro
+        bound = _upper_bound(items, level + 1, weight, value, max_weight)
+        if bound > best_value:
+            counter += 1
+            heapq.heappush(heap, (-bound, counter, level + 1, weight, value, taken))
+
+    chosen = _taken_books(items, best_taken)
+
+    # Devolver los libros en el orden en que llegaron
+    position = {id(b): i for i, b in enumerate(books)}
+    chosen.sort(key=lambda b: position[id(b)])
+    return chosen, best_value
+
+
+def optimal_shelf_backtracking(books, max_weight=MAX_WEIGHT):
+    """
+    Combinación óptima de libros para una estantería de max_weight kg.
+    Se mantiene con este nombre por compatibilidad; usa ramificación y
+    poda sobre todos los libros.
 
+    Returns:
+        (list[Book], valor_total)
+    """
+    return optimal_shelf_branch_and_bound(books, max_weight)
@@ -1,12 +1,14 @@
 def binary_search_isbn(books, isbn):
+    isbn = str(isbn)
     left, right = 0, len(books) - 1
     
     while left <= right:
         mid = (left + right) // 2
+        mid_isbn = books[mid].isbn  # Book.isbn ya es str
         
-        if str(books[mid].isbn) == isbn:
+        if mid_isbn == isbn:
             return books[mid] 
-        elif str(books[mid].isbn) < isbn:
+        elif mid_isbn < isbn:
             left = mid + 1
         else:
             right = mid - 1
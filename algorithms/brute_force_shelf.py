@@ -3,8 +3,17 @@ Brute Force Shelf Algorithm (Manual Version)
 --------------------------------------------
 Generates all combinations of 4 books manually without itertools.
 This is the pure brute-force version required in some assignments.
+
+It also provides a streaming generator version with weight-sorted pruning
+(count-only, paginated and top-k-by-value modes).
 """
 
+import heapq
+from bisect import bisect_right
+from itertools import islice
+
+from algorithms.shelf_constants import WEIGHT_EPSILON
+
 
 def brute_force_shelf_manual(books, max_weight=8, size=4):
     """
@@ -32,7 +41,147 @@ def brute_force_shelf_manual(books, max_weight=8, size=4):
                     combo = [books[i], books[j], books[k], books[m]]
                     total = sum(b.weight for b in combo)
 
-                    if total <= max_weight:
+                    if total <= max_weight + WEIGHT_EPSILON:
                         valid_combinations.append(combo)
 
     return valid_combinations
+
+
+# --- VERSIÓN POR GENERADOR CON PODA ---
+#
+# brute_force_shelf_manual guarda todas las combinaciones válidas en una
+# lista y suma los pesos de cada candidata desde cero. Las funciones de
+# abajo ordenan los libros por peso y recorren las combinaciones con un
+# generador: si con el peso acumulado ni siquiera los libros más livianos
+# que quedan caben, se corta ese ciclo y todos los siguientes (los libros
+# que siguen pesan más).
+
+def iter_valid_index_combinations(weights, max_weight=8, size=4, first_indices=None):
+    """
+    Genera las combinaciones válidas como tuplas de índices crecientes.
+
+    Args:
+        weights (list[float]): pesos ORDENADOS de menor a mayor
+        max_weight (float): peso máximo permitido
+        size (int): cantidad de libros por combinación
+        first_indices (iterable[int] | None): valores permitidos para el
+            primer índice (None = todos). Permite repartir el trabajo.
+
+    Yields:
+        tuple[int, ...]: índices dentro de `weights`
+    """
+    n = len(weights)
+    if size <= 0 or size > n:
+        return
+
+    # prefix[i] = suma de weights[:i]: peso mínimo de r libros desde j es
+    # prefix[j + r] - prefix[j]
+    prefix = [0.0]
+    for w in weights:
+        prefix.append(prefix[-1] + w)
+    limit = max_weight + WEIGHT_EPSILON
+
+    if first_indices is None:
+        first_indices = range(n - size + 1)
+
+    combo = [0] * size
+
+    def extend(depth, start, weight):
+        remaining = size - depth
+        if remaining == 1:
+            # Último libro: todos los j con weights[j] <= restante, por bisect
+            end = bisect_right(weights, limit - weight, start)
+            for j in range(start, end):
+                combo[depth] = j
+                yield tuple(combo)
+            return
+        for j in range(start, n - remaining + 1):
+            if weight + prefix[j + remaining] - prefix[j] > limit:
+                break  # Con j o cualquier índice mayor ya no cabe
+            combo[depth] = j
+            yield from extend(depth + 1, j + 1, weight + weights[j])
+
+    for i in first_indices:
+        if i > n - size or prefix[i + size] - prefix[i] > limit:
+            continue
+        combo[0] = i
+        if size == 1:
+            yield (i,)
+        else:
+            yield from extend(1, i + 1, weights[i])
+
+
+def _sorted_by_weight(books):
+    return sorted(books, key=lambda b: b.weight)
+
+
+def iter_shelf_combinations(books, max_weight=8, size=4):
+    """
+    Genera una a una las combinaciones válidas de `size` libros (tuplas de
+    Book), sin guardarlas en memoria. Los libros de cada combinación
+    aparecen de menor a mayor peso.
+    """
+    ordered = _sorted_by_weight(books)
+    weights = [b.weight for b in ordered]
+    for indices in iter_valid_index_combinations(weights, max_weight, size):
+        yield tuple(ordered[i] for i in indices)
+
+
+def count_valid_index_combinations(weights, max_weight=8, size=4, first_indices=None):
+    """
+    Cantidad de combinaciones válidas sin construirlas (mismos argumentos
+    que iter_valid_index_combinations). El último libro de cada combinación
+    se cuenta con una búsqueda binaria.
+    """
+    n = len(weights)
+    if size <= 0 or size > n:
+        return 0
+
+    prefix = [0.0]
+    for w in weights:
+        prefix.append(prefix[-1] + w)
+    limit = max_weight + WEIGHT_EPSILON
+
+    def count(depth, start, weight):
+        remaining = size - depth
+        if remaining == 1:
+            return max(0, bisect_right(weights, limit - weight, start) - start)
+        total = 0
+        for j in range(start, n - remaining + 1):
+            if weight + prefix[j + remaining] - prefix[j] > limit:
+                break
+            total += count(depth + 1, j + 1, weight + weights[j])
+        return total
+
+    if first_indices is None:
+        return count(0, 0, 0.0)
+
+    total = 0
+    for i in first_indices:
+        if i > n - size or prefix[i + size] - prefix[i] > limit:
+            continue
+        total += 1 if size == 1 else count(1, i + 1, weights[i])
+    return total
+
+
+def count_shelf_combinations(books, max_weight=8, size=4):
+    """Cantidad de combinaciones válidas de `size` libros, sin construirlas."""
+    return count_valid_index_combinations(sorted(b.weight for b in books), max_weight, size)
+
+
+def page_shelf_combinations(books, page=1, page_size=10, max_weight=8, size=4):
+    """Página `page` (desde 1) de las combinaciones válidas, en orden estable."""
+    start = (page - 1) * page_size
+    return list(islice(iter_shelf_combinations(books, max_weight, size), start, start + page_size))
+
+
+def top_shelf_combinations_by_value(books, k=10, max_weight=8, size=4):
+    """
+    Las k combinaciones válidas de mayor valor total (de mayor a menor).
+    Solo guarda k combinaciones a la vez (heap de tamaño k).
+    """
+    return heapq.nlargest(
+        k,
+        iter_shelf_combinations(books, max_weight, size),
+        key=lambda combo: sum(b.value for b in combo),
+    )
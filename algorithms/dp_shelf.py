@@ -0,0 +1,160 @@
+"""
+Programación Dinámica para la estantería óptima
+-----------------------------------------------
+Mochila 0/1 con los pesos discretizados (por defecto a gramos): la tabla
+best[c] guarda el mayor valor alcanzable con capacidad c. Cada libro
+actualiza toda la tabla de una vez; con NumPy es una sola operación
+vectorizada (maximum) por libro. Si NumPy no está instalado se usa la
+misma recurrencia en Python puro.
+
+Costo O(n·W), con W = peso máximo / resolución (8 kg a 1 g -> 8000 celdas),
+sin importar cuántas combinaciones existan.
+
+solve_optimal_shelf() elige automáticamente entre esta DP y la
+ramificación y poda de backtracking_shelf según el tamaño del problema.
+"""
+
+import math
+
+from algorithms.backtracking_shelf import optimal_shelf_branch_and_bound
+from algorithms.shelf_constants import MAX_WEIGHT, WEIGHT_EPSILON
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional
+    np = None
+
+# Resolución de los pesos en kg (0.001 = gramos)
+DEFAULT_RESOLUTION = 0.001
+
+# Selección automática: hasta este número de libros se usa ramificación y
+# poda; por encima, la DP si la tabla n x W no supera el límite de celdas.
+BRANCH_AND_BOUND_MAX_ITEMS = 40
+DP_MAX_CELLS_NUMPY = 50_000_000
+DP_MAX_CELLS_PYTHON = 2_000_000
+
+
+def _units(weight, resolution):
+    """Peso en unidades de la resolución, redondeado hacia arriba (nunca se excede el máximo)."""
+    return math.ceil(weight / resolution - WEIGHT_EPSILON)
+
+
+def _on_grid(weight, resolution):
+    """True si el peso es múltiplo exacto de la resolución."""
+    units = weight / resolution
+    return abs(units - round(units)) < 1e-6
+
+
+def _dp_numpy(weights, values, capacity):
+    best = np.zeros(capacity + 1, dtype=np.int64)
+    take = np.zeros((len(weights), capacity + 1), dtype=bool)
+    for i, (w, v) in enumerate(zip(weights, values)):
+        candidate = best[:capacity + 1 - w] + v
+        improved = candidate > best[w:]
+        take[i, w:] = improved
+        best[w:] = np.maximum(best[w:], candidate)
+    return int(best[capacity]), take
+
+
+def _dp_python(weights, values, capacity):
+    best = [0] * (capacity + 1)
+    take = []
+    for w, v in zip(weights, values):
+        row = bytearray(capacity + 1)
+        # Recorrer las capacidades de mayor a menor para usar cada libro una vez
+        for c in range(capacity, w - 1, -1):
+            candidate = best[c - w] + v
+            if candidate > best[c]:
+                best[c] = candidate
+                row[c] = 1
+        take.append(row)
+    return best[capacity], take
+
+
+def optimal_shelf_dp(books, max_weight=MAX_WEIGHT, resolution=DEFAULT_RESOLUTION, use_numpy=None):
+    """
+    Combinación de libros de mayor valor con peso <= max_weight, por
+    programación dinámica sobre pesos discretizados a `resolution` kg.
+
+    Los pesos se redondean hacia arriba, así que la solución nunca excede
+    max_weight; es óptima exacta cuando los pesos son múltiplos de la
+    resolución (p. ej. pesos con hasta 3 decimales y resolución de 1 g).
+
+    Returns:
+        (list[Book], valor_total)
+    """
+    if use_numpy is None:
+        use_numpy = np is not None
+
+    capacity = int(math.floor(max_weight / resolution + WEIGHT_EPSILON))
+
+    base = []      # Libros sin peso: siempre convienen si tienen valor
+    items = []
+    for book in books:
+        if book.value <= 0:
+            continue
+        w = _units(book.weight, resolution)
+        if w <= 0:
+            base.append(book)
+        elif w <= capacity:
+            items.append((book, w))
+
+    weights = [w for _, w in items]
+    values = [book.value for book, _ in items]
+    if items:
+        solver = _dp_numpy if use_numpy else _dp_python
+        _, take = solver(weights, values, capacity)
+    else:
+        take = []
+
+    # Reconstrucción: desde la capacidad total hacia atrás
+    chosen = []
+    c = capacity
+    for i in range(len(items) - 1, -1, -1):
+        if take[i][c]:
+            chosen.append(items[i][0])
+            c -= weights[i]
+
+    chosen = base + chosen
+    position = {id(b): i for i, b in enumerate(books)}
+    chosen.sort(key=lambda b: position[id(b)])
+    return chosen, sum(b.value for b in chosen)
+
+
+def choose_shelf_solver(books, max_weight=MAX_WEIGHT, resolution=DEFAULT_RESOLUTION):
+    """
+    Elige el algoritmo según el tamaño del problema:
+    - "branch_and_bound" para pocos libros o pesos fuera de la resolución
+      (resultado exacto sin discretizar);
+    - "dp" cuando la tabla n x W cabe en el límite de celdas (tiempo
+      garantizado O(n·W), sin depender de la poda).
+    """
+    n = len(books)
+    if n <= BRANCH_AND_BOUND_MAX_ITEMS:
+        return "branch_and_bound"
+    if not all(_on_grid(b.weight, resolution) for b in books):
+        return "branch_and_bound"
+
+    cells = n * (max_weight / resolution)
+    limit = DP_MAX_CELLS_NUMPY if np is not None else DP_MAX_CELLS_PYTHON
+    return "dp" if cells <= limit else "branch_and_bound"
+
+
+def solve_optimal_shelf(books, max_weight=MAX_WEIGHT, method="auto", resolution=DEFAULT_RESOLUTION):
+    """
+    Estantería óptima con el algoritmo indicado ("dp", "branch_and_bound")
+    o elegido automáticamente ("auto").
+
+    Returns:
+        (list[Book], valor_total, método_usado)
+    """
+    if method == "auto":
+        method = choose_shelf_solver(books, max_weight, resolution)
+
+    if method == "dp":
+        chosen, value = optimal_shelf_dp(books, max_weight, resolution)
+    elif method == "branch_and_bound":
+        chosen, value = optimal_shelf_branch_and_bound(books, max_weight)
+    else:
+        raise ValueError(f"Método desconocido: {method}")
+    return chosen, value, method
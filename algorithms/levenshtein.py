@@ -0,0 +1,35 @@
+"""
+Distancia de Levenshtein
+------------------------
+Cantidad mínima de inserciones, eliminaciones o sustituciones de un
+carácter para convertir un texto en otro ("cortazr" -> "cortazar" = 1).
+"""
+
+
+def levenshtein(a, b, max_distance=None):
+    """
+    Distancia de edición entre a y b con programación dinámica por filas.
+
+    Si se indica max_distance, el cálculo se corta en cuanto la distancia
+    supera ese límite y retorna max_distance + 1.
+    """
+    if a == b:
+        return 0
+    if len(a) < len(b):
+        a, b = b, a
+    if max_distance is not None and len(a) - len(b) > max_distance:
+        return max_distance + 1
+
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, start=1):
+        current = [i]
+        for j, cb in enumerate(b, start=1):
+            current.append(min(
+                previous[j] + 1,               # eliminar
+                current[j - 1] + 1,            # insertar
+                previous[j - 1] + (ca != cb),  # sustituir
+            ))
+        if max_distance is not None and min(current) > max_distance:
+            return max_distance + 1
+        previous = current
+    return previous[-1]
@@ -0,0 +1,128 @@
+"""
+Enumeración paralela de combinaciones de estantes
+-------------------------------------------------
+Reparte el rango del primer índice de las combinaciones (ver
+brute_force_shelf.iter_valid_index_combinations) entre varios procesos con
+ProcessPoolExecutor.
+
+- Los libros se envían una sola vez a cada proceso, como arreglos
+  compactos de pesos y valores (array), no como objetos Book.
+- Cada tarea procesa un tramo contiguo de primeros índices y retorna
+  tuplas de índices (o solo un conteo / sus k mejores).
+- Los tramos se recorren en orden, así que el resultado combinado tiene el
+  mismo orden estable que la versión secuencial.
+
+La cantidad de procesos se configura con config.SHELF_WORKERS (variable de
+entorno BIBLIOTECA_WORKERS) o con el argumento `workers`.
+"""
+
+import heapq
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+import config
+from algorithms.brute_force_shelf import (
+    iter_valid_index_combinations,
+    count_valid_index_combinations,
+)
+
+# Con menos libros el costo de crear los procesos supera la ganancia
+PARALLEL_MIN_BOOKS = 60
+
+# Tramos por proceso: los primeros índices tienen muchas más combinaciones
+# que los últimos, así que se usan tramos pequeños para repartir la carga
+CHUNKS_PER_WORKER = 8
+
+# Datos del proceso trabajador (se cargan una vez en _init_worker)
+_weights = None
+_values = None
+
+
+def _init_worker(weights, values):
+    global _weights, _values
+    _weights = list(weights)
+    _values = values
+
+
+def _count_chunk(task):
+    start, end, max_weight, size = task
+    return count_valid_index_combinations(_weights, max_weight, size, range(start, end))
+
+
+def _list_chunk(task):
+    start, end, max_weight, size = task
+    return list(iter_valid_index_combinations(_weights, max_weight, size, range(start, end)))
+
+
+def _top_chunk(task):
+    start, end, max_weight, size, k = task
+    combos = iter_valid_index_combinations(_weights, max_weight, size, range(start, end))
+    scored = ((sum(_values[i] for i in combo), combo) for combo in combos)
+    return heapq.nlargest(k, scored, key=_score)
+
+
+def _score(item):
+    return item[0]
+
+
+def _prepare(books):
+    """Libros ordenados por peso y sus arreglos compactos de peso y valor."""
+    ordered = sorted(books, key=lambda b: b.weight)
+    weights = array("d", (b.weight for b in ordered))
+    values = array("q", (b.value for b in ordered))
+    return ordered, weights, values
+
+
+def _chunks(n, size, workers):
+    last_first = n - size + 1
+    if last_first <= 0:
+        return []
+    step = max(1, -(-last_first // (workers * CHUNKS_PER_WORKER)))
+    return [(start, min(start + step, last_first)) for start in range(0, last_first, step)]
+
+
+def _run(worker_fn, tasks, weights, values, workers):
+    """Ejecuta las tareas en orden (en paralelo si corresponde) y genera sus resultados."""
+    if workers <= 1 or len(weights) < PARALLEL_MIN_BOOKS:
+        _init_worker(weights, values)
+        for task in tasks:
+            yield worker_fn(task)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(weights, values)) as executor:
+        # map conserva el orden de las tareas: resultado estable
+        yield from executor.map(worker_fn, tasks)
+
+
+def parallel_count_shelf_combinations(books, max_weight=8, size=4, workers=None):
+    """Cantidad de combinaciones válidas, contada en paralelo."""
+    workers = workers or config.SHELF_WORKERS
+    _, weights, values = _prepare(books)
+    tasks = [(a, b, max_weight, size) for a, b in _chunks(len(weights), size, workers)]
+    return sum(_run(_count_chunk, tasks, weights, values, workers))
+
+
+def parallel_shelf_combinations(books, max_weight=8, size=4, workers=None):
+    """
+    Genera las combinaciones válidas (tuplas de Book, de menor a mayor peso)
+    en el mismo orden que brute_force_shelf.iter_shelf_combinations.
+    """
+    workers = workers or config.SHELF_WORKERS
+    ordered, weights, values = _prepare(books)
+    tasks = [(a, b, max_weight, size) for a, b in _chunks(len(weights), size, workers)]
+    for index_tuples in _run(_list_chunk, tasks, weights, values, workers):
+        for indices in index_tuples:
+            yield tuple(ordered[i] for i in indices)
+
+
+def parallel_top_shelf_combinations_by_value(books, k=10, max_weight=8, size=4, workers=None):
+    """Las k combinaciones de mayor valor total (de mayor a menor), en paralelo."""
+    workers = workers or config.SHELF_WORKERS
+    ordered, weights, values = _prepare(books)
+    tasks = [(a, b, max_weight, size, k) for a, b in _chunks(len(weights), size, workers)]
+    # Empates: nlargest con key conserva el orden de llegada (igual que la
+    # versión secuencial), y los tramos llegan en orden
+    candidates = (item for chunk in _run(_top_chunk, tasks, weights, values, workers) for item in chunk)
+    best = heapq.nlargest(k, candidates, key=_score)
+    return [tuple(ordered[i] for i in indices) for _, indices in best]
@@ -1,83 +1,68 @@
 """
-Funciones recursivas usadas en los reportes.
-"""
-
-
-def recursive_show_stack(stack):
-    """Imprime una pila usando recursión sin destruir sus datos."""
-    if stack.is_empty():
-        return
+Funciones usadas en los reportes (pilas, colas y libros por autor).
 
-    item = stack.pop()
-    print(f"- {item}")
-
-    recursive_show_stack(stack)
+Recorren los datos una sola vez, sin recursión (no hay límite por
+cantidad de elementos) y sin modificar las estructuras. Las variantes
+iter_* generan los elementos uno a uno (streaming), así los reportes no
+arman listas intermedias.
+"""
 
-    stack.push(item)
-    
+from algorithms.text_normalize import normalize_name
 
 
-def recursive_show_queue(queue):
-    """Imprime una cola usando recursión sin destruir sus datos."""
-    if queue.is_empty():
-        return
+def iter_stack(stack):
+    """Genera los elementos de una pila desde el tope hasta el fondo."""
+    return reversed(stack.items)
 
-    item = queue.dequeue()
-    print(f"- {item}")
 
-    recursive_show_queue(queue)
+def iter_queue(queue):
+    """Genera los elementos de una cola desde el frente hasta el final."""
+    return iter(queue.items)
 
-    queue.enqueue(item)
-# --- NUEVAS FUNCIONES RECURSIVAS PARA REPORTES POR AUTOR ---
 
-def recursive_total_value_by_author(books, author, index=0):
-    """
-    Recursión de pila:
-    Calcula el valor total de todos los libros de un autor específico.
+def _default_format(item):
+    return f"- {item}"
 
-    Cada llamada espera el resultado de la siguiente (acumulación por return),
-    por eso es un ejemplo clásico de recursión de pila.
-    """
-    if index == len(books):
-        return 0
 
-    book = books[index]
-    current_value = book.value if book.author.lower() == author.lower() else 0
+def show_stack(stack, format_item=_default_format):
+    """Imprime una pila desde el tope, sin modificarla."""
+    for item in iter_stack(stack):
+        print(format_item(item))
 
-    # La suma se arma al “regresar” por la pila de llamadas
-    return current_value + recursive_total_value_by_author(books, author, index + 1)
 
+def show_queue(queue, format_item=_default_format):
+    """Imprime una cola desde el frente, sin modificarla."""
+    for item in iter_queue(queue):
+        print(format_item(item))
 
-def _tail_recursive_weight_acc(books, author, index=0, total_weight=0.0, count=0):
-    """
-    Función auxiliar de recursión de cola.
-    Acumula peso total y cantidad de libros del autor.
-    """
-    if index == len(books):
-        return total_weight, count
 
-    book = books[index]
-    if book.author.lower() == author.lower():
-        total_weight += book.weight
-        count += 1
+def iter_books_by_author(books, author):
+    """Genera los libros de un autor (sin importar mayúsculas ni tildes)."""
+    author = normalize_name(author)
+    return (book for book in books if normalize_name(book.author) == author)
 
-    # Mensaje para demostrar la lógica de la recursión de cola por consola
-    print(f"[TAIL] index={index}, peso_acumulado={total_weight:.2f}, cantidad={count}")
 
-    # La llamada recursiva es la ÚLTIMA operación -> recursión de cola
-    return _tail_recursive_weight_acc(books, author, index + 1, total_weight, count)
+def total_value_by_author(books, author):
+    """Valor total de los libros de un autor, en un solo recorrido."""
+    return sum(book.value for book in iter_books_by_author(books, author))
 
 
-def tail_recursive_average_weight_by_author(books, author):
+def average_weight_by_author(books, author, trace=False):
     """
-    Recursión de cola:
-    Calcula el peso promedio de la colección de un autor.
-    Usa _tail_recursive_weight_acc como acumulador.
+    Peso promedio de los libros de un autor, en un solo recorrido. Con
+    trace=True imprime el acumulado de cada paso.
     """
-    total_weight, count = _tail_recursive_weight_acc(books, author)
+    author = normalize_name(author)
+    total_weight = 0.0
+    count = 0
+    for index, book in enumerate(books):
+        if normalize_name(book.author) == author:
+            total_weight += book.weight
+            count += 1
+        if trace:
+            print(f"[TRACE] index={index}, peso_acumulado={total_weight:.2f}, cantidad={count}")
 
     if count == 0:
         return 0.0
 
     return total_weight / count
-
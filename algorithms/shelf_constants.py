@@ -0,0 +1,9 @@
+"""
+Constantes compartidas por los algoritmos de estanterías.
+"""
+
+MAX_WEIGHT = 8.0  # kg
+
+# Tolerancia para comparar sumas de pesos con decimales (0.1 + 0.2 > 0.3).
+# Todos los algoritmos usan la misma, así dan el mismo resultado en el límite.
+WEIGHT_EPSILON = 1e-9
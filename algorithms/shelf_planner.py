@@ -0,0 +1,317 @@
+"""
+Planificador de estanterías (bin packing)
+-----------------------------------------
+Reparte un conjunto de libros en estantes completos respetando los límites
+de cada fila (Shelf.MAX_WEIGHT_PER_ROW kg y Shelf.COLUMNS espacios) y
+usando la menor cantidad de estantes posible.
+
+Todas las filas son equivalentes, así que minimizar estantes equivale a
+minimizar filas (bin packing con peso y cantidad máximos por fila):
+
+1. Dos ubicaciones iniciales, de las que se queda la que usa menos filas:
+   - Best-Fit Decreasing: los libros, de mayor a menor peso, van a la
+     fila con espacio libre a la que menos peso le sobra y donde caben.
+     Las filas se buscan en un índice ordenado por capacidad restante.
+   - Llenado por filas: cada fila empieza con el libro más pesado que
+     queda y se completa con los más pesados que caben, reservando peso
+     para llenar los espacios que faltan con los más livianos. Cuando el
+     límite es la cantidad de espacios (libros livianos) reparte mejor
+     los pesados que Best-Fit.
+2. Búsqueda local: se intenta vaciar las filas menos ocupadas moviendo sus
+   libros a otras filas o intercambiándolos por libros más livianos (que
+   vuelven a la lista de pendientes). Las filas se modifican en su lugar
+   y, si una fila no se puede vaciar, se deshacen los cambios. Se detiene
+   al alcanzar la cota inferior, tras LOCAL_SEARCH_MAX_ROUNDS pasadas sin
+   terminar o al agotar LOCAL_SEARCH_TIME_LIMIT segundos.
+
+Cada libro ocupa un espacio (igual que en Shelf.add_book), sin importar
+su stock. El plan no guarda nada; eso le corresponde a shelf_service.
+"""
+
+import math
+import time
+from bisect import bisect_right
+
+from models.shelf import Shelf
+from algorithms.shelf_constants import WEIGHT_EPSILON
+from structures.sorted_index import SortedIndex
+
+# Máximo de movimientos/intercambios al intentar vaciar una fila
+MAX_RELOCATION_STEPS = 64
+
+# Filas (las de más capacidad restante) revisadas al buscar un intercambio
+SWAP_CANDIDATES = 32
+
+# Límites de la búsqueda local
+LOCAL_SEARCH_MAX_ROUNDS = 20
+LOCAL_SEARCH_TIME_LIMIT = 2.0  # segundos
+
+
+def _weight(book):
+    return book.weight
+
+
+class _Row:
+    """Fila en construcción: libros más peso acumulado (sin volver a sumar)."""
+
+    __slots__ = ("id", "books", "weight", "key")
+
+    def __init__(self, row_id, books=(), weight=0.0):
+        self.id = row_id
+        self.books = list(books)
+        self.weight = weight
+        self.key = None  # Capacidad restante con la que está en el índice
+
+
+class _RowIndex:
+    """
+    Filas indexadas por capacidad restante (SortedIndex de pares
+    (restante, id)):
+
+    - open: filas con algún espacio libre (para ubicar un libro);
+    - all:  todas las filas (para buscar intercambios).
+    """
+
+    def __init__(self, max_weight, slots):
+        self.max_weight = max_weight
+        self.slots = slots
+        self.rows = {}
+        self.open = SortedIndex()
+        self.all = SortedIndex()
+        self._next_id = 0
+
+    def new_row(self, books=(), weight=0.0):
+        row = _Row(self._next_id, books, weight)
+        self._next_id += 1
+        self.add(row)
+        return row
+
+    def add(self, row):
+        self.rows[row.id] = row
+        row.key = self.max_weight - row.weight
+        self.all.add(row.key, row.id)
+        if len(row.books) < self.slots:
+            self.open.add(row.key, row.id)
+
+    def discard(self, row):
+        del self.rows[row.id]
+        self.all.remove(row.key, row.id)
+        self.open.remove(row.key, row.id)
+
+    def update(self, row):
+        """Vuelve a indexar una fila después de cambiar sus libros."""
+        self.discard(row)
+        self.add(row)
+
+    def place(self, row, book):
+        row.books.append(book)
+        row.weight += book.weight
+        self.update(row)
+
+    def best_fit(self, weight):
+        """Fila con espacio libre a la que menos peso le sobra tras ubicar `weight`."""
+        pair = self.open.first_at_least(weight - WEIGHT_EPSILON)
+        return self.rows[pair[1]] if pair is not None else None
+
+    def find_swap(self, book):
+        """
+        (fila, posición) de un libro más liviano que `book` que puede
+        cambiarse por él sin pasar el peso de su fila, o None. Se revisan
+        las SWAP_CANDIDATES filas con más capacidad restante.
+        """
+        for row_id in self.all.largest(SWAP_CANDIDATES):
+            row = self.rows[row_id]
+            best = None
+            for i, other in enumerate(row.books):
+                if (other.weight < book.weight - WEIGHT_EPSILON
+                        and book.weight - other.weight <= row.key + WEIGHT_EPSILON
+                        and (best is None or other.weight > row.books[best].weight)):
+                    best = i
+            if best is not None:
+                return row, best
+        return None
+
+    def __len__(self):
+        return len(self.rows)
+
+
+def best_fit_decreasing(books, max_weight=Shelf.MAX_WEIGHT_PER_ROW, slots=Shelf.COLUMNS):
+    """
+    Asigna los libros a filas con Best-Fit Decreasing (O(n log n)).
+
+    Returns:
+        (filas, sin_ubicar): filas es una lista de listas de Book; sin_ubicar
+        son los libros que pesan más que una fila completa.
+    """
+    index = _RowIndex(max_weight, slots)
+    unplaced = []
+    for book in sorted(books, key=_weight, reverse=True):
+        if book.weight > max_weight + WEIGHT_EPSILON:
+            unplaced.append(book)
+            continue
+        row = index.best_fit(book.weight)
+        if row is None:
+            index.new_row([book], book.weight)
+        else:
+            index.place(row, book)
+    return [row.books for row in index.rows.values()], unplaced
+
+
+def fill_rows_decreasing(books, max_weight=Shelf.MAX_WEIGHT_PER_ROW, slots=Shelf.COLUMNS):
+    """
+    Asigna los libros fila por fila: cada fila empieza con el más pesado
+    que queda y luego toma, para cada espacio, el libro más pesado que deja
+    peso suficiente para completar los espacios restantes con los libros
+    más livianos (si eso no es posible, se reservan menos espacios).
+
+    Returns:
+        (filas, sin_ubicar), igual que best_fit_decreasing.
+    """
+    remaining = sorted((b for b in books if b.weight <= max_weight + WEIGHT_EPSILON), key=_weight)
+    unplaced = [b for b in books if b.weight > max_weight + WEIGHT_EPSILON]
+    weights = [b.weight for b in remaining]
+
+    rows = []
+    while remaining:
+        weights.pop()
+        row = [remaining.pop()]
+        capacity = max_weight - row[0].weight
+        while len(row) < slots and remaining:
+            free = slots - len(row)
+            for reserved in range(min(free - 1, len(remaining)), -1, -1):
+                limit = capacity - sum(weights[:reserved])
+                j = bisect_right(weights, limit + WEIGHT_EPSILON) - 1
+                if j >= reserved:  # No tomar uno de los libros reservados
+                    capacity -= weights.pop(j)
+                    row.append(remaining.pop(j))
+                    break
+            else:
+                break  # Ningún libro cabe en esta fila
+        rows.append(row)
+    return rows, unplaced
+
+
+def min_rows(books, max_weight=Shelf.MAX_WEIGHT_PER_ROW, slots=Shelf.COLUMNS):
+    """Cota inferior de filas necesarias (por cantidad de libros y por peso)."""
+    if not books:
+        return 0
+    by_count = math.ceil(len(books) / slots)
+    by_weight = math.ceil(sum(b.weight for b in books) / max_weight - WEIGHT_EPSILON)
+    return max(by_count, by_weight)
+
+
+def _empty_row(index, target):
+    """
+    Intenta repartir los libros de `target` en las demás filas del índice,
+    modificándolas en su lugar. Si no se puede, deshace los cambios y
+    retorna False.
+    """
+    index.discard(target)
+    saved = {}  # id -> (fila, libros, peso) antes del primer cambio
+    pending = sorted(target.books, key=_weight)
+
+    for _ in range(MAX_RELOCATION_STEPS):
+        if not pending:
+            return True
+        book = pending.pop()  # El más pesado primero
+
+        # 1) Mover a la fila con espacio donde mejor encaje
+        row = index.best_fit(book.weight)
+        if row is not None:
+            saved.setdefault(row.id, (row, list(row.books), row.weight))
+            index.place(row, book)
+            continue
+
+        # 2) Intercambiar por un libro más liviano: el peso pendiente baja
+        #    en cada intercambio, así que la búsqueda no se repite
+        swap = index.find_swap(book)
+        if swap is None:
+            pending.append(book)
+            break
+        row, i = swap
+        saved.setdefault(row.id, (row, list(row.books), row.weight))
+        other = row.books[i]
+        row.books[i] = book
+        row.weight += book.weight - other.weight
+        index.update(row)
+        pending.append(other)
+        pending.sort(key=_weight)
+
+    if not pending:
+        return True
+
+    # Deshacer: restaurar las filas tocadas y volver a indexar la fila objetivo
+    for row, books, weight in saved.values():
+        row.books = books
+        row.weight = weight
+        index.update(row)
+    index.add(target)
+    return False
+
+
+def improve_rows(rows, max_weight=Shelf.MAX_WEIGHT_PER_ROW, slots=Shelf.COLUMNS, lower_bound=0,
+                 max_rounds=LOCAL_SEARCH_MAX_ROUNDS, time_limit=LOCAL_SEARCH_TIME_LIMIT):
+    """
+    Búsqueda local: vacía filas mientras sea posible (empezando por las que
+    tienen menos libros y menos peso). Se detiene al llegar a `lower_bound`
+    filas, tras `max_rounds` pasadas o al superar `time_limit` segundos.
+    """
+    deadline = time.monotonic() + time_limit
+    index = _RowIndex(max_weight, slots)
+    for books in rows:
+        index.new_row(books, sum(b.weight for b in books))
+
+    for _ in range(max_rounds):
+        improved = False
+        order = sorted(index.rows.values(), key=lambda r: (len(r.books), r.weight))
+        for target in order:
+            if len(index) <= lower_bound or time.monotonic() > deadline:
+                break
+            if _empty_row(index, target):
+                improved = True
+        if not improved or len(index) <= lower_bound or time.monotonic() > deadline:
+            break
+
+    return [row.books for row in index.rows.values()]
+
+
+def plan_shelves(books, max_weight=Shelf.MAX_WEIGHT_PER_ROW, slots=Shelf.COLUMNS,
+                 rows_per_shelf=Shelf.ROWS, improve=True, time_limit=LOCAL_SEARCH_TIME_LIMIT):
+    """
+    Plan de ubicación de los libros en la menor cantidad de estantes.
+
+    Returns:
+        dict con:
+        - "shelves": lista de estantes; cada estante es una lista de
+          `rows_per_shelf` filas y cada fila una lista de hasta `slots` Book
+        - "unplaced": libros que no caben en ninguna fila (demasiado pesados)
+        - "rows": filas usadas
+        - "min_shelves": cota inferior de estantes para estos libros
+    """
+    rows, unplaced = min(
+        best_fit_decreasing(books, max_weight, slots),
+        fill_rows_decreasing(books, max_weight, slots),
+        key=lambda result: len(result[0]),
+    )
+    placed = [book for row in rows for book in row]
+    lower_bound = min_rows(placed, max_weight, slots)
+
+    if improve and len(rows) > lower_bound:
+        rows = improve_rows(rows, max_weight, slots, lower_bound, time_limit=time_limit)
+
+    # Filas más pesadas primero y libros de cada fila de mayor a menor peso
+    rows = [sorted(row, key=_weight, reverse=True) for row in rows]
+    rows.sort(key=lambda row: sum(b.weight for b in row), reverse=True)
+
+    shelves = []
+    for start in range(0, len(rows), rows_per_shelf):
+        layout = rows[start:start + rows_per_shelf]
+        layout += [[] for _ in range(rows_per_shelf - len(layout))]
+        shelves.append(layout)
+
+    return {
+        "shelves": shelves,
+        "unplaced": unplaced,
+        "rows": len(rows),
+        "min_shelves": math.ceil(lower_bound / rows_per_shelf),
+    }
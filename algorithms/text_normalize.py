@@ -0,0 +1,30 @@
+"""
+Normalización de Texto
+----------------------
+Convierte títulos, autores y nombres a una forma comparable:
+minúsculas (casefold) y sin tildes, de modo que "García" y "garcia"
+coincidan. tokenize() separa el texto normalizado en palabras y
+normalize_name() compara nombres completos (p. ej. autores).
+"""
+
+import re
+import unicodedata
+
+_WORD = re.compile(r"\w+")
+
+
+def normalize_text(text):
+    """Texto en minúsculas y sin tildes ni diacríticos ("Ñandú" -> "nandu")."""
+    decomposed = unicodedata.normalize("NFKD", str(text))
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return stripped.casefold()
+
+
+def tokenize(text):
+    """Lista de palabras normalizadas del texto."""
+    return _WORD.findall(normalize_text(text))
+
+
+def normalize_name(text):
+    """Nombre normalizado con espacios simples ("  Gabriel  García" -> "gabriel garcia")."""
+    return " ".join(normalize_text(text).split())
@@ -0,0 +1,21 @@
+"""
+Configuración general del sistema de biblioteca.
+"""
+
+import os
+from pathlib import Path
+
+# Carpeta de datos (independiente del lugar donde se ejecute el programa)
+DATA_DIR = Path(__file__).resolve().parent / "data"
+
+# Motor de almacenamiento: "json" (por defecto) o "sqlite".
+# Se puede cambiar sin tocar el código con la variable de entorno
+# BIBLIOTECA_STORAGE=sqlite
+STORAGE_BACKEND = os.environ.get("BIBLIOTECA_STORAGE", "json")
+
+# Base de datos usada por el motor "sqlite"
+SQLITE_PATH = Path(os.environ.get("BIBLIOTECA_SQLITE_PATH", DATA_DIR / "biblioteca.db"))
+
+# Procesos usados para enumerar combinaciones de estantes en paralelo
+# (BIBLIOTECA_WORKERS=1 desactiva el modo paralelo)
+SHELF_WORKERS = int(os.environ.get("BIBLIOTECA_WORKERS", os.cpu_count() or 1))
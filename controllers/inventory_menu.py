@@ -14,13 +14,16 @@ from services.book_service import (
     get_low_stock_books as service_get_low_stock_books,
     update_stock as service_update_stock,
     get_inventory_stats as service_get_inventory_stats,
-    get_ordered_books as service_get_ordered_books
+    binary_search_book_by_isbn as service_binary_search_book_by_isbn,
+    search_books_by_title as service_search_books_by_title,
+    search_books_by_author as service_search_books_by_author,
+    search_books_by_keywords as service_search_books_by_keywords,
+    fuzzy_search_books as service_fuzzy_search_books,
+    book_exists as service_book_exists
 
 )
 from models.book import Book
 "algoritmo para busqueda lineal por titulo o autor o isbn en busqueda binaria, "
-from algorithms.linear_search import linear_search_books
-from algorithms.binary_search import binary_search_isbn 
 from algorithms.merge_sort import merge_sort_books_by_isbn
 
 
@@ -64,9 +67,8 @@ def add_book():
             print("❌ El ISBN no puede estar vacío")
             return
         
-        # Verificar si ya existe
-        existing_book = service_get_book_by_isbn(isbn)
-        if existing_book:
+        # Verificar si ya existe (índice hash, O(1))
+        if service_book_exists(isbn):
             print(f"❌ Ya existe un libro con el ISBN: {isbn}")
             return
         
@@ -158,8 +160,10 @@ def search_book():
 
     print("\n¿Cómo desea buscar?")
     print("1. Por ISBN (búsqueda binaria)")
-    print("2. Por título (búsqueda lineal)")
-    print("3. Por autor (búsqueda lineal)")
+    print("2. Por título (coincidencia parcial)")
+    print("3. Por autor (coincidencia parcial)")
+    print("4. Por palabras clave del título")
+    print("5. Búsqueda aproximada (tolera errores de escritura)")
 
     option = input("\nSeleccione una opción: ").strip()
 
@@ -167,9 +171,9 @@ def search_book():
     # 1. BUSCAR POR ISBN (BINARIA)
     # -------------------------------
     if option == "1":
-        books = merge_sort_books_by_isbn(service_get_all_books())
+        # Búsqueda binaria sobre los ISBN del inventario ordenado
         isbn = input("\nIngrese ISBN: ").strip()
-        book = binary_search_isbn(books, isbn)
+        book = service_binary_search_book_by_isbn(isbn)
 
         if book:
             print("\n✅ Libro encontrado:")
@@ -179,22 +183,13 @@ def search_book():
         return
 
     # -------------------------------
-    # OBTENER LISTA DE LIBROS
-    # -------------------------------
-    books = service_get_all_books()
-
-    if not books:
-        print("\n❌ No hay libros en el inventario.")
-        return
-
-    # -------------------------------
-    # 2. BÚSQUEDA LINEAL POR TÍTULO
+    # 2. BÚSQUEDA POR TÍTULO
     # -------------------------------
     if option == "2":
         title = input("\nIngrese título (coincidencia parcial): ").strip()
 
-        # tu algoritmo lineal aquí ⬇⬇⬇
-        matches = linear_search_books(books, title=title)
+        # Índice de trigramas: no recorre todo el inventario
+        matches = service_search_books_by_title(title)
 
         if matches:
             print(f"\n✅ Se encontraron {len(matches)} libro(s):")
@@ -205,13 +200,12 @@ def search_book():
         return
 
     # -------------------------------
-    # 3. BÚSQUEDA LINEAL POR AUTOR
+    # 3. BÚSQUEDA POR AUTOR
     # -------------------------------
     elif option == "3":
         author = input("\nIngrese autor (coincidencia parcial): ").strip()
 
-        # otra vez tu algoritmo lineal ⬇⬇⬇
-        matches = linear_search_books(books, author=author)
+        matches = service_search_books_by_author(author)
 
         if matches:
             print(f"\n✅ Se encontraron {len(matches)} libro(s):")
@@ -221,6 +215,40 @@ def search_book():
             print(f"\n❌ No se encontraron libros del autor: {author}")
         return
 
+    # -------------------------------
+    # 4. BÚSQUEDA POR PALABRAS CLAVE
+    # -------------------------------
+    elif option == "4":
+        words = input("\nIngrese palabras del título (o su inicio): ").strip()
+
+        # Índice invertido: todas las palabras deben aparecer
+        matches = service_search_books_by_keywords(words, field="title")
+
+        if matches:
+            print(f"\n✅ Se encontraron {len(matches)} libro(s):")
+            for i, book in enumerate(matches):
+                print_book(book, i)
+        else:
+            print(f"\n❌ No se encontraron libros con las palabras: {words}")
+        return
+
+    # -------------------------------
+    # 5. BÚSQUEDA APROXIMADA (ÁRBOL BK)
+    # -------------------------------
+    elif option == "5":
+        query = input("\nIngrese título o autor (aunque tenga errores): ").strip()
+
+        results = service_fuzzy_search_books(query)
+
+        if results:
+            print(f"\n✅ {len(results)} resultado(s) más parecidos:")
+            for i, (book, distance) in enumerate(results):
+                print_book(book, i)
+                print(f"   Diferencia con la búsqueda: {distance}")
+        else:
+            print(f"\n❌ No se encontraron libros parecidos a: {query}")
+        return
+
     else:
         print("\n❌ Opción no válida.")
 
@@ -430,7 +458,7 @@ def show_reservation_queue():
         return
 
     # Obtener una copia de la cola como lista
-    reservations = book.reservations.toList()
+    reservations = book.reservationsList()
 
     if not reservations:
         print("\n📭 No hay reservas para este libro.")
@@ -9,6 +9,7 @@ from services.loan_service import (
     get_all_loans as service_get_all_loans,
     get_active_loans as service_get_active_loans,
     get_overdue_loans as service_get_overdue_loans,
+    get_loans_due_within as service_get_loans_due_within,
     get_loans_by_user as service_get_loans_by_user,
     get_loans_by_book as service_get_loans_by_book,
     renew_loan as service_renew_loan,
@@ -41,8 +42,8 @@ def print_loan(loan: Loan, index=None):
     status = "✅ Devuelto" if loan.returned else ("⚠️ Vencido" if loan.is_overdue() else "📖 Activo")
 
     print(f"\n{prefix} ID: {loan.loan_id[:8]}...")
-    print(f"   Libro: {loan.book.title}")
-    print(f"   Usuario: {loan.user.name}")
+    print(f"   Libro: {loan.book_title}")
+    print(f"   Usuario: {loan.user_name}")
     print(f"   Fecha préstamo: {loan.loan_date.strftime('%Y-%m-%d')}")
     print(f"   Fecha vencimiento: {loan.expiration_date.strftime('%Y-%m-%d')}")
 
@@ -92,7 +93,7 @@ def option_create_loan():
     if not book.isAvalible():
         print("\n⚠️ No hay stock → Reserva automática")
 
-        if any(r == user_id for r in list(book.reservations.items)):
+        if any(r == user_id for r in book.reservationsList()):
             print("❌ El usuario YA está en la cola")
             return
 
@@ -195,6 +196,22 @@ def option_list_overdue():
         print_loan(ln, i)
 
 
+def option_list_due_soon():
+    print_header("PRÓXIMOS A VENCER")
+    days_input = input("Días (7 por defecto): ").strip()
+    try:
+        days = int(days_input) if days_input else 7
+    except:
+        print("Inválido")
+        return
+    loans = service_get_loans_due_within(days)
+    if not loans:
+        print(f"\nNingún préstamo vence en los próximos {days} días")
+        return
+    for i, ln in enumerate(loans):
+        print_loan(ln, i)
+
+
 def option_list_all():
     print_header("HISTORIAL COMPLETO")
     loans = service_get_all_loans()
@@ -294,6 +311,7 @@ def show_menu():
     print("7. Buscar por libro")
     print("8. Renovar préstamo")
     print("9. Ver estadísticas")
+    print("10. Próximos a vencer")
     print("0. Salir")
 
 
@@ -321,6 +339,8 @@ def loan_menu():
             option_renew()
         elif option == "9":
             option_statistics()
+        elif option == "10":
+            option_list_due_soon()
         elif option == "0":
             print("\n👋 Regresando...")
             break
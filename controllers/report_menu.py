@@ -5,22 +5,29 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 # --- Algoritmos ---
 from algorithms.merge_sort import merge_sort_pairs
 from algorithms.report_recursive import (
-    recursive_show_stack,
-    recursive_show_queue,
-    recursive_total_value_by_author,
-    tail_recursive_average_weight_by_author,
+    show_stack,
+    show_queue,
+    total_value_by_author,
+    average_weight_by_author,
 )
-from algorithms.backtracking_shelf import optimal_shelf_backtracking, MAX_WEIGHT
+from algorithms.backtracking_shelf import MAX_WEIGHT
+from algorithms.dp_shelf import solve_optimal_shelf
 
 # --- Servicios ---
-from services.book_service import get_all_books, get_book_by_isbn, _book_to_dict
+from services.book_service import (
+    get_all_books,
+    get_book_by_isbn,
+    _book_to_dict,
+    get_books_by_author_name,
+    get_top_authors_by_value,
+    get_books_sorted_by,
+)
 from services.loan_service import get_loans_by_user
 
 # --- Estructuras ---
 from structures.stack import Stack
 from structures.queue import Queue
 from services.history_service import get_user_history_stack
-from algorithms.merge_sort import merge_sort_books_by_value
 
 
 
@@ -70,12 +77,12 @@ def report_sorted_books():
     pause()
 
 
-#  REPORTE B — HISTORIAL DE PRÉSTAMOS (PILA + RECURSIÓN)
+#  REPORTE B — HISTORIAL DE PRÉSTAMOS (PILA)
 
 def report_loan_history():
     """Muestra el historial de préstamos de un usuario usando una pila."""
 
-    print_header("REPORTE B — HISTORIAL DE PRÉSTAMOS (PILA + RECURSIÓN)")
+    print_header("REPORTE B — HISTORIAL DE PRÉSTAMOS (PILA)")
 
     user_id = input("ID del usuario: ").strip()
     loans = get_loans_by_user(user_id)
@@ -89,15 +96,15 @@ def report_loan_history():
         stack.push(ln)
 
     print("\nHistorial de préstamos:\n")
-    recursive_show_stack(stack)
+    show_stack(stack)
 
     pause()
 
 
-#  REPORTE C — RESERVAS (COLA + RECURSIÓN)
+#  REPORTE C — RESERVAS (COLA)
 
 def report_reservations():
-    print_header("REPORTE C — RESERVAS (COLA + RECURSIÓN)")
+    print_header("REPORTE C — RESERVAS (COLA)")
 
     isbn = input("ISBN del libro: ").strip()
     book = get_book_by_isbn(isbn)
@@ -111,22 +118,13 @@ def report_reservations():
         return
 
     print("\nReservas registradas:\n")
-    recursive_show_queue(book.reservations)
+    show_queue(book.reservations, _format_reservation)
 
     pause()
 
 
-def recursive_show_queue(queue):
-    """Imprime una cola sin modificar su orden."""
-    if queue.is_empty():
-        return
-
-    item = queue.dequeue()
-    print(f"- Usuario: {item['user_id']} | Fecha: {item['date']}")
-
-    recursive_show_queue(queue)
-
-    queue.enqueue(item)
+def _format_reservation(item):
+    return f"- Usuario: {item['user_id']} | Fecha: {item['date']}"
 
 
 def report_lifo_history():
@@ -146,22 +144,21 @@ def report_lifo_history():
         return
 
     print("\nHistorial LIFO del usuario:\n")
-    recursive_show_stack(stack)
+    show_stack(stack)
 
     pause()
     
     
 def report_books_sorted_by_value():
-    print_header("REPORTE GLOBAL — LIBROS ORDENADOS POR VALOR (MERGE SORT)")
+    print_header("REPORTE GLOBAL — LIBROS ORDENADOS POR VALOR")
 
-    books = get_all_books()
+    # Orden mantenido por el índice de valores (sin reordenar el catálogo)
+    sorted_books = get_books_sorted_by("value")
 
-    if not books:
+    if not sorted_books:
         print("\n📦 No hay libros en el inventario")
         return
 
-    sorted_books = merge_sort_books_by_value(books)
-
     print(f"\nTotal de libros: {len(sorted_books)}")
     for i, book in enumerate(sorted_books):
         print(book, i)
@@ -177,53 +174,62 @@ def report_books_sorted_by_value():
 
 
 def report_total_value_by_author():
-    """Reporte: Valor total de los libros de un autor usando recursión de pila."""
-    print_header("REPORTE — VALOR TOTAL POR AUTOR (RECURSIÓN DE PILA)")
+    """Reporte: Valor total de los libros de un autor (índice de autores)."""
+    print_header("REPORTE — VALOR TOTAL POR AUTOR")
 
     author = input("Nombre del autor: ").strip()
-    books = get_all_books()
-
-    if not books:
-        print("\n❌ No hay libros en el sistema.")
-        return
-
-    total_value = recursive_total_value_by_author(books, author)
+    # El índice de autores entrega solo los libros de ese autor
+    books = get_books_by_author_name(author)
+    total = total_value_by_author(books, author)
 
-    if total_value == 0:
+    if not books or total == 0:
         print(f"\n❌ No se encontraron libros del autor: {author}")
     else:
-        print(f"\n💰 Valor total de los libros de '{author}': ${total_value:,}")
+        print(f"\n💰 Valor total de los libros de '{books[0].author}': ${total:,}")
 
     pause()
     
 def report_average_weight_by_author():
-    """Reporte: Peso promedio de los libros de un autor usando recursión de cola."""
-    print_header("REPORTE — PESO PROMEDIO POR AUTOR (RECURSIÓN DE COLA)")
+    """Reporte: Peso promedio de los libros de un autor (índice de autores)."""
+    print_header("REPORTE — PESO PROMEDIO POR AUTOR")
 
     author = input("Nombre del autor: ").strip()
-    books = get_all_books()
+    books = get_books_by_author_name(author)
+    average = average_weight_by_author(books, author)
 
-    if not books:
+    if not books or average == 0:
+        print(f"\n❌ No se encontraron libros del autor: {author}")
+    else:
+        print(f"\n⚖️ Peso promedio de los libros de '{books[0].author}': {average:.2f} kg")
+
+    pause()
+
+
+def report_top_authors():
+    """Reporte: Autores con mayor valor total en el inventario."""
+    print_header("REPORTE — TOP AUTORES POR VALOR")
+
+    top = get_top_authors_by_value(10)
+
+    if not top:
         print("\n❌ No hay libros en el sistema.")
         return
 
-    avg_weight = tail_recursive_average_weight_by_author(books, author)
-
-    if avg_weight == 0:
-        print(f"\n❌ No se encontraron libros del autor: {author}")
-    else:
-        print(f"\n⚖️ Peso promedio de los libros de '{author}': {avg_weight:.2f} kg")
+    print()
+    for i, summary in enumerate(top, start=1):
+        print(f"{i}. {summary['author']} | {summary['count']} libro(s) | "
+              f"${summary['total_value']:,} | {summary['total_weight']:.2f} kg")
 
     pause()
 
 def report_optimal_shelf():
-    """Reporte de estantería óptima (Backtracking)"""
-    print_header("REPORTE — ESTANTERÍA ÓPTIMA (BACKTRACKING)")
+    """Reporte de estantería óptima (ramificación y poda o programación dinámica)"""
+    print_header("REPORTE — ESTANTERÍA ÓPTIMA")
     books = get_all_books()
     if not books:
         print("\n❌ No hay libros en el sistema.")
         return
-    result, total_value = optimal_shelf_backtracking(books)
+    result, total_value, method = solve_optimal_shelf(books)
     if not result:
         print("\n❌ No hay combinación posible dentro del peso máximo.")
         return
@@ -232,6 +238,7 @@ def report_optimal_shelf():
         print(f"- {book.title} | {book.author} | {book.weight} kg | ${book.value}")
     print(f"\nValor total: ${total_value}")
     print(f"Peso total: {sum(b.weight for b in result):.2f} kg")
+    print(f"Algoritmo: {'programación dinámica' if method == 'dp' else 'ramificación y poda'}")
     pause()
 
 
@@ -240,13 +247,14 @@ def report_optimal_shelf():
 def show_reporting_menu():
     print_header("MENÚ DE REPORTES")
     print("1. Libros ordenados (Merge Sort)")
-    print("2. Historial de préstamos (Pila + Recursión)")
-    print("3. Reservas de un libro (Cola + Recursión)")
+    print("2. Historial de préstamos (Pila)")
+    print("3. Reservas de un libro (Cola)")
     print("4. Historial LIFO (Pila persistente)")
     print("5. Libros ordenados por valor COP")
-    print("6. Valor total por autor (Recursión de Pila)")
-    print("7. Peso promedio por autor (Recursión de Cola)")
-    print("8. Estantería óptima (Backtracking)")
+    print("6. Valor total por autor")
+    print("7. Peso promedio por autor")
+    print("8. Estantería óptima")
+    print("9. Top autores por valor")
     print("0. Volver al menú principal")
 
 
@@ -272,6 +280,8 @@ def reports_menu():
             report_average_weight_by_author()
         elif op == "8":
             report_optimal_shelf()
+        elif op == "9":
+            report_top_authors()
         elif op == "0":
             print("\nRegresando al menú principal...")
             break
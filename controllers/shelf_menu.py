@@ -10,16 +10,23 @@ from services.shelf_service import (
     create_or_update_shelf as service_create_or_update_shelf,
     get_shelves as service_get_shelves,
     get_shelf_by_id as service_get_shelf_by_id,
-    delete_shelf as service_delete_shelf
+    delete_shelf as service_delete_shelf,
+    get_shelf_statistics as service_get_shelf_statistics,
+    plan_shelf_placement as service_plan_shelf_placement,
+    apply_shelf_plan as service_apply_shelf_plan
 )
 from services.book_service import get_book_by_isbn as service_get_book_by_isbn
 from models.shelf import Shelf
 from models.book import Book
-from algorithms.brute_force_shelf import brute_force_shelf_manual
+from algorithms.brute_force_shelf import page_shelf_combinations
+from algorithms.parallel_shelf import (
+    parallel_count_shelf_combinations,
+    parallel_top_shelf_combinations_by_value
+)
 from services.book_service import get_all_books
 
-# Combinaciones válidas generadas con fuerza bruta
-VALID_COMBINATIONS = []
+# Combinaciones mostradas por página al crear un estante desde combinación
+COMBINATIONS_PAGE_SIZE = 10
 
 
 def clear_screen():
@@ -363,18 +370,18 @@ def view_shelf_statistics():
     """Opción 9: Ver estadísticas de los estantes"""
     print_header("ESTADÍSTICAS DE ESTANTES")
     
-    shelves = service_get_shelves()
+    stats = service_get_shelf_statistics()
     
-    if not shelves:
+    if not stats["total_shelves"]:
         print("\n📦 No hay estantes registrados")
         return
     
-    total_shelves = len(shelves)
-    total_capacity = sum(shelf.capacity for shelf in shelves)
-    total_books = sum(shelf.get_shelf_info()['total_books'] for shelf in shelves)
-    total_weight = sum(shelf.get_shelf_info()['total_weight'] for shelf in shelves)
-    full_shelves = sum(1 for shelf in shelves if shelf.is_full())
-    empty_shelves = sum(1 for shelf in shelves if shelf.get_shelf_info()['total_books'] == 0)
+    total_shelves = stats["total_shelves"]
+    total_capacity = stats["total_capacity"]
+    total_books = stats["total_books"]
+    total_weight = stats["total_weight"]
+    full_shelves = stats["full_shelves"]
+    empty_shelves = stats["empty_shelves"]
     
     print(f"\n📊 Resumen general:")
     print(f"\n   Total de estantes: {total_shelves}")
@@ -388,9 +395,7 @@ def view_shelf_statistics():
 
 
 def generate_shelf_combinations():
-    """Genera todas las combinaciones válidas de 4 libros (A5 Fuerza Bruta)."""
-    global VALID_COMBINATIONS
-
+    """Cuenta las combinaciones válidas de 4 libros (A5 Fuerza Bruta) sin guardarlas."""
     print_header("GENERAR COMBINACIONES (FUERZA BRUTA)")
 
     books = get_all_books()
@@ -399,36 +404,84 @@ def generate_shelf_combinations():
         print("\n❌ Se necesitan al menos 4 libros en el inventario.")
         return
 
-    print("\n⏳ Generando combinaciones, por favor espere...")
-    VALID_COMBINATIONS = brute_force_shelf_manual(books, max_weight=8)
+    print("\n⏳ Contando combinaciones, por favor espere...")
+    total = parallel_count_shelf_combinations(books, max_weight=8)
 
-    print(f"\n✅ Combinaciones generadas correctamente: {len(VALID_COMBINATIONS)} encontradas.")
+    print(f"\n✅ Combinaciones válidas: {total} encontradas.")
+    print("   Use la opción 11 para verlas por páginas o las de mayor valor.")
 
 
-def save_bruteforce_shelf():
-    """Permite elegir una combinación válida y guardarla como estante."""
-    if not VALID_COMBINATIONS:
-        print("\n❌ Primero genere las combinaciones (opción 10).")
-        return
-
-    print_header("GUARDAR ESTANTE DESDE COMBINACIÓN")
-
-    for idx, combo in enumerate(VALID_COMBINATIONS):
+def _print_combinations(combos, first_number=1):
+    for idx, combo in enumerate(combos, start=first_number):
         titles = [b.title for b in combo]
         weight = sum(b.weight for b in combo)
-        print(f"{idx + 1}. {titles} | Peso total: {weight:.2f} kg")
+        value = sum(b.value for b in combo)
+        print(f"{idx}. {titles} | Peso total: {weight:.2f} kg | Valor: ${value:,}")
+
+
+def _choose_combination(books):
+    """
+    Muestra combinaciones (las de mayor valor o por páginas) y retorna la
+    elegida, o None. Nunca tiene todas las combinaciones en memoria.
+    """
+    print("\n¿Qué combinaciones desea ver?")
+    print(f"1. Las {COMBINATIONS_PAGE_SIZE} de mayor valor")
+    print("2. Todas, por páginas")
+    mode = input("\nSeleccione una opción: ").strip()
+
+    if mode == "1":
+        combos = parallel_top_shelf_combinations_by_value(books, k=COMBINATIONS_PAGE_SIZE, max_weight=8)
+        if not combos:
+            print("\n❌ No hay combinaciones válidas.")
+            return None
+        _print_combinations(combos)
+        answer = input("\nSeleccione número de combinación: ").strip()
+        first_number = 1
+    elif mode == "2":
+        page = 1
+        while True:
+            combos = page_shelf_combinations(books, page, COMBINATIONS_PAGE_SIZE, max_weight=8)
+            if not combos:
+                print("\n❌ No hay más combinaciones válidas.")
+                return None
+            first_number = (page - 1) * COMBINATIONS_PAGE_SIZE + 1
+            print(f"\n--- Página {page} ---")
+            _print_combinations(combos, first_number)
+            answer = input("\nNúmero de combinación ('s' = siguiente página, Enter = cancelar): ").strip().lower()
+            if answer == "s":
+                page += 1
+                continue
+            break
+    else:
+        print("\n❌ Opción inválida.")
+        return None
 
     try:
-        choice = int(input("\nSeleccione número de combinación: ")) - 1
+        choice = int(answer) - first_number
     except ValueError:
         print("\n❌ Opción inválida.")
-        return
+        return None
 
-    if choice < 0 or choice >= len(VALID_COMBINATIONS):
+    if choice < 0 or choice >= len(combos):
         print("\n❌ El número no corresponde a una combinación válida.")
+        return None
+
+    return combos[choice]
+
+
+def save_bruteforce_shelf():
+    """Permite elegir una combinación válida y guardarla como estante."""
+    print_header("GUARDAR ESTANTE DESDE COMBINACIÓN")
+
+    books = get_all_books()
+
+    if len(books) < 4:
+        print("\n❌ Se necesitan al menos 4 libros en el inventario.")
         return
 
-    selected = VALID_COMBINATIONS[choice]
+    selected = _choose_combination(books)
+    if selected is None:
+        return
 
     shelf_id = input("\nIngrese ID para el nuevo estante: ").strip()
 
@@ -451,6 +504,56 @@ def save_bruteforce_shelf():
         print("\n❌ No se pudo crear el estante.")
 
 
+def plan_shelves():
+    """Opción 12: Ubicar libros en la menor cantidad de estantes"""
+    print_header("PLANIFICAR ESTANTES (EMPAQUETADO)")
+
+    print("\n1. Todo el inventario (reemplaza los estantes actuales)")
+    print("2. Solo algunos ISBN (p. ej. después de una entrega)")
+    mode = input("\nSeleccione una opción: ").strip()
+
+    if mode == "1":
+        isbns = None
+    elif mode == "2":
+        raw = input("\nISBN separados por coma: ")
+        isbns = [isbn.strip() for isbn in raw.split(",") if isbn.strip()]
+        if not isbns:
+            print("❌ No se ingresaron ISBN")
+            return
+    else:
+        print("\n❌ Opción no válida.")
+        return
+
+    plan = service_plan_shelf_placement(isbns)
+
+    for isbn in plan["missing"]:
+        print(f"⚠️ No existe un libro con ISBN: {isbn}")
+    for book in plan["unplaced"]:
+        print(f"⚠️ '{book.title}' ({book.weight}kg) supera el peso máximo de una fila")
+
+    if not plan["shelves"]:
+        print("\n❌ No hay libros para ubicar.")
+        return
+
+    for number, layout in enumerate(plan["shelves"], start=1):
+        print(f"\n📚 Estante nuevo #{number}")
+        for i, row in enumerate(layout):
+            titles = ", ".join(book.title[:20] for book in row) or "[Vacía]"
+            weight = sum(book.weight for book in row)
+            print(f"   Fila {i} ({weight:.2f}/{Shelf.MAX_WEIGHT_PER_ROW}kg): {titles}")
+
+    print(f"\n📊 Estantes necesarios: {len(plan['shelves'])} "
+          f"(mínimo teórico: {plan['min_shelves']}) | Filas usadas: {plan['rows']}")
+
+    confirm = input("\n¿Guardar este plan? (s/n): ").strip().lower()
+    if confirm != "s":
+        print("\n❌ Plan descartado")
+        return
+
+    created = service_apply_shelf_plan(plan, replace_all=isbns is None)
+    print(f"\n✅ {len(created)} estante(s) guardado(s): {', '.join(s.id_shelf for s in created)}")
+
+
 def show_menu():
     """Muestra el menú principal de estantes"""
     print_header("SISTEMA DE GESTIÓN DE ESTANTES")
@@ -465,6 +568,7 @@ def show_menu():
     print("9. Ver estadísticas de estantes")
     print("10. Generar combinaciones (A5 Fuerza Bruta)")
     print("11. Crear estante desde combinación válida")
+    print("12. Planificar estantes (todo el inventario o ISBN)")
     print("0. Salir")
 
 
@@ -498,6 +602,8 @@ def shelf_menu():
             generate_shelf_combinations()
         elif option == "11":
             save_bruteforce_shelf()
+        elif option == "12":
+            plan_shelves()
         elif option == "0":
             print("\n👋 Regresando al menú principal...")
             break
@@ -130,7 +130,7 @@ def search_user():
                 loans = service_get_loans_by_user(user_id)
                 for i, loan in enumerate(loans):
                     if not loan.returned:
-                        print(f"\n   [{i + 1}] {loan.book.title}")
+                        print(f"\n   [{i + 1}] {loan.book_title}")
                         print(f"       Vence: {loan.expiration_date.strftime('%Y-%m-%d')}")
                         if loan.is_overdue():
                             print(f"       ⚠️ VENCIDO - {loan.days_overdue()} días de retraso")
@@ -138,7 +138,7 @@ def search_user():
             print(f"\n❌ No se encontró ningún usuario con el ID: {user_id}")
     
     elif option == "2":
-        name = input("\nIngrese nombre (búsqueda parcial): ").strip()
+        name = input("\nIngrese nombre (inicio de nombre o apellido): ").strip()
         users = service_search_users_by_name(name)
         
         if users:
@@ -269,7 +269,7 @@ def view_users_with_loans():
             print(f"\n   📚 Libros prestados:")
             for loan in active_loans:
                 status = "⚠️ VENCIDO" if loan.is_overdue() else "✅ Activo"
-                print(f"      • {loan.book.title} - {status}")
+                print(f"      • {loan.book_title} - {status}")
                 print(f"        Vence: {loan.expiration_date.strftime('%Y-%m-%d')}")
 
 
@@ -311,7 +311,7 @@ def view_user_detail():
         print(f"\n📚 Préstamos activos ({len(active_loans)}):")
         for i, loan in enumerate(active_loans):
             status = "⚠️ VENCIDO" if loan.is_overdue() else "✅ Activo"
-            print(f"\n   [{i + 1}] {loan.book.title}")
+            print(f"\n   [{i + 1}] {loan.book_title}")
             print(f"       Prestado: {loan.loan_date.strftime('%Y-%m-%d')}")
             print(f"       Vence: {loan.expiration_date.strftime('%Y-%m-%d')}")
             print(f"       Estado: {status}")
@@ -322,7 +322,7 @@ def view_user_detail():
     if returned_loans:
         print(f"\n📦 Préstamos devueltos (últimos 5):")
         for i, loan in enumerate(returned_loans[-5:]):
-            print(f"\n   [{i + 1}] {loan.book.title}")
+            print(f"\n   [{i + 1}] {loan.book_title}")
             print(f"       Prestado: {loan.loan_date.strftime('%Y-%m-%d')}")
             print(f"       Devuelto: {loan.return_date.strftime('%Y-%m-%d')}")
 
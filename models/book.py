@@ -9,7 +9,25 @@ class Book:
         self.weight = float(weight)
         self.value = int(value)
         self.stock = int(stock)
-        self.reservations = Queue()
+        # La cola de reservas se crea solo cuando se usa: la mayoría de los
+        # libros nunca tiene reservas
+        self._reservations = None
+
+    @property
+    def reservations(self):
+        if self._reservations is None:
+            self._reservations = Queue()
+        return self._reservations
+
+    @reservations.setter
+    def reservations(self, queue):
+        self._reservations = queue
+
+    def reservationsList(self):
+        """Reservas como lista, sin crear la cola si no existe."""
+        if self._reservations is None:
+            return []
+        return self._reservations.toList()
         
         
     "Utility methods"
@@ -27,8 +45,8 @@ class Book:
             "weight": self.weight,
             "value": self.value,
             "stock": self.stock,
-            "reservation": self.reservations.toList()
+            "reservation": self.reservationsList()
         }
         
     def __str__(self):
-        return f"[{self.isbn}] {self.title} - {self.author} | {self.weight} | {self.value} | {self.stock} | {self.reservations}"
+        return f"[{self.isbn}] {self.title} - {self.author} | {self.weight} | {self.value} | {self.stock} | {self.reservationsList()}"
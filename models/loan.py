@@ -43,6 +43,24 @@ class Loan:
         else:
             self.return_date = None
 
+    # Datos básicos del libro y del usuario. En un Loan normal se toman de
+    # los objetos; LazyLoan los toma del registro guardado.
+    @property
+    def isbn(self):
+        return self.book.isbn
+
+    @property
+    def book_title(self):
+        return self.book.title
+
+    @property
+    def user_id(self):
+        return self.user.id
+
+    @property
+    def user_name(self):
+        return self.user.name
+
     def is_overdue(self):
         """Verifica si el préstamo está vencido"""
         if self.returned:
@@ -78,10 +96,10 @@ class Loan:
         """Convierte el préstamo a diccionario para guardar en JSON"""
         return {
             "loan_id": self.loan_id,
-            "isbn": self.book.isbn,
-            "book_title": self.book.title,  # Para facilitar la lectura
-            "user_id": self.user.id,
-            "user_name": self.user.name,  # Para facilitar la lectura
+            "isbn": self.isbn,
+            "book_title": self.book_title,  # Para facilitar la lectura
+            "user_id": self.user_id,
+            "user_name": self.user_name,  # Para facilitar la lectura
             "loan_date": self.loan_date.strftime("%Y-%m-%d"),
             "expiration_date": self.expiration_date.strftime("%Y-%m-%d"),
             "returned": self.returned,
@@ -90,5 +108,82 @@ class Loan:
     
     def __str__(self):
         status = "Devuelto" if self.returned else ("Vencido" if self.is_overdue() else "Activo")
-        return (f"Préstamo [{self.loan_id[:8]}] - {self.book.title} prestado a {self.user.name} "
-                f"| Vence: {self.expiration_date.strftime('%Y-%m-%d')} | Estado: {status}")
\ No newline at end of file
+        return (f"Préstamo [{self.loan_id[:8]}] - {self.book_title} prestado a {self.user_name} "
+                f"| Vence: {self.expiration_date.strftime('%Y-%m-%d')} | Estado: {status}")
+
+
+class LazyLoan(Loan):
+    """
+    Préstamo construido directamente desde su registro guardado.
+
+    isbn, book_title, user_id, user_name, fechas y estado salen del propio
+    registro. Los objetos completos `book` y `user` solo se cargan (con las
+    funciones recibidas) la primera vez que alguien los usa, así que listar
+    préstamos no obliga a cargar el catálogo ni los usuarios.
+    """
+
+    def __init__(self, loan_dict, book_loader, user_loader):
+        """
+        Args:
+            loan_dict: registro del préstamo (formato de Loan.to_dict)
+            book_loader: función isbn -> Book
+            user_loader: función user_id -> User
+        """
+        self._isbn = loan_dict["isbn"]
+        self._book_title = loan_dict.get("book_title")
+        self._user_id = loan_dict["user_id"]
+        self._user_name = loan_dict.get("user_name")
+        self._book_loader = book_loader
+        self._user_loader = user_loader
+        self._book = None
+        self._user = None
+
+        super().__init__(
+            book=None,
+            user=None,
+            loan_date=loan_dict["loan_date"],
+            expiration_date=loan_dict["expiration_date"],
+            loan_id=loan_dict["loan_id"],
+            returned=loan_dict.get("returned", False),
+            return_date=loan_dict.get("return_date")
+        )
+
+    @property
+    def book(self):
+        if self._book is None:
+            self._book = self._book_loader(self._isbn)
+        return self._book
+
+    @book.setter
+    def book(self, value):
+        self._book = value
+
+    @property
+    def user(self):
+        if self._user is None:
+            self._user = self._user_loader(self._user_id)
+        return self._user
+
+    @user.setter
+    def user(self, value):
+        self._user = value
+
+    @property
+    def isbn(self):
+        return self._isbn
+
+    @property
+    def book_title(self):
+        if self._book_title is None:
+            return self.book.title
+        return self._book_title
+
+    @property
+    def user_id(self):
+        return self._user_id
+
+    @property
+    def user_name(self):
+        if self._user_name is None:
+            return self.user.name
+        return self._user_name
\ No newline at end of file
@@ -0,0 +1,59 @@
+"""
+Migrador JSON -> SQLite
+-----------------------
+Copia, en una sola pasada, el contenido actual de los archivos JSON
+(snapshot + journal pendiente) a la base SQLite configurada.
+
+Uso:
+    python -m persistence.migrate_to_sqlite
+
+Después, para usar la base:
+    BIBLIOTECA_STORAGE=sqlite python main.py
+"""
+
+import config
+from config import DATA_DIR
+from persistence.record_store import Journal, JOURNAL_PATH, RecordStore
+from persistence.sqlite_store import SQLiteDatabase, SQLiteRecordStore
+from persistence.storage import STORES
+
+
+def migrate(db_path=None):
+    """
+    Reemplaza el contenido de la base SQLite por el de los archivos JSON.
+    Retorna un diccionario almacén -> cantidad de registros migrados.
+    """
+    database = SQLiteDatabase(db_path or config.SQLITE_PATH)
+    # Journal propio de solo lectura: no se registra en el del proceso
+    journal = Journal(JOURNAL_PATH)
+    migrated = {}
+
+    with database.transaction():
+        for name, spec in STORES.items():
+            source = RecordStore(
+                name,
+                DATA_DIR / spec["file"],
+                key=spec.get("key"),
+                layout=spec.get("layout", "list"),
+                journal=journal,
+            )
+            target = SQLiteRecordStore(
+                name,
+                database,
+                key=spec.get("key"),
+                layout=spec.get("layout", "list"),
+                index_fields=spec["index_fields"],
+            )
+            target.clear()
+            for key, value in source.items():
+                target.put(key, value)
+            migrated[name] = len(target)
+
+    return migrated
+
+
+if __name__ == "__main__":
+    result = migrate()
+    print("✅ Migración a SQLite completada:")
+    for store_name, count in result.items():
+        print(f"   {store_name}: {count} registro(s)")
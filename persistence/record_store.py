@@ -0,0 +1,524 @@
+"""
+Record Store con journal de escritura anticipada (WAL)
+------------------------------------------------------
+Cada servicio guarda sus datos en un archivo JSON (el "snapshot").
+En lugar de reescribir el archivo completo en cada cambio, las mutaciones
+se agregan como deltas a un journal compartido en formato JSONL, una
+línea por transacción:
+
+    {"ops": [{"store": "books", "op": "put", "key": "978...", "value": {...}}]}
+
+Al cargar, cada almacén lee su snapshot y reaplica las operaciones del
+journal que le corresponden. Cuando el journal acumula COMPACT_EVERY
+operaciones se compacta: se reescriben los snapshots con el estado actual
+y el journal se vacía.
+
+Las operaciones son idempotentes ("put" guarda el registro completo y
+"del" lo elimina), así que reaplicar el journal sobre un snapshot ya
+compactado da el mismo resultado.
+
+Los índices secundarios (campo -> valor -> claves) se guardan junto al
+snapshot en un archivo "<nombre>.idx.json" al compactar. Solo se usan si
+corresponden exactamente a ese snapshot; si no, se reconstruyen.
+
+Ningún registro se pierde al compactar: si el snapshot tiene claves
+repetidas, las filas que no se usan se mueven a "<nombre>.quarantine.json"
+(con una advertencia en el log) antes de reescribirlo.
+"""
+
+import atexit
+import json
+import logging
+import os
+from contextlib import contextmanager
+
+from config import DATA_DIR
+
+JOURNAL_PATH = DATA_DIR / "journal.jsonl"
+
+# Operaciones acumuladas en el journal antes de compactar
+COMPACT_EVERY = 500
+
+logger = logging.getLogger(__name__)
+
+
+# ==============================================================
+# FUNCIONES INTERNAS DE ARCHIVO
+# ==============================================================
+
+def load_json(path, default):
+    """Carga un JSON desde la ruta dada o retorna el valor por defecto."""
+    if path.is_file():
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except json.JSONDecodeError:
+            return default
+    return default
+
+
+def save_json(path, data):
+    """Guarda un JSON de forma atómica (archivo temporal + reemplazo)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=4, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def quarantine_path(path):
+    """Archivo de cuarentena asociado a un archivo de datos."""
+    return path.with_name(path.stem + ".quarantine.json")
+
+
+def quarantine_records(path, records, reason):
+    """
+    Agrega `records` al archivo de cuarentena de `path` (sin borrar lo que
+    ya tenía) y deja una advertencia en el log. Se usa antes de reescribir
+    un archivo que ya no va a contener esas filas.
+    """
+    if not records:
+        return
+    target = quarantine_path(path)
+    saved = load_json(target, [])
+    saved.extend({"reason": reason, "record": record} for record in records)
+    save_json(target, saved)
+    logger.warning("%d registro(s) de %s movidos a %s (%s)",
+                   len(records), path.name, target.name, reason)
+
+
+def _file_signature(path):
+    """Firma (mtime, tamaño) de un archivo, o None si no existe."""
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+# ==============================================================
+# JOURNAL COMPARTIDO
+# ==============================================================
+
+class Journal:
+    """
+    Journal JSONL compartido por todos los almacenes de datos.
+
+    - record(op): registra una operación (o la acumula si hay transacción).
+    - transaction(): agrupa varias operaciones en una sola línea.
+    - compact(): reescribe los snapshots y vacía el journal.
+
+    `epoch` aumenta cada vez que el archivo cambia por fuera de este
+    proceso; los almacenes lo usan para saber cuándo recargar.
+    """
+
+    def __init__(self, path, compact_every=COMPACT_EVERY):
+        self.path = path
+        self.compact_every = compact_every
+        self.epoch = 0
+        self._stores = {}
+        self._signature = _file_signature(path)
+        self._op_count = None      # Operaciones en el archivo (None = desconocido)
+        self._leftover = 0         # Operaciones de almacenes no cargados (ver compact)
+        self._pending = None       # Operaciones de la transacción en curso
+        self._touched = None       # Almacenes modificados en la transacción
+        self.dirty = False         # Este proceso escribió en el journal
+
+    def register(self, store):
+        self._stores[store.name] = store
+
+    def check(self):
+        """Detecta cambios externos al journal."""
+        signature = _file_signature(self.path)
+        if signature != self._signature:
+            self._signature = signature
+            self._op_count = None
+            self.epoch += 1
+
+    def read(self):
+        """
+        Retorna todas las operaciones del journal, en orden.
+        Las líneas incompletas o corruptas (p. ej. una escritura
+        interrumpida) se ignoran: esa transacción nunca se confirmó.
+        """
+        ops = []
+        if self.path.is_file():
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        ops.extend(json.loads(line)["ops"])
+                    except (json.JSONDecodeError, KeyError, TypeError):
+                        continue
+        self._op_count = len(ops)
+        return ops
+
+    def record(self, op):
+        """Registra una operación; dentro de una transacción solo la acumula."""
+        if self._pending is not None:
+            self._pending.append(op)
+            self._touched.add(op["store"])
+        else:
+            self._append([op])
+
+    def _append(self, ops):
+        self.check()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        line = json.dumps({"ops": ops}, ensure_ascii=False)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self._signature = _file_signature(self.path)
+        self.dirty = True
+
+        if self._op_count is None:
+            self.read()
+        else:
+            self._op_count += len(ops)
+
+        if self._op_count - self._leftover >= self.compact_every:
+            self.compact()
+
+    @contextmanager
+    def transaction(self):
+        """
+        Agrupa todas las operaciones del bloque en una única línea del
+        journal: o se confirman todas o ninguna. Si el bloque falla, los
+        almacenes modificados se recargan y se descartan los cambios en
+        memoria. Las transacciones anidadas se unen a la exterior.
+        """
+        if self._pending is not None:
+            yield
+            return
+
+        self._pending = []
+        self._touched = set()
+        try:
+            yield
+            ops, touched = self._pending, self._touched
+            self._pending = self._touched = None
+            if ops:
+                self._append(ops)
+        except BaseException:
+            touched = self._touched or set()
+            self._pending = self._touched = None
+            for name in touched:
+                if name in self._stores:
+                    self._stores[name].invalidate()
+            raise
+
+    def pending_operations(self):
+        """Cantidad de operaciones aún no compactadas."""
+        self.check()
+        if self._op_count is None:
+            self.read()
+        return self._op_count
+
+    def compact(self):
+        """
+        Reescribe el snapshot de cada almacén registrado y vacía el journal.
+        Las operaciones de almacenes no cargados en este proceso se conservan.
+        """
+        self.check()
+        ops = self.read()
+        if not ops:
+            return
+
+        changed = {op["store"] for op in ops}
+        for name, store in self._stores.items():
+            if name in changed:
+                store.write_snapshot()
+
+        leftover = [op for op in ops if op["store"] not in self._stores]
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            if leftover:
+                f.write(json.dumps({"ops": leftover}, ensure_ascii=False) + "\n")
+        os.replace(tmp_path, self.path)
+
+        self._signature = _file_signature(self.path)
+        self._op_count = self._leftover = len(leftover)
+        self.dirty = False
+
+
+default_journal = Journal(JOURNAL_PATH)
+
+
+@atexit.register
+def _compact_on_exit():
+    """Al salir, deja los snapshots al día si este proceso hizo cambios."""
+    if default_journal.dirty:
+        default_journal.compact()
+
+
+# ==============================================================
+# ALMACÉN DE REGISTROS
+# ==============================================================
+
+class RecordStore:
+    """
+    Colección de registros identificados por una clave, respaldada por un
+    snapshot JSON más el journal compartido.
+
+    layout="list":    el snapshot es una lista de diccionarios y la clave
+                      se toma del campo `key` de cada registro.
+    layout="mapping": el snapshot es un diccionario clave -> valor.
+
+    index_fields son los campos por los que se consulta con find(). Para
+    cada uno se mantiene un índice valor -> claves que se actualiza con
+    cada put()/delete(), así que find() solo visita los registros que
+    coinciden.
+
+    Los registros se mantienen en memoria en el orden del snapshot (los
+    nuevos al final). Ante claves repetidas en el snapshot se usa el
+    primer registro; los demás se conservan aparte (`duplicates`) y pasan
+    al archivo de cuarentena cuando se reescribe el snapshot.
+
+    `deleted_keys` son las claves eliminadas desde el último snapshot (por
+    el journal o con delete()); así los archivos derivados pueden
+    distinguir una baja normal de un registro perdido.
+
+    Los valores retornados son los de la caché: no deben modificarse
+    directamente, sino a través de put().
+
+    Los observadores registrados con subscribe() reciben:
+        on_put(key, old, new), on_delete(key, old), on_reset(), on_compact()
+    """
+
+    def __init__(self, name, path, key=None, layout="list", index_fields=(), journal=None):
+        self.name = name
+        self.path = path
+        self.key = key
+        self.layout = layout
+        self.index_fields = tuple(index_fields)
+        self.journal = journal or default_journal
+        self.index_path = path.with_name(path.stem + ".idx.json")
+        self._records = None
+        self._indexes = None
+        self.duplicates = []
+        self.deleted_keys = set()
+        self._snapshot_signature = None
+        self._epoch = None
+        self._observers = []
+        self.journal.register(self)
+
+    # ----------------------------------------------
+    # CARGA E INVALIDACIÓN
+    # ----------------------------------------------
+
+    def subscribe(self, observer):
+        self._observers.append(observer)
+
+    def refresh(self):
+        """Recarga el almacén si el snapshot o el journal cambiaron en disco."""
+        self.journal.check()
+        if (self._records is None
+                or self._epoch != self.journal.epoch
+                or self._snapshot_signature != _file_signature(self.path)):
+            self._reload()
+
+    def invalidate(self):
+        """Descarta la caché; la próxima lectura recarga desde disco."""
+        self._records = None
+        self._indexes = None
+        for observer in self._observers:
+            observer.on_reset()
+
+    def _reload(self):
+        records = {}
+        duplicates = []
+        if self.layout == "list":
+            for record in load_json(self.path, []):
+                if record[self.key] in records:
+                    duplicates.append(record)
+                else:
+                    records[record[self.key]] = record
+            if duplicates:
+                logger.warning("%s: %d registro(s) con clave repetida; se usa el primero de cada clave",
+                               self.path.name, len(duplicates))
+        else:
+            records.update(load_json(self.path, {}))
+
+        self._records = records
+        self.duplicates = duplicates
+        self.deleted_keys = set()
+        self._snapshot_signature = _file_signature(self.path)
+        self._indexes = self._load_indexes()
+
+        for op in self.journal.read():
+            if op["store"] != self.name:
+                continue
+            old = records.get(op["key"])
+            if op["op"] == "put":
+                records[op["key"]] = op["value"]
+                self._update_indexes(op["key"], old, op["value"])
+                self.deleted_keys.discard(op["key"])
+            elif op["op"] == "del" and old is not None:
+                del records[op["key"]]
+                self._update_indexes(op["key"], old, None)
+                self.deleted_keys.add(op["key"])
+
+        self._epoch = self.journal.epoch
+        for observer in self._observers:
+            observer.on_reset()
+
+    # ----------------------------------------------
+    # ÍNDICES SECUNDARIOS
+    # ----------------------------------------------
+
+    def _load_indexes(self):
+        """
+        Índices del snapshot recién cargado: los del archivo .idx.json si
+        fueron guardados para este mismo snapshot, o reconstruidos.
+        Cada índice es {valor: {clave: None}} (conjunto que conserva el
+        orden de inserción).
+        """
+        if not self.index_fields:
+            return {}
+
+        saved = load_json(self.index_path, None)
+        if (isinstance(saved, dict)
+                and saved.get("snapshot") == list(self._snapshot_signature or ())
+                and set(saved.get("indexes", {})) == set(self.index_fields)):
+            return {
+                field: {value: dict.fromkeys(keys) for value, keys in index.items()}
+                for field, index in saved["indexes"].items()
+            }
+
+        indexes = {field: {} for field in self.index_fields}
+        for key, record in self._records.items():
+            for field in self.index_fields:
+                indexes[field].setdefault(_index_value(record.get(field)), {})[key] = None
+        return indexes
+
+    def _update_indexes(self, key, old, new):
+        """Actualiza los índices al pasar un registro de `old` a `new`."""
+        for field, index in self._indexes.items():
+            old_value = _index_value(old.get(field)) if old is not None else None
+            new_value = _index_value(new.get(field)) if new is not None else None
+            if old is not None and new is not None and old_value == new_value:
+                continue
+            if old is not None:
+                bucket = index.get(old_value)
+                if bucket is not None:
+                    bucket.pop(key, None)
+                    if not bucket:
+                        del index[old_value]
+            if new is not None:
+                index.setdefault(new_value, {})[key] = None
+
+    def _write_indexes(self):
+        if not self.index_fields:
+            return
+        save_json(self.index_path, {
+            "snapshot": list(self._snapshot_signature or ()),
+            "indexes": {
+                field: {value: list(keys) for value, keys in index.items()}
+                for field, index in self._indexes.items()
+            },
+        })
+
+    # ----------------------------------------------
+    # LECTURA
+    # ----------------------------------------------
+
+    def get(self, key):
+        self.refresh()
+        return self._records.get(key)
+
+    def __contains__(self, key):
+        self.refresh()
+        return key in self._records
+
+    def __len__(self):
+        self.refresh()
+        return len(self._records)
+
+    def keys(self):
+        self.refresh()
+        return list(self._records.keys())
+
+    def values(self):
+        self.refresh()
+        return list(self._records.values())
+
+    def items(self):
+        self.refresh()
+        return list(self._records.items())
+
+    def find(self, field, value):
+        """Registros cuyo campo `field` es igual a `value` (usa el índice)."""
+        self.refresh()
+        if field not in self._indexes:
+            return [record for record in self._records.values() if record.get(field) == value]
+        keys = self._indexes[field].get(_index_value(value), ())
+        return [self._records[key] for key in keys]
+
+    # ----------------------------------------------
+    # ESCRITURA
+    # ----------------------------------------------
+
+    def put(self, key, value):
+        """Inserta o reemplaza un registro. Escribe O(1) bytes en disco."""
+        self.refresh()
+        old = self._records.get(key)
+        self._records[key] = value
+        self._update_indexes(key, old, value)
+        self.deleted_keys.discard(key)
+        for observer in self._observers:
+            observer.on_put(key, old, value)
+        self.journal.record({"store": self.name, "op": "put", "key": key, "value": value})
+
+    def delete(self, key):
+        """Elimina un registro. Retorna False si no existía."""
+        self.refresh()
+        if key not in self._records:
+            return False
+        old = self._records.pop(key)
+        self._update_indexes(key, old, None)
+        self.deleted_keys.add(key)
+        for observer in self._observers:
+            observer.on_delete(key, old)
+        self.journal.record({"store": self.name, "op": "del", "key": key})
+        return True
+
+    def write_snapshot(self):
+        """
+        Reescribe el snapshot completo con el estado actual (compactación).
+        Las filas con clave repetida pasan antes al archivo de cuarentena.
+        """
+        self.refresh()
+        if self.duplicates:
+            quarantine_records(self.path, self.duplicates, f"clave '{self.key}' repetida")
+            self.duplicates = []
+        if self.layout == "list":
+            data = list(self._records.values())
+        else:
+            data = dict(self._records)
+        save_json(self.path, data)
+        self._snapshot_signature = _file_signature(self.path)
+        self._write_indexes()
+        for observer in self._observers:
+            observer.on_compact()
+        self.deleted_keys = set()
+
+
+def _index_value(value):
+    """Valor usado como entrada de un índice (las claves JSON son texto)."""
+    return value if isinstance(value, str) else json.dumps(value)
+
+
+class StoreObserver:
+    """Observador base: implementa solo los eventos que necesites."""
+
+    def on_put(self, key, old, new):
+        pass
+
+    def on_delete(self, key, old):
+        pass
+
+    def on_reset(self):
+        pass
+
+    def on_compact(self):
+        pass
@@ -0,0 +1,227 @@
+"""
+Record Store sobre SQLite
+-------------------------
+Motor de almacenamiento opcional (config.STORAGE_BACKEND = "sqlite").
+Ofrece la misma interfaz que RecordStore, de modo que los servicios
+funcionan igual con cualquiera de los dos motores.
+
+Cada almacén es una tabla con:
+- key:  clave primaria (isbn, loan_id, id, ...)
+- data: el registro completo serializado en JSON
+- una columna indexada por cada campo de búsqueda (author, user_id, ...)
+
+El orden de inserción se conserva con el rowid de SQLite.
+"""
+
+import json
+import sqlite3
+from contextlib import contextmanager
+
+
+class SQLiteDatabase:
+    """
+    Conexión compartida por todos los almacenes SQLite del proceso.
+
+    - transaction(): agrupa las escrituras en una transacción (todo o nada).
+    - check(): detecta commits de otros procesos (PRAGMA data_version).
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # isolation_level=None: autocommit salvo dentro de transaction()
+        self.conn = sqlite3.connect(str(path), isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.epoch = 0
+        self._stores = {}
+        self._in_transaction = False
+        self._touched = None
+        self._data_version = self._read_data_version()
+
+    def _read_data_version(self):
+        return self.conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def register(self, store):
+        self._stores[store.name] = store
+
+    def check(self):
+        """Aumenta `epoch` si otro proceso confirmó cambios en la base."""
+        version = self._read_data_version()
+        if version != self._data_version:
+            self._data_version = version
+            self.epoch += 1
+
+    def touch(self, name):
+        if self._in_transaction:
+            self._touched.add(name)
+
+    @contextmanager
+    def transaction(self):
+        """
+        Ejecuta el bloque en una transacción SQLite. Si el bloque falla se
+        hace ROLLBACK y los observadores de los almacenes modificados se
+        reinician. Las transacciones anidadas se unen a la exterior.
+        """
+        if self._in_transaction:
+            yield
+            return
+
+        self.conn.execute("BEGIN")
+        self._in_transaction = True
+        self._touched = set()
+        try:
+            yield
+            self.conn.execute("COMMIT")
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            for name in self._touched:
+                if name in self._stores:
+                    self._stores[name].invalidate()
+            raise
+        finally:
+            self._in_transaction = False
+            self._touched = None
+
+
+class SQLiteRecordStore:
+    """
+    Colección de registros en una tabla SQLite, con la misma interfaz que
+    persistence.record_store.RecordStore.
+
+    layout="list":    cada valor es un diccionario y la clave es value[key].
+    layout="mapping": la clave y el valor son independientes.
+    """
+
+    def __init__(self, name, database, key=None, layout="list", index_fields=()):
+        self.name = name
+        self.database = database
+        self.key = key
+        self.layout = layout
+        self.index_fields = tuple(index_fields)
+        self.deleted_keys = set()  # Claves eliminadas por este proceso
+        self._observers = []
+        self._epoch = database.epoch
+        self._create_table()
+        database.register(self)
+
+    def _create_table(self):
+        columns = "".join(f", {field} TEXT" for field in self.index_fields)
+        self.database.conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {self.name} "
+            f"(key TEXT PRIMARY KEY, data TEXT NOT NULL{columns})"
+        )
+        for field in self.index_fields:
+            self.database.conn.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_{self.name}_{field} "
+                f"ON {self.name}({field})"
+            )
+
+    def _execute(self, sql, params=()):
+        return self.database.conn.execute(sql, params)
+
+    # ----------------------------------------------
+    # CARGA E INVALIDACIÓN
+    # ----------------------------------------------
+
+    def subscribe(self, observer):
+        self._observers.append(observer)
+
+    def refresh(self):
+        """Reinicia los observadores si otro proceso modificó la base."""
+        self.database.check()
+        if self._epoch != self.database.epoch:
+            self._epoch = self.database.epoch
+            for observer in self._observers:
+                observer.on_reset()
+
+    def invalidate(self):
+        for observer in self._observers:
+            observer.on_reset()
+
+    # ----------------------------------------------
+    # LECTURA
+    # ----------------------------------------------
+
+    def get(self, key):
+        self.refresh()
+        row = self._execute(f"SELECT data FROM {self.name} WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def __contains__(self, key):
+        self.refresh()
+        row = self._execute(f"SELECT 1 FROM {self.name} WHERE key = ?", (key,)).fetchone()
+        return row is not None
+
+    def __len__(self):
+        self.refresh()
+        return self._execute(f"SELECT COUNT(*) FROM {self.name}").fetchone()[0]
+
+    def keys(self):
+        self.refresh()
+        return [row[0] for row in self._execute(f"SELECT key FROM {self.name} ORDER BY rowid")]
+
+    def values(self):
+        self.refresh()
+        return [json.loads(row[0]) for row in self._execute(f"SELECT data FROM {self.name} ORDER BY rowid")]
+
+    def items(self):
+        self.refresh()
+        return [(row[0], json.loads(row[1]))
+                for row in self._execute(f"SELECT key, data FROM {self.name} ORDER BY rowid")]
+
+    def find(self, field, value):
+        """Registros cuyo campo `field` es igual a `value` (usa el índice)."""
+        if field not in self.index_fields:
+            return [record for record in self.values() if record.get(field) == value]
+        self.refresh()
+        rows = self._execute(
+            f"SELECT data FROM {self.name} WHERE {field} = ? ORDER BY rowid", (value,)
+        )
+        return [json.loads(row[0]) for row in rows]
+
+    # ----------------------------------------------
+    # ESCRITURA
+    # ----------------------------------------------
+
+    def put(self, key, value):
+        """Inserta o reemplaza un registro (conserva su posición original)."""
+        self.refresh()
+        old = self.get(key) if self._observers else None
+        columns = ["key", "data"] + list(self.index_fields)
+        params = [key, json.dumps(value, ensure_ascii=False)]
+        params += [value.get(field) if isinstance(value, dict) else None
+                   for field in self.index_fields]
+        updates = ", ".join(f"{column} = excluded.{column}" for column in columns[1:])
+        self._execute(
+            f"INSERT INTO {self.name} ({', '.join(columns)}) "
+            f"VALUES ({', '.join('?' for _ in columns)}) "
+            f"ON CONFLICT(key) DO UPDATE SET {updates}",
+            params,
+        )
+        self.deleted_keys.discard(key)
+        self.database.touch(self.name)
+        for observer in self._observers:
+            observer.on_put(key, old, value)
+
+    def delete(self, key):
+        """Elimina un registro. Retorna False si no existía."""
+        self.refresh()
+        old = self.get(key)
+        if old is None:
+            return False
+        self._execute(f"DELETE FROM {self.name} WHERE key = ?", (key,))
+        self.database.touch(self.name)
+        self.deleted_keys.add(key)
+        for observer in self._observers:
+            observer.on_delete(key, old)
+        return True
+
+    def clear(self):
+        """Elimina todos los registros (usado por el migrador)."""
+        self._execute(f"DELETE FROM {self.name}")
+        self.database.touch(self.name)
+        self.invalidate()
+
+    def write_snapshot(self):
+        """SQLite no usa snapshots: cada escritura ya queda en la base."""
+        pass
@@ -0,0 +1,104 @@
+"""
+Storage
+-------
+Punto único para abrir los almacenes de datos de los servicios.
+
+Según config.STORAGE_BACKEND se usa:
+- "json"   (por defecto): snapshots JSON + journal (persistence.record_store)
+- "sqlite": tablas SQLite con índices (persistence.sqlite_store)
+
+Ambos motores ofrecen la misma interfaz (get, put, delete, values, find...),
+así que los servicios no cambian al elegir uno u otro.
+"""
+
+import config
+from config import DATA_DIR
+from persistence.record_store import RecordStore, default_journal
+
+# Definición de los almacenes: archivo JSON, clave y campos indexados
+STORES = {
+    "books": {
+        "file": "books.json",
+        "key": "isbn",
+        "index_fields": ("author", "title"),
+    },
+    "loans": {
+        "file": "loans.json",
+        "key": "loan_id",
+        "index_fields": ("user_id", "isbn", "expiration_date"),
+    },
+    "users": {
+        "file": "users.json",
+        "key": "id",
+        "index_fields": ("name",),
+    },
+    "shelves": {
+        "file": "shelves.json",
+        "key": "id_shelf",
+        "index_fields": (),
+    },
+    "history": {
+        "file": "history.json",
+        "layout": "mapping",
+        "index_fields": (),
+    },
+}
+
+_open_stores = {}
+_database = None
+
+
+def get_database():
+    """Conexión SQLite compartida (solo con el motor "sqlite")."""
+    global _database
+    if _database is None:
+        from persistence.sqlite_store import SQLiteDatabase
+        _database = SQLiteDatabase(config.SQLITE_PATH)
+    return _database
+
+
+def open_store(name):
+    """Retorna el almacén `name` (una única instancia por proceso)."""
+    if name in _open_stores:
+        return _open_stores[name]
+
+    spec = STORES[name]
+    if config.STORAGE_BACKEND == "sqlite":
+        from persistence.sqlite_store import SQLiteRecordStore
+        store = SQLiteRecordStore(
+            name,
+            get_database(),
+            key=spec.get("key"),
+            layout=spec.get("layout", "list"),
+            index_fields=spec["index_fields"],
+        )
+    elif config.STORAGE_BACKEND == "json":
+        store = RecordStore(
+            name,
+            DATA_DIR / spec["file"],
+            key=spec.get("key"),
+            layout=spec.get("layout", "list"),
+            index_fields=spec["index_fields"],
+        )
+    else:
+        raise ValueError(f"Motor de almacenamiento desconocido: {config.STORAGE_BACKEND}")
+
+    _open_stores[name] = store
+    return store
+
+
+def unit_of_work():
+    """
+    Agrupa operaciones sobre varios almacenes en una sola unidad de trabajo:
+    cada almacén se carga una vez, los cambios se aplican en memoria y se
+    confirman juntos al final del bloque (todo o nada).
+
+        with unit_of_work():
+            ... varias llamadas a servicios ...
+
+    Con el motor JSON todo el bloque se escribe como una sola línea del
+    journal; con SQLite es una transacción de la base.
+    """
+    if config.STORAGE_BACKEND == "sqlite":
+        return get_database().transaction()
+    return default_journal.transaction()
@@ -1,35 +1,380 @@
 from models.book import Book
+from structures.queue import Queue
+from bisect import bisect_left, bisect_right
 from pathlib import Path
-from algorithms.insertion_sort import insertion_sort_books_by_isbn
-import json
+from persistence.record_store import StoreObserver, load_json, save_json, quarantine_records
+from persistence.storage import open_store
+from structures.inverted_index import InvertedIndex
+from structures.trigram_index import TrigramIndex
+from structures.bk_tree import FuzzyIndex
+from structures.sorted_index import SortedIndex
+from services.stats_service import StatsCounter
+from algorithms.text_normalize import normalize_name
 
 # ==============================================================
-# RUTAS: Inventario General (desordenado) & Inventario Ordenado
+# RUTAS: Inventario Ordenado
+# (el inventario general lo gestiona persistence.storage: books.json o SQLite)
 # ==============================================================
 
-ruta_general = Path(__file__).resolve().parent.parent / "data" / "books.json"
 ruta_ordenado = Path(__file__).resolve().parent.parent / "data" / "sorted_books.json"
 
 # ==============================================================
-# FUNCIONES INTERNAS DE ARCHIVO
+# REPOSITORIO EN MEMORIA (RECORD STORE + JOURNAL)
 # ==============================================================
 
-def _load_json(path):
-    """Carga un JSON desde la ruta dada."""
-    if path.is_file():
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except json.JSONDecodeError:
-            return []
-    return []
+class BookRepository(StoreObserver):
+    """
+    Repositorio del inventario compartido por todo el proceso.
+
+    El inventario general vive en el almacén "books" (ver
+    persistence.storage). Con el motor JSON se carga una sola vez, las
+    lecturas se atienden desde memoria (con un índice hash por ISBN) y
+    cada escritura agrega solo un delta al journal; books.json se
+    reescribe únicamente al compactar. Con SQLite, las búsquedas por
+    ISBN usan la clave primaria de la tabla.
+
+    El inventario ordenado por ISBN es una vista en memoria que se
+    mantiene con cada cambio del almacén y se guarda en sorted_books.json
+    al compactar. Junto a ella se guarda la lista de ISBN en el mismo
+    orden, de modo que las altas se ubican con bisect (O(log n)) y las
+    modificaciones de un libro existente no reordenan nada.
+
+    IMPORTANTE: los diccionarios retornados son los de la caché; no deben
+    modificarse directamente.
+    """
 
+    def __init__(self, ordered_path):
+        self._store = open_store("books")
+        self._ordered_path = ordered_path
+        self._ordered = None
+        self._ordered_keys = None
+        self._orphans_checked = False
+        self._store.subscribe(self)
+
+    def general(self):
+        """Inventario general (desordenado) como lista de diccionarios."""
+        return self._store.values()
+
+    def get(self, isbn):
+        """Retorna el diccionario del libro con ese ISBN o None."""
+        return self._store.get(str(isbn))
+
+    def exists(self, isbn):
+        return str(isbn) in self._store
+
+    def add(self, book_dict):
+        """Agrega un libro al inventario."""
+        self._store.put(book_dict["isbn"], book_dict)
+
+    def replace(self, book_dict):
+        """Reemplaza un libro existente. Retorna False si no existe."""
+        if not self.exists(book_dict["isbn"]):
+            return False
+        self._store.put(book_dict["isbn"], book_dict)
+        return True
+
+    def remove(self, isbn):
+        """Elimina un libro. Retorna False si no existe."""
+        return self._store.delete(str(isbn))
+
+    def ordered(self):
+        """Inventario ordenado por ISBN como lista de diccionarios."""
+        self._store.refresh()
+        if self._ordered is None:
+            self.rebuild_ordered()
+        return self._ordered
+
+    def find_ordered(self, isbn):
+        """
+        Búsqueda binaria del ISBN en la vista ordenada (sobre la lista de
+        ISBN, sin construir libros). Retorna el diccionario o None.
+        """
+        ordered = self.ordered()
+        isbn = str(isbn)
+        i = bisect_left(self._ordered_keys, isbn)
+        if i < len(self._ordered_keys) and self._ordered_keys[i] == isbn:
+            return ordered[i]
+        return None
 
-def _save_json(path, data):
-    """Guarda un JSON en la ruta dada."""
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=4, ensure_ascii=False)
+    def rebuild_ordered(self):
+        """
+        Reconstruye la vista ordenada desde cero con un ordenamiento
+        O(n log n) (estable: ante ISBN iguales conserva el orden general).
+        """
+        self._ordered = sorted(self._store.values(), key=lambda b: b["isbn"])
+        self._ordered_keys = [b["isbn"] for b in self._ordered]
+        return self._ordered
+
+    # ----------------------------------------------
+    # EVENTOS DEL ALMACÉN
+    # ----------------------------------------------
+
+    def on_put(self, key, old, new):
+        if self._ordered is None:
+            return
+        if old is None:
+            # Libro nuevo: se inserta en su posición (búsqueda binaria)
+            i = bisect_right(self._ordered_keys, key)
+            self._ordered_keys.insert(i, key)
+            self._ordered.insert(i, new)
+        else:
+            # Mismo ISBN: se reemplaza en su lugar, sin reordenar
+            i = bisect_left(self._ordered_keys, key)
+            self._ordered[i] = new
+
+    def on_delete(self, key, old):
+        if self._ordered is None:
+            return
+        i = bisect_left(self._ordered_keys, key)
+        if i < len(self._ordered_keys) and self._ordered_keys[i] == key:
+            del self._ordered_keys[i]
+            del self._ordered[i]
+
+    def on_reset(self):
+        self._ordered = None
+        self._ordered_keys = None
+
+    def on_compact(self):
+        self.save_ordered()
+
+    def save_ordered(self):
+        """
+        Guarda la vista ordenada en sorted_books.json.
+
+        La primera vez en el proceso revisa el archivo anterior: las filas
+        cuyo ISBN no está en el inventario, y que tampoco se eliminaron con
+        delete_book, no se descartan sino que pasan al archivo de
+        cuarentena. Después el archivo solo se escribe desde el inventario,
+        así que no vuelve a hacer falta revisarlo.
+        """
+        ordered = self.ordered()
+        if not self._orphans_checked:
+            deleted = self._store.deleted_keys
+            orphans = [
+                b for b in load_json(self._ordered_path, [])
+                if isinstance(b, dict) and b.get("isbn") not in deleted and not self.exists(b.get("isbn"))
+            ]
+            quarantine_records(self._ordered_path, orphans, "ISBN ausente del inventario")
+            self._orphans_checked = True
+        save_json(self._ordered_path, ordered)
+        return ordered
+
+
+_repository = BookRepository(ruta_ordenado)
+
+
+# ==============================================================
+# ÍNDICE DE BÚSQUEDA POR TÍTULO / AUTOR
+# ==============================================================
+
+class BookSearchIndex(StoreObserver):
+    """
+    Índices de texto sobre los campos title y author del inventario, todos
+    con texto normalizado (sin tildes, en minúsculas):
+
+    - "words":    índice invertido de palabras (palabras clave y prefijos)
+    - "trigrams": índice de trigramas (búsqueda por subcadena)
+    - "fuzzy":    árbol BK de palabras (búsqueda tolerante a errores)
+
+    Cada índice (tipo, campo) se construye por separado la primera vez que
+    una consulta lo necesita (una búsqueda por subcadena no paga el árbol
+    BK) y luego se actualiza con cada alta, modificación o baja de un libro.
+    """
+
+    FIELDS = ("title", "author")
+    KINDS = {"words": InvertedIndex, "trigrams": TrigramIndex, "fuzzy": FuzzyIndex}
+
+    def __init__(self):
+        self._store = open_store("books")
+        self._indexes = {}
+        self._store.subscribe(self)
+
+    def index(self, kind, field):
+        self._store.refresh()
+        index = self._indexes.get((kind, field))
+        if index is None:
+            index = self.KINDS[kind]()
+            for isbn, book_dict in self._store.items():
+                index.add(isbn, book_dict.get(field, ""))
+            self._indexes[(kind, field)] = index
+        return index
+
+    def search(self, kind, field, query, **options):
+        """ISBN de los libros cuyo campo coincide con la consulta."""
+        return self.index(kind, field).search(query, **options)
+
+    # ----------------------------------------------
+    # EVENTOS DEL ALMACÉN
+    # ----------------------------------------------
+
+    def on_put(self, key, old, new):
+        for (_, f), index in self._indexes.items():
+            if old is None or old.get(f) != new.get(f):
+                index.update(key, new.get(f, ""))
+
+    def on_delete(self, key, old):
+        for index in self._indexes.values():
+            index.remove(key)
+
+    def on_reset(self):
+        self._indexes = {}
+
+
+_search_index = BookSearchIndex()
+
+
+# ==============================================================
+# ÍNDICES ORDENADOS POR VALOR / PESO
+# ==============================================================
+
+class BookRangeIndex(StoreObserver):
+    """
+    Índices ordenados (SortedIndex) de los libros por valor y por peso.
+    Permiten consultas por rango ("entre 20.000 y 50.000", "<= 0.5 kg") y
+    los k mayores / menores en O(log n + k), sin ordenar el inventario en
+    cada consulta. Se actualizan con cada alta, modificación o baja.
+    """
+
+    FIELDS = ("value", "weight")
+
+    def __init__(self):
+        self._store = open_store("books")
+        self._indexes = None
+        self._store.subscribe(self)
+
+    def index(self, field):
+        self._store.refresh()
+        if self._indexes is None:
+            items = self._store.items()
+            self._indexes = {
+                f: SortedIndex((book_dict.get(f, 0), isbn) for isbn, book_dict in items)
+                for f in self.FIELDS
+            }
+        return self._indexes[field]
+
+    # ----------------------------------------------
+    # EVENTOS DEL ALMACÉN
+    # ----------------------------------------------
+
+    def on_put(self, key, old, new):
+        if self._indexes is None:
+            return
+        for f, index in self._indexes.items():
+            if old is not None:
+                if old.get(f, 0) == new.get(f, 0):
+                    continue
+                index.remove(old.get(f, 0), key)
+            index.add(new.get(f, 0), key)
+
+    def on_delete(self, key, old):
+        if self._indexes is not None:
+            for f, index in self._indexes.items():
+                index.remove(old.get(f, 0), key)
+
+    def on_reset(self):
+        self._indexes = None
+
+
+_range_index = BookRangeIndex()
+
+
+# ==============================================================
+# AGREGADOS POR AUTOR
+# ==============================================================
+
+def author_key(author):
+    """Clave normalizada de un autor (sin tildes, minúsculas, espacios simples)."""
+    return normalize_name(author)
+
+
+class AuthorIndex(StoreObserver):
+    """
+    Agregados por autor: cantidad de títulos, valor total, peso total y
+    los ISBN de sus libros. Se mantienen con cada alta, modificación o baja,
+    así que el resumen de un autor se consulta en O(1).
+    """
+
+    def __init__(self):
+        self._store = open_store("books")
+        self._authors = None
+        self._store.subscribe(self)
+
+    def authors(self):
+        self._store.refresh()
+        if self._authors is None:
+            self._authors = {}
+            for isbn, book_dict in self._store.items():
+                self._add(isbn, book_dict)
+        return self._authors
+
+    def _add(self, isbn, book_dict):
+        key = author_key(book_dict.get("author", ""))
+        entry = self._authors.get(key)
+        if entry is None:
+            entry = self._authors[key] = {
+                "author": book_dict.get("author", ""),
+                "count": 0,
+                "total_value": 0,
+                "total_weight": 0.0,
+                "isbns": set(),
+            }
+        entry["count"] += 1
+        entry["total_value"] += book_dict.get("value", 0)
+        entry["total_weight"] += book_dict.get("weight", 0)
+        entry["isbns"].add(isbn)
+
+    def _remove(self, isbn, book_dict):
+        key = author_key(book_dict.get("author", ""))
+        entry = self._authors.get(key)
+        if entry is None or isbn not in entry["isbns"]:
+            return
+        entry["count"] -= 1
+        entry["total_value"] -= book_dict.get("value", 0)
+        entry["total_weight"] -= book_dict.get("weight", 0)
+        entry["isbns"].discard(isbn)
+        if not entry["isbns"]:
+            del self._authors[key]
+
+    # ----------------------------------------------
+    # EVENTOS DEL ALMACÉN
+    # ----------------------------------------------
+
+    def on_put(self, key, old, new):
+        if self._authors is None:
+            return
+        if old is not None:
+            self._remove(key, old)
+        self._add(key, new)
+
+    def on_delete(self, key, old):
+        if self._authors is not None:
+            self._remove(key, old)
+
+    def on_reset(self):
+        self._authors = None
+
+
+_author_index = AuthorIndex()
+
+
+# ==============================================================
+# ESTADÍSTICAS MATERIALIZADAS
+# ==============================================================
+
+def _inventory_contribution(book_dict):
+    """Aporte de un libro a las estadísticas del inventario."""
+    if book_dict is None:
+        return {"total_books": 0, "total_stock": 0, "available_books": 0, "total_inventory_value": 0}
+    stock = book_dict.get("stock", 0)
+    return {
+        "total_books": 1,
+        "total_stock": stock,
+        "available_books": 1 if stock > 0 else 0,
+        "total_inventory_value": book_dict.get("value", 0) * stock,
+    }
+
+
+_stats = StatsCounter(open_store("books"), _inventory_contribution)
 
 
 # ==============================================================
@@ -44,7 +389,7 @@ def _book_to_dict(book: Book):
         "weight": book.weight,
         "value": book.value,
         "stock": book.stock,
-        "reservations": book.reservations.toList()
+        "reservations": book.reservationsList()
     }
 
 
@@ -58,18 +403,13 @@ def _dict_to_book(book_dict):
         stock=book_dict.get("stock", 1)
     )
 
-    # Reconstruir reservaciones si existen
-    if "reservations" in book_dict:
-        for r in book_dict["reservations"]:
-            # Normalizar: aceptar tanto string como dict
-            if isinstance(r, str):
-                reservation = {
-                    "user_id": r,
-                    "date": "unknown"
-                }
-            else:
-                reservation = r
-            book.reservations.enqueue(reservation)
+    # Reconstruir reservaciones si existen (la cola solo se crea si hay alguna)
+    if book_dict.get("reservations"):
+        # Normalizar: aceptar tanto string como dict
+        book.reservations = Queue(
+            {"user_id": r, "date": "unknown"} if isinstance(r, str) else r
+            for r in book_dict["reservations"]
+        )
 
     return book
 
@@ -83,25 +423,14 @@ def create_book(book: Book):
     if not isinstance(book, Book):
         raise TypeError("Debe ser un objeto Book")
 
-    general = _load_json(ruta_general)
-    ordenado = _load_json(ruta_ordenado)
-
-    # Evitar duplicados
-    for b in general:
-        if b["isbn"] == book.isbn:
-            print(f"❌ Ya existe un libro con ISBN {book.isbn}")
-            return None
-
-    book_dict = _book_to_dict(book)
-
-    # 1. Inventario general = append directo
-    general.append(book_dict)
-    _save_json(ruta_general, general)
+    # Evitar duplicados (índice hash, O(1))
+    if _repository.exists(book.isbn):
+        print(f"❌ Ya existe un libro con ISBN {book.isbn}")
+        return None
 
-    # 2. Inventario ordenado = append + insertion sort
-    ordenado.append(book_dict)
-    insertion_sort_books_by_isbn(ordenado)
-    _save_json(ruta_ordenado, ordenado)
+    # Inventario general = append directo.
+    # El inventario ordenado se actualiza a partir del mismo cambio.
+    _repository.add(_book_to_dict(book))
 
     return book
 
@@ -112,32 +441,47 @@ def create_book(book: Book):
 
 def get_all_books():
     """Retorna el inventario GENERAL (desordenado)."""
-    lista = _load_json(ruta_general)
+    lista = _repository.general()
     return [_dict_to_book(b) for b in lista]
 
 
 def get_ordered_books():
-    lista = _load_json(ruta_ordenado)
-
-    # Si el archivo no existe o está vacío → reconstruirlo desde books.json
-    if not lista:
-        general = _load_json(ruta_general)
-        insertion_sort_books_by_isbn(general)
-        _save_json(ruta_ordenado, general)
-        lista = general
+    """Retorna el inventario ORDENADO por ISBN."""
+    return [_dict_to_book(b) for b in _repository.ordered()]
 
-    return [_dict_to_book(b) for b in lista]
 
+def rebuild_ordered_index():
+    """
+    Reconstruye el inventario ordenado con un ordenamiento O(n log n) y lo
+    guarda en sorted_books.json. Útil después de cargas masivas o si el
+    archivo se editó a mano. Retorna la cantidad de libros.
+    """
+    _repository.rebuild_ordered()
+    return len(_repository.save_ordered())
 
 
 # ==============================================================
-# BÚSQUEDA POR ISBN (BINARIA SOBRE LISTA ORDENADA)
+# BÚSQUEDA POR ISBN (ÍNDICE HASH)
 # ==============================================================
 
+def binary_search_book_by_isbn(isbn):
+    """
+    Busca un libro por ISBN con búsqueda binaria en el inventario ordenado.
+    Solo construye el Book encontrado.
+    """
+    book_dict = _repository.find_ordered(isbn)
+    return _dict_to_book(book_dict) if book_dict else None
+
+
 def get_book_by_isbn(isbn):
-    from algorithms.binary_search import binary_search_isbn
-    ordered_books = get_ordered_books()
-    return binary_search_isbn(ordered_books, isbn)
+    """Busca un libro por ISBN en O(1); solo construye el Book encontrado."""
+    book_dict = _repository.get(isbn)
+    return _dict_to_book(book_dict) if book_dict else None
+
+
+def book_exists(isbn):
+    """Indica si existe un libro con ese ISBN sin construir el objeto."""
+    return _repository.exists(isbn)
 
 
 # ==============================================================
@@ -150,38 +494,11 @@ def update_book(book: Book):
     if not isinstance(book, Book):
         raise TypeError("Debe ser un objeto Book")
 
-    # Actualizar INVENTARIO GENERAL
-    general = _load_json(ruta_general)
-    updated = False
-
-    for i, b in enumerate(general):
-        if b["isbn"] == book.isbn:
-            general[i] = _book_to_dict(book)
-            updated = True
-            break
-
-    if not updated:
+    # Actualiza el inventario general; el ordenado se actualiza con el mismo cambio
+    if not _repository.replace(_book_to_dict(book)):
         print(f"❌ No se encontró un libro con ISBN {book.isbn}")
         return None
 
-    _save_json(ruta_general, general)
-
-    # Actualizar INVENTARIO ORDENADO
-    ordenado = _load_json(ruta_ordenado)
-
-    # Si no existe el archivo ordenado, lo regeneramos completo
-    if not ordenado:
-        ordenado = general.copy()
-
-    for i, b in enumerate(ordenado):
-        if b["isbn"] == book.isbn:
-            ordenado[i] = _book_to_dict(book)
-            break
-
-    # Reordenar con insertion sort
-    insertion_sort_books_by_isbn(ordenado)
-    _save_json(ruta_ordenado, ordenado)
-
     return book
 
 
@@ -194,39 +511,69 @@ def update_book(book: Book):
 def delete_book(isbn):
     """Elimina un libro en ambas listas JSON."""
 
-    # GENERAL
-    general = _load_json(ruta_general)
-    new_general = [b for b in general if b["isbn"] != str(isbn)]
-
-    if len(new_general) == len(general):
+    if not _repository.remove(isbn):
         print(f"❌ No existe un libro con ISBN {isbn}")
         return False
 
-    _save_json(ruta_general, new_general)
-
-    # ORDENADO
-    ordenado = _load_json(ruta_ordenado)
-    if ordenado:
-        new_ord = [b for b in ordenado if b["isbn"] != str(isbn)]
-        _save_json(ruta_ordenado, new_ord)
-
     return True
 
 
 # ==============================================================
-# BÚSQUEDA LINEAL (TÍTULO / AUTOR)
+# BÚSQUEDA POR TÍTULO / AUTOR (ÍNDICES DE TEXTO)
 # ==============================================================
 
+def _books_from_isbns(isbns):
+    """Construye los Book de los ISBN dados, ordenados por ISBN."""
+    return [_dict_to_book(_repository.get(isbn)) for isbn in sorted(isbns)]
+
+
 def search_books_by_title(title):
-    general = _load_json(ruta_general)
-    title = title.lower()
-    return [_dict_to_book(b) for b in general if title in b["title"].lower()]
+    """
+    Libros cuyo título contiene el texto buscado (coincidencia parcial:
+    "soled" encuentra "Cien años de soledad"). No distingue mayúsculas ni
+    tildes. Usa el índice de trigramas.
+    """
+    return _books_from_isbns(_search_index.search("trigrams", "title", title))
 
 
 def search_books_by_author(author):
-    general = _load_json(ruta_general)
-    author = author.lower()
-    return [_dict_to_book(b) for b in general if author in b["author"].lower()]
+    """
+    Libros cuyo autor contiene el texto buscado (coincidencia parcial). No
+    distingue mayúsculas ni tildes: "garcia" encuentra "García".
+    """
+    return _books_from_isbns(_search_index.search("trigrams", "author", author))
+
+
+def search_books_by_keywords(query, field="title"):
+    """
+    Libros cuyo campo (title o author) contiene todas las palabras de la
+    consulta, o palabras que empiezan por ellas ("gab garc" encuentra
+    "Gabriel García Márquez"). Usa el índice invertido de palabras.
+    """
+    return _books_from_isbns(_search_index.search("words", field, query))
+
+
+def fuzzy_search_books(query, max_distance=2, k=10, fields=("title", "author")):
+    """
+    Búsqueda tolerante a errores de escritura ("Garcia Marques",
+    "Cortazr") sobre el título y/o el autor.
+
+    Cada palabra de la consulta debe parecerse a alguna palabra del campo
+    (distancia de Levenshtein acotada por max_distance). Un libro vale por
+    su mejor campo.
+
+    Returns:
+        Lista de hasta k pares (Book, distancia), de menor a mayor distancia.
+    """
+    best = {}
+    for field in fields:
+        matches = _search_index.search("fuzzy", field, query, max_distance=max_distance)
+        for isbn, distance in matches.items():
+            if distance < best.get(isbn, distance + 1):
+                best[isbn] = distance
+
+    ranked = sorted(best.items(), key=lambda item: (item[1], item[0]))[:k]
+    return [(_dict_to_book(_repository.get(isbn)), distance) for isbn, distance in ranked]
 
 
 # ==============================================================
@@ -234,15 +581,89 @@ def search_books_by_author(author):
 # ==============================================================
 
 def get_available_books():
-    general = _load_json(ruta_general)
+    general = _repository.general()
     return [_dict_to_book(b) for b in general if b.get("stock", 0) > 0]
 
 
 def get_low_stock_books(threshold=5):
-    general = _load_json(ruta_general)
+    general = _repository.general()
     return [_dict_to_book(b) for b in general if 0 < b.get("stock", 0) <= threshold]
 
 
+# ==============================================================
+# CONSULTAS POR RANGO (VALOR / PESO)
+# ==============================================================
+
+def _books_from_ordered_isbns(isbns):
+    """Construye los Book de los ISBN dados conservando su orden."""
+    return [_dict_to_book(_repository.get(isbn)) for isbn in isbns]
+
+
+def get_books_by_value_range(low=None, high=None):
+    """Libros con low <= valor <= high (None = sin límite), de menor a mayor valor."""
+    return _books_from_ordered_isbns(_range_index.index("value").range(low, high))
+
+
+def get_books_by_weight_range(low=None, high=None):
+    """Libros con low <= peso <= high (None = sin límite), de menor a mayor peso."""
+    return _books_from_ordered_isbns(_range_index.index("weight").range(low, high))
+
+
+def get_books_sorted_by(field):
+    """Todos los libros ordenados por "value" o "weight" (ascendente)."""
+    return _books_from_ordered_isbns(_range_index.index(field))
+
+
+def get_top_books_by(field, k):
+    """Los k libros con mayor "value" o "weight", de mayor a menor."""
+    return _books_from_ordered_isbns(_range_index.index(field).largest(k))
+
+
+def get_bottom_books_by(field, k):
+    """Los k libros con menor "value" o "weight", de menor a mayor."""
+    return _books_from_ordered_isbns(_range_index.index(field).smallest(k))
+
+
+# ==============================================================
+# REPORTES POR AUTOR
+# ==============================================================
+
+def _author_summary(entry):
+    count = entry["count"]
+    return {
+        "author": entry["author"],
+        "count": count,
+        "total_value": entry["total_value"],
+        "total_weight": round(entry["total_weight"], 2),
+        "average_weight": round(entry["total_weight"] / count, 2) if count else 0.0,
+    }
+
+
+def get_author_summary(author):
+    """
+    Resumen de un autor en O(1): cantidad de libros, valor total, peso
+    total y peso promedio. No distingue mayúsculas ni tildes.
+    Retorna None si el autor no tiene libros.
+    """
+    entry = _author_index.authors().get(author_key(author))
+    return _author_summary(entry) if entry else None
+
+
+def get_books_by_author_name(author):
+    """Libros de un autor exacto (sin importar mayúsculas ni tildes), ordenados por ISBN."""
+    entry = _author_index.authors().get(author_key(author))
+    return _books_from_isbns(entry["isbns"]) if entry else []
+
+
+def get_top_authors_by_value(k=None):
+    """Autores ordenados por el valor total de sus libros (mayor a menor), hasta k."""
+    ranked = sorted(_author_index.authors().values(),
+                    key=lambda entry: (-entry["total_value"], author_key(entry["author"])))
+    if k is not None:
+        ranked = ranked[:k]
+    return [_author_summary(entry) for entry in ranked]
+
+
 # ==============================================================
 # UPDATE STOCK
 # ==============================================================
@@ -266,21 +687,17 @@ def update_stock(isbn, amount):
 # ==============================================================
 
 def get_inventory_stats():
-    general = _load_json(ruta_general)
-
-    total_books = len(general)
-    total_stock = sum(b.get("stock", 0) for b in general)
-    available_books = sum(1 for b in general if b.get("stock", 0) > 0)
-    out_of_stock = total_books - available_books
-    total_value = sum(b.get("value", 0) * b.get("stock", 0) for b in general)
+    """Estadísticas del inventario (contadores mantenidos, sin recorrerlo)."""
+    totals = _stats.totals()
 
     return {
-        "total_books": total_books,
-        "total_stock": total_stock,
-        "available_books": available_books,
-        "out_of_stock": out_of_stock,
-        "total_inventory_value": total_value
+        "total_books": totals["total_books"],
+        "total_stock": totals["total_stock"],
+        "available_books": totals["available_books"],
+        "out_of_stock": totals["total_books"] - totals["available_books"],
+        "total_inventory_value": totals["total_inventory_value"]
     }
+
 # ==============================================================
 # RESERVATIONS QUEUE HELPERS
 # ==============================================================
@@ -288,7 +705,7 @@ def get_inventory_stats():
 def dequeue_reservation(isbn):
     """
     Dequeue the next reservation (FIFO) for a given book.
-    It uses binary search on the ordered inventory to locate the book.
+    It uses the ISBN hash index to locate the book.
 
     Args:
         isbn (str): Book ISBN
@@ -296,7 +713,7 @@ def dequeue_reservation(isbn):
     Returns:
         dict | None: reservation {"user_id": ..., "date": ...} or None if empty
     """
-    book = get_book_by_isbn(isbn)  # binary search over ordered list
+    book = get_book_by_isbn(isbn)  # O(1) lookup through the ISBN index
     if not book:
         print(f"❌ Book with ISBN {isbn} not found while checking reservations.")
         return None
@@ -309,6 +726,32 @@ def dequeue_reservation(isbn):
     return next_reservation
 
 
+def dequeue_reservations(isbn, count):
+    """
+    Dequeue up to `count` reservations (FIFO) for a given book with a
+    single write, e.g. when several copies are returned together.
+
+    Args:
+        isbn (str): Book ISBN
+        count (int): Maximum number of reservations to dequeue
+
+    Returns:
+        list[dict]: dequeued reservations, in queue order
+    """
+    book = get_book_by_isbn(isbn)
+    if not book:
+        print(f"❌ Book with ISBN {isbn} not found while checking reservations.")
+        return []
+
+    dequeued = []
+    while len(dequeued) < count and not book.reservations.is_empty():
+        dequeued.append(book.reservations.dequeue())
+
+    if dequeued:
+        update_book(book)
+    return dequeued
+
+
 def has_reservations(isbn):
     """
     Check if a book has pending reservations.
@@ -319,5 +762,5 @@ def has_reservations(isbn):
     Returns:
         bool
     """
-    book = get_book_by_isbn(isbn)
-    return bool(book and not book.reservations.is_empty())
+    book_dict = _repository.get(isbn)  # no Book/Queue needs to be built
+    return bool(book_dict and book_dict.get("reservations"))
@@ -1,38 +1,19 @@
-from pathlib import Path
-import json
 from datetime import datetime
 from structures.stack import Stack
+from persistence.storage import open_store
 
-HISTORY_PATH = Path(__file__).resolve().parent.parent / "data" / "history.json"
+# Historial por usuario (user_id -> lista de registros).
+# history.json + journal, o tabla SQLite según la configuración.
+_store = open_store("history")
 
 
-def _load_history():
-    """Carga el archivo completo de historial (por usuario)."""
-    if HISTORY_PATH.is_file():
-        try:
-            with open(HISTORY_PATH, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except json.JSONDecodeError:
-            return {}
-    return {}
-
-
-def _save_history(history):
-    """Guarda el historial completo."""
-    HISTORY_PATH.parent.mkdir(parents=True, exist_ok=True)
-    with open(HISTORY_PATH, "w", encoding="utf-8") as f:
-        json.dump(history, f, indent=4, ensure_ascii=False)
-
 def push_history(user_id, isbn):
     """
     Inserta un nuevo registro en la Pila del usuario.
     Estructura LIFO.
     """
-    history = _load_history()
-
-    # Crear la pila si no existe
-    if user_id not in history:
-        history[user_id] = []
+    # Copia de la pila del usuario (o una nueva si no existe)
+    entries = list(_store.get(user_id) or [])
 
     entry = {
         "isbn": isbn,
@@ -40,22 +21,23 @@ def push_history(user_id, isbn):
     }
 
     # Insertar al final → LIFO
-    history[user_id].append(entry)
+    entries.append(entry)
 
-    _save_history(history)
+    # Solo se registra la pila de este usuario, no el historial completo
+    _store.put(user_id, entries)
 
 def get_user_history_stack(user_id):
     """
     Carga el historial del usuario como una Pila real.
     """
-    history = _load_history()
+    entries = _store.get(user_id)
 
     stack = Stack()
 
-    if user_id not in history:
+    if entries is None:
         return stack  # Pila vacía
 
-    for entry in history[user_id]:
+    for entry in entries:
         stack.push(entry)
 
     return stack
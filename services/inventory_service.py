@@ -14,17 +14,21 @@ Controllers MUST call InventoryManager instead of book_service directly.
 
 from services.book_service import (
     get_all_books,
-    get_book_by_isbn
+    get_book_by_isbn,
+    get_books_by_value_range,
+    get_books_by_weight_range,
+    get_books_sorted_by,
+    get_top_books_by,
+    get_inventory_stats,
+    get_books_by_author_name
 )
 
-from algorithms.merge_sort import merge_sort_books_by_value
-
 
 class InventoryManager:
     """
     Manager responsible for:
     - Searching books using classic algorithms
-    - Sorting books using Merge Sort
+    - Sorting books (maintained value / weight indexes)
     - Providing high-level inventory reports
     - Acting as the access point to book inventory logic
     """
@@ -53,17 +57,16 @@ class InventoryManager:
 
 
     # ----------------------------------------------
-    # SORTING (MERGE SORT)
+    # SORTING (SORTED INDEXES)
     # ----------------------------------------------
 
     
     def sort_by_value():
         """
-        Returns a new list of books sorted by value (ascending),
-        using Merge Sort algorithm.
+        Returns a new list of books sorted by value (ascending).
+        Reads the maintained value index; nothing is sorted per call.
         """
-        books = get_all_books()
-        return merge_sort_books_by_value(books)
+        return get_books_sorted_by("value")
 
     # ----------------------------------------------
     # REPORTS
@@ -79,17 +82,31 @@ class InventoryManager:
     
     def report_top_valuable(n=5):
         """
-        Returns the top N most valuable books.
+        Returns the top N most valuable books (ascending by value),
+        in O(log n + N) through the value index.
+        """
+        return list(reversed(get_top_books_by("value", n)))
+
+    
+    def report_value_range(low=None, high=None):
+        """
+        Returns books whose value is between low and high (inclusive).
         """
-        sorted_books = InventoryManager.sort_by_value()
-        return sorted_books[-n:] if sorted_books else []
+        return get_books_by_value_range(low, high)
+
+    
+    def report_weight_range(low=None, high=None):
+        """
+        Returns books whose weight is between low and high (inclusive).
+        """
+        return get_books_by_weight_range(low, high)
 
     
     def report_by_author(author: str):
         """
         Returns books from a specific author.
         """
-        return InventoryManager.search_by_author(author)
+        return get_books_by_author_name(author)
 
     
     def report_inventory_summary():
@@ -99,21 +116,12 @@ class InventoryManager:
         - total stock
         - most expensive book
         """
-        books = get_all_books()
-
-        if not books:
-            return {
-                "total_books": 0,
-                "total_stock": 0,
-                "most_expensive": None
-            }
-
-        total_stock = sum(b.stock for b in books)
-        sorted_books = merge_sort_books_by_value(books)
-        most_expensive = sorted_books[-1] if sorted_books else None
+        stats = get_inventory_stats()
+        top = get_top_books_by("value", 1)
+        most_expensive = top[0] if top else None
 
         return {
-            "total_books": len(books),
-            "total_stock": total_stock,
-            "most_expensive": most_expensive.to_dict() if most_expensive else None
+            "total_books": stats["total_books"],
+            "total_stock": stats["total_stock"],
+            "most_expensive": most_expensive.toDict() if most_expensive else None
         }
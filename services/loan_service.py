@@ -1,36 +1,113 @@
-from models.loan import Loan
-from pathlib import Path
-import json
-from datetime import datetime, timedelta
-from services.history_service import push_history
-from models.loan import Loan
-from services.book_service import update_stock, update_book, dequeue_reservation
-from pathlib import Path
-import json
+from models.loan import Loan, LazyLoan
 from datetime import datetime, timedelta
 from services.history_service import push_history
+from services.book_service import update_stock, update_book, dequeue_reservations
+from persistence.record_store import StoreObserver
+from persistence.storage import open_store, unit_of_work
+from structures.sorted_index import SortedIndex
+from services.stats_service import StatsCounter
+
+
+# Préstamos (loans.json + journal, o tabla SQLite según la configuración)
+_store = open_store("loans")
 
 
-# Ruta segura (independiente del lugar donde ejecutes el programa)
-ruta = Path(__file__).resolve().parent.parent / "data" / "loans.json"
+class ExpirationIndex(StoreObserver):
+    """
+    Préstamos activos ordenados por fecha de vencimiento.
+
+    Las fechas se guardan como texto "YYYY-MM-DD", que ordena igual que la
+    fecha, así que no hace falta convertirlas con strptime. "Vencidos a la
+    fecha T" y "vencen en los próximos N días" son consultas de rango que
+    solo recorren los préstamos que coinciden.
+    """
+
+    def __init__(self, store):
+        self._store = store
+        self._index = None
+        store.subscribe(self)
+
+    def index(self):
+        self._store.refresh()
+        if self._index is None:
+            self._index = SortedIndex(
+                (loan_dict["expiration_date"], loan_id)
+                for loan_id, loan_dict in self._store.items()
+                if not loan_dict.get("returned", False)
+            )
+        return self._index
+
+    def overdue_bounds(self, as_of=None):
+        """
+        Rango (clave, incluida) de los vencidos a la fecha `as_of`.
+        Igual que Loan.is_overdue: vence cuando as_of supera las 00:00
+        del día de vencimiento.
+        """
+        as_of = as_of or datetime.now()
+        include_day = as_of > datetime(as_of.year, as_of.month, as_of.day)
+        return as_of.strftime("%Y-%m-%d"), include_day
+
+    def overdue(self, as_of=None):
+        high, include_high = self.overdue_bounds(as_of)
+        return self.index().range(high=high, include_high=include_high)
+
+    def count_overdue(self, as_of=None):
+        high, include_high = self.overdue_bounds(as_of)
+        return self.index().count(high=high, include_high=include_high)
+
+    def due_within(self, days, as_of=None):
+        """Activos aún no vencidos que vencen en los próximos `days` días."""
+        as_of = as_of or datetime.now()
+        low, overdue_today = self.overdue_bounds(as_of)
+        high = (as_of + timedelta(days=days)).strftime("%Y-%m-%d")
+        return self.index().range(low=low, high=high, include_low=not overdue_today)
+
+    # ----------------------------------------------
+    # EVENTOS DEL ALMACÉN
+    # ----------------------------------------------
+
+    def on_put(self, key, old, new):
+        if self._index is None:
+            return
+        if old is not None and not old.get("returned", False):
+            self._index.remove(old["expiration_date"], key)
+        if not new.get("returned", False):
+            self._index.add(new["expiration_date"], key)
+
+    def on_delete(self, key, old):
+        if self._index is not None and not old.get("returned", False):
+            self._index.remove(old["expiration_date"], key)
+
+    def on_reset(self):
+        self._index = None
+
+
+_expirations = ExpirationIndex(_store)
+
+
+def _loan_contribution(loan_dict):
+    """Aporte de un préstamo a las estadísticas."""
+    if loan_dict is None:
+        return {"total_loans": 0, "active_loans": 0, "returned_loans": 0}
+    returned = loan_dict.get("returned", False)
+    return {
+        "total_loans": 1,
+        "active_loans": 0 if returned else 1,
+        "returned_loans": 1 if returned else 0,
+    }
+
+
+_stats = StatsCounter(_store, _loan_contribution)
 
 
 def _load_loans():
-    """Función auxiliar para cargar los préstamos desde el archivo JSON"""
-    if ruta.is_file():
-        try:
-            with open(ruta, "r", encoding="utf-8") as file:
-                return json.load(file)
-        except json.JSONDecodeError:
-            return []
-    return []
+    """Función auxiliar que retorna todos los préstamos como diccionarios"""
+    return _store.values()
 
 
-def _save_loans(loans_list):
-    """Función auxiliar para guardar los préstamos en el archivo JSON"""
-    ruta.parent.mkdir(parents=True, exist_ok=True)
-    with open(ruta, "w", encoding="utf-8") as file:
-        json.dump(loans_list, file, indent=4, ensure_ascii=False)
+def _save_loan(loan_dict):
+    """Función auxiliar para guardar (crear o reemplazar) un préstamo"""
+    _store.put(loan_dict["loan_id"], loan_dict)
 
 
 def _loan_to_dict(loan: Loan):
@@ -63,9 +140,42 @@ def _dict_to_loan(loan_dict):
     return loan
 
 
+def _dicts_to_loans(loan_dicts):
+    """
+    Convierte varios diccionarios a préstamos perezosos (LazyLoan).
+
+    Los datos del registro se usan tal cual; Book y User solo se cargan si
+    alguien accede a loan.book / loan.user, y cada uno se construye una sola
+    vez por llamada (mapa de identidad compartido por todos los préstamos).
+    Los préstamos cuyo libro o usuario ya no existe se omiten.
+    """
+    from services.book_service import get_book_by_isbn, book_exists
+    from services.user_service import get_user_by_id, user_exists
+
+    books = {}
+    users = {}
+
+    def load_book(isbn):
+        if isbn not in books:
+            books[isbn] = get_book_by_isbn(isbn)
+        return books[isbn]
+
+    def load_user(user_id):
+        if user_id not in users:
+            users[user_id] = get_user_by_id(user_id)
+        return users[user_id]
+
+    return [
+        LazyLoan(loan_dict, load_book, load_user)
+        for loan_dict in loan_dicts
+        if book_exists(loan_dict["isbn"]) and user_exists(loan_dict["user_id"])
+    ]
+
+
 def create_loan(isbn, user_id, days=14):
     """
     Crea un nuevo préstamo o, si no hay stock, registra una reserva.
+    Todas las escrituras del préstamo se confirman en una sola unidad de trabajo.
 
     Args:
         isbn: ISBN del libro a prestar
@@ -75,6 +185,18 @@ def create_loan(isbn, user_id, days=14):
     Returns:
         Loan object si se creó exitosamente, None en caso contrario.
     """
+    _, loan = _create_loan(isbn, user_id, days)
+    return loan
+
+
+def _create_loan(isbn, user_id, days=14):
+    """
+    Lógica de create_loan.
+
+    Returns:
+        Tupla (estado, Loan | None). Estados: "loaned", "reserved",
+        "book_not_found", "already_reserved", "user_not_found", "limit_reached".
+    """
     from services.book_service import get_book_by_isbn
     from services.user_service import get_user_by_id, update_user
 
@@ -82,7 +204,7 @@ def create_loan(isbn, user_id, days=14):
     book = get_book_by_isbn(isbn)
     if not book:
         print(f"❌ No se encontró un libro con el ISBN: {isbn}")
-        return None
+        return "book_not_found", None
 
     # ============================
     # CASO 1: SIN STOCK → RESERVA
@@ -91,19 +213,19 @@ def create_loan(isbn, user_id, days=14):
         print("\n⚠️ Este libro no tiene stock. Se gestionará como reserva.")
 
         # Obtenemos la lista actual de reservas desde la cola
-        current_reservations = book.reservations.toList()
+        current_reservations = book.reservationsList()
 
         # Evitar duplicados del mismo usuario (soporta dicts y strings antiguos)
         for r in current_reservations:
             if isinstance(r, dict):
                 if r.get("user_id") == user_id:
                     print("❌ Ya estás en la lista de espera para este libro.")
-                    return None
+                    return "already_reserved", None
             else:
                 # Formato viejo: solo "2"
                 if r == user_id:
                     print("❌ Ya estás en la lista de espera para este libro.")
-                    return None
+                    return "already_reserved", None
 
         # Agregar a la cola interna del libro
         book.reservations.enqueue({
@@ -115,7 +237,7 @@ def create_loan(isbn, user_id, days=14):
         update_book(book)
 
         print("📌 Usuario agregado a la cola FIFO.")
-        return None
+        return "reserved", None
 
     # ============================
     # CASO 2: HAY STOCK → PRÉSTAMO
@@ -125,12 +247,12 @@ def create_loan(isbn, user_id, days=14):
     user = get_user_by_id(user_id)
     if not user:
         print(f"❌ No se encontró un usuario con el ID: {user_id}")
-        return None
+        return "user_not_found", None
 
     # Verificar límite de préstamos del usuario
     if not user.can_borrow():
         print(f"❌ El usuario '{user.name}' ha alcanzado el límite de préstamos activos")
-        return None
+        return "limit_reached", None
 
     # Calcular fechas
     loan_date = datetime.now()
@@ -144,27 +266,89 @@ def create_loan(isbn, user_id, days=14):
         expiration_date=expiration_date.strftime("%Y-%m-%d")
     )
 
-    # Guardar en loans.json
-    loans_list = _load_loans()
-    loan_dict = _loan_to_dict(new_loan)
-    loans_list.append(loan_dict)
-    _save_loans(loans_list)
+    # Una sola unidad de trabajo: préstamo, stock, usuario e historial
+    # se confirman juntos (todo o nada)
+    with unit_of_work():
+        # Guardar en loans.json
+        _save_loan(_loan_to_dict(new_loan))
+
+        # Actualizar stock del libro (restar 1)
+        update_stock(isbn, -1)
+
+        # Agregar préstamo al usuario
+        user.add_loan(new_loan.loan_id)
+        update_user(user)
+
+        # Registrar en historial (pila LIFO)
+        push_history(user_id, isbn)
+
+    return "loaned", new_loan
+
+def _apply_return(loan_id):
+    """
+    Marca un préstamo como devuelto, suma el ejemplar al stock y lo quita
+    de la lista del usuario. No atiende reservas.
+
+    Returns:
+        Tupla (estado, loan_dict | None). Estados: "returned", "not_found",
+        "already_returned".
+    """
+    from services.user_service import get_user_by_id, update_user
+
+    stored = _store.get(loan_id)
+    if stored is None:
+        return "not_found", None
+
+    # Verificar que no esté ya devuelto
+    if stored.get("returned", False):
+        return "already_returned", None
 
-    # Actualizar stock del libro (restar 1)
-    update_stock(isbn, -1)
+    # Copia: el registro de la caché no se modifica directamente
+    loan_dict = dict(stored)
 
-    # Agregar préstamo al usuario
-    user.add_loan(new_loan.loan_id)
-    update_user(user)
+    # Marcar como devuelto
+    loan_dict["returned"] = True
+    loan_dict["return_date"] = datetime.now().strftime("%Y-%m-%d")
+    _save_loan(loan_dict)
 
-    # Registrar en historial (pila LIFO)
-    push_history(user_id, isbn)
+    # Aumentar stock del libro
+    update_stock(loan_dict["isbn"], 1)
+
+    # Remover préstamo del usuario
+    user = get_user_by_id(loan_dict["user_id"])
+    if user:
+        user.remove_loan(loan_id)
+        update_user(user)
+
+    return "returned", loan_dict
+
+
+def _serve_reservations(isbn, count=1):
+    """
+    Atiende hasta `count` reservas de un libro: las saca de la cola en una
+    sola escritura y crea el préstamo automático para cada usuario.
+    Retorna la lista de préstamos creados.
+    """
+    auto_loans = []
+
+    for next_user in dequeue_reservations(isbn, count):
+        print("\n📌 Este libro tenía una reserva.")
+        print(f"   Usuario en turno: {next_user['user_id']}")
+
+        # Crear préstamo automático
+        auto_loan = create_loan(isbn, next_user["user_id"])
+
+        if auto_loan:
+            print("✔ Se creó el préstamo automáticamente para el siguiente usuario en la cola.")
+            auto_loans.append(auto_loan)
+
+    return auto_loans
 
-    return new_loan
 
 def return_loan(loan_id):
     """
     Marca un préstamo como devuelto y aumenta el stock del libro.
+    Si el libro tenía reservas, presta el ejemplar al siguiente de la cola.
     
     Args:
         loan_id: ID del préstamo a devolver
@@ -172,55 +356,90 @@ def return_loan(loan_id):
     Returns:
         Loan object si se devolvió exitosamente, None en caso contrario
     """
-    from services.user_service import get_user_by_id, update_user
-    
-    loans_list = _load_loans()
-    
-    # Buscar el préstamo
-    for i, loan_dict in enumerate(loans_list):
-        if loan_dict["loan_id"] == loan_id:
-            
-            # Verificar que no esté ya devuelto
-            if loan_dict.get("returned", False):
-                print(f"❌ Este préstamo ya fue devuelto anteriormente")
-                return None
-            
-            # Marcar como devuelto
-            loan_dict["returned"] = True
-            loan_dict["return_date"] = datetime.now().strftime("%Y-%m-%d")
-            
-            # Guardar cambios
-            loans_list[i] = loan_dict
-            _save_loans(loans_list)
-            
-            # Aumentar stock del libro
-            update_stock(loan_dict["isbn"], 1)
-            
-            # ¿Hay reservas?
-            next_user = dequeue_reservation(loan_dict["isbn"])
-
-            if next_user:
-                print("\n📌 Este libro tenía una reserva.")
-                print(f"   Usuario en turno: {next_user['user_id']}")
-
-            # Crear préstamo automático
-                from services.loan_service import create_loan
-                auto_loan = create_loan(loan_dict["isbn"], next_user["user_id"])
-
-                if auto_loan:
-                    print("✔ Se creó el préstamo automáticamente para el siguiente usuario en la cola.")
-            
-            # Remover préstamo del usuario
-            user = get_user_by_id(loan_dict["user_id"])
-            if user:
-                user.remove_loan(loan_id)
-                update_user(user)
-            
-            # Retornar el préstamo actualizado
-            return _dict_to_loan(loan_dict)
-    
-    print(f"❌ No se encontró un préstamo con el ID: {loan_id}")
-    return None
+    # Una sola unidad de trabajo para toda la devolución (incluido el
+    # préstamo automático al siguiente de la cola de reservas)
+    with unit_of_work():
+        status, loan_dict = _apply_return(loan_id)
+
+        if status == "not_found":
+            print(f"❌ No se encontró un préstamo con el ID: {loan_id}")
+            return None
+
+        if status == "already_returned":
+            print(f"❌ Este préstamo ya fue devuelto anteriormente")
+            return None
+
+        # ¿Hay reservas?
+        _serve_reservations(loan_dict["isbn"])
+
+    # Retornar el préstamo actualizado
+    return _dict_to_loan(loan_dict)
+
+
+# ==============================================================
+# OPERACIONES EN LOTE (MOSTRADOR DE CIRCULACIÓN)
+# ==============================================================
+
+def return_loans(loan_ids):
+    """
+    Devuelve un lote de préstamos (p. ej. un carro completo de devoluciones).
+
+    Todo el lote se confirma en una sola unidad de trabajo, y las colas de
+    reserva se atienden al final en una sola pasada por ISBN: por cada
+    ejemplar devuelto se presta al siguiente usuario en espera.
+
+    Args:
+        loan_ids: IDs de los préstamos a devolver
+
+    Returns:
+        Lista con un resultado por préstamo, en el mismo orden:
+        {"loan_id", "status", "loan", "auto_loan"}
+        status: "returned", "not_found" o "already_returned".
+        auto_loan: préstamo creado para la reserva atendida con ese ejemplar.
+    """
+    results = []
+    freed = {}  # isbn -> resultados que liberaron un ejemplar de ese libro
+
+    with unit_of_work():
+        for loan_id in loan_ids:
+            status, loan_dict = _apply_return(loan_id)
+            result = {"loan_id": loan_id, "status": status, "loan": None, "auto_loan": None}
+            results.append(result)
+
+            if status == "returned":
+                result["loan"] = _dict_to_loan(loan_dict)
+                freed.setdefault(loan_dict["isbn"], []).append(result)
+
+        # Reservas: una pasada por cada ISBN devuelto
+        for isbn, freed_results in freed.items():
+            auto_loans = _serve_reservations(isbn, len(freed_results))
+            for result, auto_loan in zip(freed_results, auto_loans):
+                result["auto_loan"] = auto_loan
+
+    return results
+
+
+def create_loans(requests):
+    """
+    Crea un lote de préstamos en una sola unidad de trabajo.
+
+    Args:
+        requests: lista de tuplas (isbn, user_id, days)
+
+    Returns:
+        Lista con un resultado por solicitud, en el mismo orden:
+        {"isbn", "user_id", "status", "loan"}
+        status: "loaned", "reserved", "book_not_found", "already_reserved",
+        "user_not_found" o "limit_reached".
+    """
+    results = []
+
+    with unit_of_work():
+        for isbn, user_id, days in requests:
+            status, loan = _create_loan(isbn, user_id, days)
+            results.append({"isbn": isbn, "user_id": user_id, "status": status, "loan": loan})
+
+    return results
 
 
 def get_all_loans():
@@ -228,15 +447,7 @@ def get_all_loans():
     Obtiene todos los préstamos.
     Retorna una lista de objetos Loan.
     """
-    loans_list = _load_loans()
-    loans = []
-    
-    for loan_dict in loans_list:
-        loan = _dict_to_loan(loan_dict)
-        if loan:
-            loans.append(loan)
-    
-    return loans
+    return _dicts_to_loans(_load_loans())
 
 
 def get_active_loans():
@@ -245,30 +456,35 @@ def get_active_loans():
     Retorna una lista de objetos Loan.
     """
     loans_list = _load_loans()
-    active_loans = []
-    
-    for loan_dict in loans_list:
-        if not loan_dict.get("returned", False):
-            loan = _dict_to_loan(loan_dict)
-            if loan:
-                active_loans.append(loan)
+    active = [loan_dict for loan_dict in loans_list if not loan_dict.get("returned", False)]
     
-    return active_loans
+    return _dicts_to_loans(active)
 
 
-def get_overdue_loans():
+def get_overdue_loans(as_of=None):
     """
-    Obtiene todos los préstamos vencidos.
+    Obtiene todos los préstamos vencidos a la fecha `as_of` (por defecto,
+    ahora), ordenados por fecha de vencimiento.
     Retorna una lista de objetos Loan.
     """
-    active_loans = get_active_loans()
-    overdue_loans = [loan for loan in active_loans if loan.is_overdue()]
-    return overdue_loans
+    loan_ids = _expirations.overdue(as_of)
+    return _dicts_to_loans([_store.get(loan_id) for loan_id in loan_ids])
+
+
+def get_loans_due_within(days, as_of=None):
+    """
+    Obtiene los préstamos activos que aún no vencen pero vencen en los
+    próximos `days` días, ordenados por fecha de vencimiento.
+    Retorna una lista de objetos Loan.
+    """
+    loan_ids = _expirations.due_within(days, as_of)
+    return _dicts_to_loans([_store.get(loan_id) for loan_id in loan_ids])
 
 
 def get_loans_by_user(user_id):
     """
     Obtiene todos los préstamos de un usuario específico.
+    Usa el índice user_id -> préstamos del almacén (no recorre el historial).
     
     Args:
         user_id: ID del usuario
@@ -276,21 +492,13 @@ def get_loans_by_user(user_id):
     Returns:
         Lista de objetos Loan
     """
-    loans_list = _load_loans()
-    user_loans = []
-    
-    for loan_dict in loans_list:
-        if loan_dict["user_id"] == user_id:
-            loan = _dict_to_loan(loan_dict)
-            if loan:
-                user_loans.append(loan)
-    
-    return user_loans
+    return _dicts_to_loans(_store.find("user_id", user_id))
 
 
 def get_loans_by_book(isbn):
     """
     Obtiene todos los préstamos de un libro específico.
+    Usa el índice isbn -> préstamos del almacén (no recorre el historial).
     
     Args:
         isbn: ISBN del libro
@@ -298,16 +506,7 @@ def get_loans_by_book(isbn):
     Returns:
         Lista de objetos Loan
     """
-    loans_list = _load_loans()
-    book_loans = []
-    
-    for loan_dict in loans_list:
-        if loan_dict["isbn"] == isbn:
-            loan = _dict_to_loan(loan_dict)
-            if loan:
-                book_loans.append(loan)
-    
-    return book_loans
+    return _dicts_to_loans(_store.find("isbn", isbn))
 
 
 def get_loan_by_id(loan_id):
@@ -320,11 +519,10 @@ def get_loan_by_id(loan_id):
     Returns:
         Objeto Loan o None si no existe
     """
-    loans_list = _load_loans()
+    loan_dict = _store.get(loan_id)
     
-    for loan_dict in loans_list:
-        if loan_dict["loan_id"] == loan_id:
-            return _dict_to_loan(loan_dict)
+    if loan_dict is not None:
+        return _dict_to_loan(loan_dict)
     
     return None
 
@@ -339,16 +537,10 @@ def delete_loan(loan_id):
     Returns:
         True si se eliminó, False si no se encontró
     """
-    loans_list = _load_loans()
-    
-    # Filtrar para eliminar el préstamo con ese ID
-    new_loans_list = [loan for loan in loans_list if loan["loan_id"] != loan_id]
-    
-    if len(new_loans_list) == len(loans_list):
+    if not _store.delete(loan_id):
         print(f"❌ No se encontró un préstamo con el ID: {loan_id}")
         return False
     
-    _save_loans(new_loans_list)
     return True
 
 
@@ -357,26 +549,17 @@ def get_loan_statistics():
     Obtiene estadísticas de los préstamos.
     Retorna un diccionario con información resumida.
     """
-    loans_list = _load_loans()
-    
-    total_loans = len(loans_list)
-    active_loans = sum(1 for loan in loans_list if not loan.get("returned", False))
-    returned_loans = total_loans - active_loans
+    totals = _stats.totals()
     
-    # Calcular préstamos vencidos
-    overdue_count = 0
-    for loan_dict in loans_list:
-        if not loan_dict.get("returned", False):
-            expiration = datetime.strptime(loan_dict["expiration_date"], "%Y-%m-%d")
-            if datetime.now() > expiration:
-                overdue_count += 1
+    # Préstamos vencidos: prefijo del índice de vencimientos
+    overdue_count = _expirations.count_overdue()
     
     return {
-        "total_loans": total_loans,
-        "active_loans": active_loans,
-        "returned_loans": returned_loans,
+        "total_loans": totals["total_loans"],
+        "active_loans": totals["active_loans"],
+        "returned_loans": totals["returned_loans"],
         "overdue_loans": overdue_count,
-        "on_time_loans": active_loans - overdue_count
+        "on_time_loans": totals["active_loans"] - overdue_count
     }
 
 
@@ -391,26 +574,25 @@ def renew_loan(loan_id, additional_days=14):
     Returns:
         Loan object si se renovó exitosamente, None en caso contrario
     """
-    loans_list = _load_loans()
+    stored = _store.get(loan_id)
+    
+    if stored is None:
+        print(f"❌ No se encontró un préstamo con el ID: {loan_id}")
+        return None
+
+    loan_dict = dict(stored)
+    
+    # Verificar que no esté devuelto
+    if loan_dict.get("returned", False):
+        print(f"❌ No se puede renovar un préstamo ya devuelto")
+        return None
+    
+    # Extender fecha de vencimiento
+    current_expiration = datetime.strptime(loan_dict["expiration_date"], "%Y-%m-%d")
+    new_expiration = current_expiration + timedelta(days=additional_days)
+    loan_dict["expiration_date"] = new_expiration.strftime("%Y-%m-%d")
     
-    for i, loan_dict in enumerate(loans_list):
-        if loan_dict["loan_id"] == loan_id:
-            
-            # Verificar que no esté devuelto
-            if loan_dict.get("returned", False):
-                print(f"❌ No se puede renovar un préstamo ya devuelto")
-                return None
-            
-            # Extender fecha de vencimiento
-            current_expiration = datetime.strptime(loan_dict["expiration_date"], "%Y-%m-%d")
-            new_expiration = current_expiration + timedelta(days=additional_days)
-            loan_dict["expiration_date"] = new_expiration.strftime("%Y-%m-%d")
-            
-            # Guardar cambios
-            loans_list[i] = loan_dict
-            _save_loans(loans_list)
-            
-            return _dict_to_loan(loan_dict)
+    # Guardar cambios
+    _save_loan(loan_dict)
     
-    print(f"❌ No se encontró un préstamo con el ID: {loan_id}")
-    return None
\ No newline at end of file
+    return _dict_to_loan(loan_dict)
@@ -1,28 +1,37 @@
 from models.shelf import Shelf
 from models.book import Book
-from pathlib import Path
-import json
-
-# Ruta segura (independiente del lugar donde se ejecute el programa)
-ruta = Path(__file__).resolve().parent.parent / "data" / "shelves.json"
+from persistence.storage import open_store, unit_of_work
+from services.stats_service import StatsCounter
+from services.book_service import get_all_books, get_book_by_isbn
+from algorithms.shelf_planner import plan_shelves
+
+# Estantes (shelves.json + journal, o tabla SQLite según la configuración)
+_store = open_store("shelves")
+
+
+def _shelf_contribution(shelf_dict):
+    """Aporte de un estante a las estadísticas (ocupación y peso)."""
+    if shelf_dict is None:
+        return {"total_shelves": 0, "total_capacity": 0, "total_books": 0,
+                "total_weight": 0, "full_shelves": 0, "empty_shelves": 0}
+    placed = [b for row in shelf_dict["books"] for b in row if b is not None]
+    capacity = shelf_dict.get("capacity", Shelf.CAPACITY)
+    return {
+        "total_shelves": 1,
+        "total_capacity": capacity,
+        "total_books": len(placed),
+        "total_weight": sum(b["weight"] for b in placed),
+        "full_shelves": 1 if len(placed) >= Shelf.CAPACITY else 0,
+        "empty_shelves": 1 if not placed else 0,
+    }
 
 
-def _load_shelves():
-    """Función auxiliar para cargar los estantes desde el archivo JSON"""
-    if ruta.is_file():
-        try:
-            with open(ruta, "r", encoding="utf-8") as file:
-                return json.load(file)
-        except json.JSONDecodeError:
-            return []
-    return []
+_stats = StatsCounter(_store, _shelf_contribution)
 
 
-def _save_shelves(shelves_list):
-    """Función auxiliar para guardar los estantes en el archivo JSON"""
-    ruta.parent.mkdir(parents=True, exist_ok=True)
-    with open(ruta, "w", encoding="utf-8") as file:
-        json.dump(shelves_list, file, indent=4, ensure_ascii=False)
+def _load_shelves():
+    """Función auxiliar que retorna todos los estantes como diccionarios"""
+    return _store.values()
 
 
 def _shelf_to_dict(shelf: Shelf):
@@ -52,20 +61,13 @@ def create_shelf(shelf_data: Shelf):
     Crea un nuevo estante en el archivo JSON.
     Si ya existe un estante con el mismo id_shelf, no lo crea y retorna None.
     """
-    shelves_list = _load_shelves()
-    
     # Verificar si ya existe un estante con ese ID
-    for shelf in shelves_list:
-        if shelf["id_shelf"] == shelf_data.id_shelf:
-            print(f"Ya existe un estante con el ID: {shelf_data.id_shelf}")
-            return None
+    if shelf_data.id_shelf in _store:
+        print(f"Ya existe un estante con el ID: {shelf_data.id_shelf}")
+        return None
     
-    # Convertir el Shelf a diccionario y agregarlo
-    shelf_dict = _shelf_to_dict(shelf_data)
-    shelves_list.append(shelf_dict)
-    
-    # Guardar archivo
-    _save_shelves(shelves_list)
+    # Convertir el Shelf a diccionario y guardarlo
+    _store.put(shelf_data.id_shelf, _shelf_to_dict(shelf_data))
     
     return shelf_data
 
@@ -75,14 +77,10 @@ def update_shelf(shelf_data: Shelf):
     Actualiza un estante existente en el archivo JSON.
     Si no existe, retorna None.
     """
-    shelves_list = _load_shelves()
-    
     # Buscar y actualizar el estante
-    for i, shelf in enumerate(shelves_list):
-        if shelf["id_shelf"] == shelf_data.id_shelf:
-            shelves_list[i] = _shelf_to_dict(shelf_data)
-            _save_shelves(shelves_list)
-            return shelf_data
+    if shelf_data.id_shelf in _store:
+        _store.put(shelf_data.id_shelf, _shelf_to_dict(shelf_data))
+        return shelf_data
     
     print(f"No se encontró un estante con el ID: {shelf_data.id_shelf}")
     return None
@@ -92,80 +90,49 @@ def create_or_update_shelf(shelf_data: Shelf):
     """
     Crea un nuevo estante o actualiza uno existente.
     """
-    shelves_list = _load_shelves()
+    # Crea el registro si no existe o lo reemplaza si ya existe
+    _store.put(shelf_data.id_shelf, _shelf_to_dict(shelf_data))
     
-    # Buscar si ya existe
-    for i, shelf in enumerate(shelves_list):
-        if shelf["id_shelf"] == shelf_data.id_shelf:
-            # Actualizar
-            shelves_list[i] = _shelf_to_dict(shelf_data)
-            _save_shelves(shelves_list)
-            return shelf_data
+    return shelf_data
+
+
+def _dict_to_shelf(shelf_dict):
+    """Convierte un diccionario a objeto Shelf"""
+    shelf = Shelf(shelf_dict["id_shelf"])
     
-    # Si no existe, crear
-    shelf_dict = _shelf_to_dict(shelf_data)
-    shelves_list.append(shelf_dict)
-    _save_shelves(shelves_list)
+    # Reconstruir la matriz de libros
+    for i in range(5):
+        for j in range(4):
+            book_data = shelf_dict["books"][i][j]
+            if book_data is not None:
+                book = Book(
+                    isbn=book_data["isbn"],
+                    title=book_data["title"],
+                    author=book_data["author"],
+                    weight=book_data["weight"],
+                    value=book_data.get("value", 0),  # Valor por defecto si no existe
+                    stock=book_data.get("stock", 1)   # Valor por defecto si no existe
+                )
+                shelf.books[i][j] = book
     
-    return shelf_data
+    return shelf
 
 
 def get_shelves():
     """
     Obtiene todos los estantes desde el archivo JSON.
     """
-    shelves_list = _load_shelves()
-    shelves = []
-    
-    for shelf_dict in shelves_list:
-        shelf = Shelf(shelf_dict["id_shelf"])
-        
-        # Reconstruir la matriz de libros
-        for i in range(5):
-            for j in range(4):
-                book_data = shelf_dict["books"][i][j]
-                if book_data is not None:
-                    book = Book(
-                        isbn=book_data["isbn"],
-                        title=book_data["title"],
-                        author=book_data["author"],
-                        weight=book_data["weight"],
-                        value=book_data.get("value", 0),  # Valor por defecto si no existe
-                        stock=book_data.get("stock", 1)   # Valor por defecto si no existe
-                    )
-                    shelf.books[i][j] = book
-        
-        shelves.append(shelf)
-    
-    return shelves
+    return [_dict_to_shelf(shelf_dict) for shelf_dict in _load_shelves()]
 
 
 def get_shelf_by_id(id_shelf):
     """
     Obtiene un estante específico por su ID.
     """
-    shelves_list = _load_shelves()
+    shelf_dict = _store.get(id_shelf)
     
-    for shelf_dict in shelves_list:
-        if shelf_dict["id_shelf"] == id_shelf:
-            shelf = Shelf(shelf_dict["id_shelf"])
-            
-            # Reconstruir la matriz de libros
-            for i in range(5):
-                for j in range(4):
-                    book_data = shelf_dict["books"][i][j]
-                    if book_data is not None:
-                        book = Book(
-                            isbn=book_data["isbn"],
-                            title=book_data["title"],
-                            author=book_data["author"],
-                            weight=book_data["weight"],
-                            value=book_data.get("value", 0),
-                            stock=book_data.get("stock", 1)
-                        )
-                        shelf.books[i][j] = book
-            
-            return shelf
+    if shelf_dict is not None:
+        return _dict_to_shelf(shelf_dict)
     
     return None
 
@@ -174,14 +141,92 @@ def delete_shelf(id_shelf):
     """
     Elimina un estante del archivo JSON.
     """
-    shelves_list = _load_shelves()
-    
-    # Filtrar para eliminar el estante con ese ID
-    new_shelves_list = [s for s in shelves_list if s["id_shelf"] != id_shelf]
-    
-    if len(new_shelves_list) == len(shelves_list):
+    if not _store.delete(id_shelf):
         print(f"No se encontró un estante con el ID: {id_shelf}")
         return False
     
-    _save_shelves(new_shelves_list)
-    return True
\ No newline at end of file
+    return True
+
+
+def get_shelf_statistics():
+    """
+    Estadísticas de ocupación y peso de todos los estantes
+    (contadores mantenidos, sin recorrer los estantes).
+    """
+    totals = _stats.totals()
+    totals["total_weight"] = round(totals["total_weight"], 2)
+    totals["available_spaces"] = totals["total_capacity"] - totals["total_books"]
+    return totals
+
+
+# ==============================================================
+# PLANIFICACIÓN DE ESTANTES (BIN PACKING)
+# ==============================================================
+
+def plan_shelf_placement(isbns=None):
+    """
+    Plan de ubicación de todo el inventario (isbns=None) o de los ISBN
+    dados en la menor cantidad de estantes (ver algorithms.shelf_planner).
+    El plan incluye "missing" con los ISBN que no existen.
+    """
+    missing = []
+    if isbns is None:
+        books = get_all_books()
+    else:
+        books = []
+        for isbn in dict.fromkeys(isbns):  # Sin repetidos, en orden
+            book = get_book_by_isbn(isbn)
+            if book is None:
+                missing.append(isbn)
+            else:
+                books.append(book)
+
+    plan = plan_shelves(books)
+    plan["missing"] = missing
+    return plan
+
+
+def _next_shelf_ids(count, used):
+    """`count` IDs numéricos nuevos, siguientes al mayor ID numérico usado."""
+    numeric = [int(i) for i in used if str(i).isdigit()]
+    start = max(numeric, default=0) + 1
+    return [str(start + n) for n in range(count)]
+
+
+def apply_shelf_plan(plan, replace_all=False):
+    """
+    Guarda un plan de plan_shelf_placement() en una sola escritura.
+
+    - replace_all=True: reemplaza todos los estantes actuales (reubicar
+      toda la biblioteca).
+    - replace_all=False: los libros del plan se retiran de los estantes
+      donde estaban y se crean estantes nuevos para ellos.
+
+    Returns:
+        list[Shelf]: estantes creados
+    """
+    planned = {book.isbn for layout in plan["shelves"] for row in layout for book in row}
+
+    with unit_of_work():
+        if replace_all:
+            for id_shelf in list(_store.keys()):
+                _store.delete(id_shelf)
+        else:
+            for shelf in get_shelves():
+                moved = [b.isbn for b in shelf.get_books_list() if b.isbn in planned]
+                for isbn in moved:
+                    shelf.remove_book(isbn)
+                if moved:
+                    _store.put(shelf.id_shelf, _shelf_to_dict(shelf))
+
+        created = []
+        ids = _next_shelf_ids(len(plan["shelves"]), _store.keys())
+        for id_shelf, layout in zip(ids, plan["shelves"]):
+            shelf = Shelf(id_shelf)
+            for i, row in enumerate(layout):
+                for j, book in enumerate(row):
+                    shelf.books[i][j] = book
+            _store.put(id_shelf, _shelf_to_dict(shelf))
+            created.append(shelf)
+
+    return created
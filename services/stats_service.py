@@ -0,0 +1,101 @@
+"""
+Estadísticas materializadas
+---------------------------
+Los contadores de inventario, préstamos, usuarios y estantes se mantienen
+al día con cada escritura de su almacén (StatsCounter), así que consultar
+las estadísticas no recorre los archivos.
+
+Cada registro "aporta" unos valores (por ejemplo, un libro aporta su stock
+a "total_stock"); al modificarlo se resta su aporte anterior y se suma el
+nuevo, en O(1). recompute_all_statistics() recalcula todo desde cero y
+verify_statistics() compara ambos resultados como control de consistencia.
+"""
+
+import math
+
+from persistence.record_store import StoreObserver
+
+
+class StatsCounter(StoreObserver):
+    """
+    Suma de los aportes de todos los registros de un almacén.
+
+    contribution(record) retorna un diccionario {contador: valor}.
+    """
+
+    def __init__(self, store, contribution):
+        self._store = store
+        self._contribution = contribution
+        self._totals = None
+        store.subscribe(self)
+
+    def totals(self):
+        """Contadores actuales (copia)."""
+        self._store.refresh()
+        if self._totals is None:
+            self._totals = self.recompute()
+        return dict(self._totals)
+
+    def recompute(self):
+        """Recalcula los contadores recorriendo todos los registros."""
+        totals = dict.fromkeys(self._contribution(None), 0)
+        for record in self._store.values():
+            for name, amount in self._contribution(record).items():
+                totals[name] += amount
+        return totals
+
+    def verify(self):
+        """True si los contadores mantenidos coinciden con un recálculo."""
+        current = self.totals()
+        expected = self.recompute()
+        return (current.keys() == expected.keys()
+                and all(math.isclose(current[k], expected[k], abs_tol=1e-6) for k in expected))
+
+    def _apply(self, record, sign):
+        for name, amount in self._contribution(record).items():
+            self._totals[name] += sign * amount
+
+    # ----------------------------------------------
+    # EVENTOS DEL ALMACÉN
+    # ----------------------------------------------
+
+    def on_put(self, key, old, new):
+        if self._totals is None:
+            return
+        if old is not None:
+            self._apply(old, -1)
+        self._apply(new, 1)
+
+    def on_delete(self, key, old):
+        if self._totals is not None:
+            self._apply(old, -1)
+
+    def on_reset(self):
+        self._totals = None
+
+
+# ==============================================================
+# CONTROL DE CONSISTENCIA
+# ==============================================================
+
+def _counters():
+    from services import book_service, loan_service, user_service, shelf_service
+    return {
+        "inventory": book_service._stats,
+        "loans": loan_service._stats,
+        "users": user_service._stats,
+        "shelves": shelf_service._stats,
+    }
+
+
+def recompute_all_statistics():
+    """Recalcula desde cero los contadores de todos los almacenes."""
+    return {name: counter.recompute() for name, counter in _counters().items()}
+
+
+def verify_statistics():
+    """
+    Compara los contadores mantenidos con un recálculo completo.
+    Retorna {almacén: True/False}.
+    """
+    return {name: counter.verify() for name, counter in _counters().items()}
@@ -1,28 +1,101 @@
 from models.user import User
-from pathlib import Path
-import json
+from algorithms.text_normalize import normalize_text, tokenize
+from persistence.record_store import StoreObserver
+from persistence.storage import open_store
+from structures.trie import Trie
+from services.stats_service import StatsCounter
 
 
-# Ruta segura (independiente del lugar donde ejecutes el programa)
-ruta = Path(__file__).resolve().parent.parent / "data" / "users.json"
+# Usuarios (users.json + journal, o tabla SQLite según la configuración)
+_store = open_store("users")
 
 
-def _load_users():
-    """Función auxiliar para cargar los usuarios desde el archivo JSON"""
-    if ruta.is_file():
-        try:
-            with open(ruta, "r", encoding="utf-8") as file:
-                return json.load(file)
-        except json.JSONDecodeError:
-            return []
-    return []
+class UserNameIndex(StoreObserver):
+    """
+    Trie de las palabras de los nombres (normalizadas: sin tildes, en
+    minúsculas) -> IDs de usuario. Se construye la primera vez que se
+    consulta y se actualiza con cada alta, modificación o baja.
+    """
+
+    def __init__(self, store):
+        self._store = store
+        self._trie = None
+        store.subscribe(self)
+
+    def trie(self):
+        self._store.refresh()
+        if self._trie is None:
+            trie = Trie()
+            for user_id, user_dict in self._store.items():
+                for token in set(tokenize(user_dict["name"])):
+                    trie.insert(token, user_id)
+            self._trie = trie
+        return self._trie
+
+    def search(self, query):
+        """
+        IDs de los usuarios que tienen, para cada palabra de la consulta,
+        una palabra del nombre que empieza por ella. Una consulta vacía
+        retorna todos los usuarios.
+        """
+        tokens = set(tokenize(query))
+        if not tokens:
+            return set(self._store.keys())
+
+        trie = self.trie()
+        result = None
+        for token in sorted(tokens, key=len, reverse=True):
+            ids = trie.values_with_prefix(token)
+            result = ids if result is None else result & ids
+            if not result:
+                break
+        return result
+
+    # ----------------------------------------------
+    # EVENTOS DEL ALMACÉN
+    # ----------------------------------------------
+
+    def on_put(self, key, old, new):
+        if self._trie is None:
+            return
+        if old is not None:
+            if old["name"] == new["name"]:
+                return
+            for token in set(tokenize(old["name"])):
+                self._trie.remove(token, key)
+        for token in set(tokenize(new["name"])):
+            self._trie.insert(token, key)
+
+    def on_delete(self, key, old):
+        if self._trie is not None:
+            for token in set(tokenize(old["name"])):
+                self._trie.remove(token, key)
+
+    def on_reset(self):
+        self._trie = None
+
 
+_names = UserNameIndex(_store)
 
-def _save_users(users_list):
-    """Función auxiliar para guardar los usuarios en el archivo JSON"""
-    ruta.parent.mkdir(parents=True, exist_ok=True)
-    with open(ruta, "w", encoding="utf-8") as file:
-        json.dump(users_list, file, indent=4, ensure_ascii=False)
+
+def _user_contribution(user_dict):
+    """Aporte de un usuario a las estadísticas."""
+    if user_dict is None:
+        return {"total_users": 0, "users_with_active_loans": 0, "total_active_loans": 0}
+    loans = user_dict.get("loans") or []
+    return {
+        "total_users": 1,
+        "users_with_active_loans": 1 if loans else 0,
+        "total_active_loans": len(loans),
+    }
+
+
+_stats = StatsCounter(_store, _user_contribution)
+
+
+def _load_users():
+    """Función auxiliar que retorna todos los usuarios como diccionarios"""
+    return _store.values()
 
 
 def _user_to_dict(user: User):
@@ -50,20 +123,13 @@ def create_user(user: User):
     if not isinstance(user, User):
         raise TypeError("Debe ser un objeto de tipo User")
     
-    users_list = _load_users()
-    
     # Verificar si ya existe un usuario con ese ID
-    for existing_user in users_list:
-        if existing_user["id"] == user.id:
-            print(f"Ya existe un usuario con el ID: {user.id}")
-            return None
+    if user.id in _store:
+        print(f"Ya existe un usuario con el ID: {user.id}")
+        return None
     
-    # Convertir el User a diccionario y agregarlo
-    user_dict = _user_to_dict(user)
-    users_list.append(user_dict)
-    
-    # Guardar archivo
-    _save_users(users_list)
+    # Convertir el User a diccionario y guardarlo
+    _store.put(user.id, _user_to_dict(user))
     
     return user
 
@@ -76,14 +142,10 @@ def update_user(user: User):
     if not isinstance(user, User):
         raise TypeError("Debe ser un objeto de tipo User")
     
-    users_list = _load_users()
-    
     # Buscar y actualizar el usuario
-    for i, existing_user in enumerate(users_list):
-        if existing_user["id"] == user.id:
-            users_list[i] = _user_to_dict(user)
-            _save_users(users_list)
-            return user
+    if user.id in _store:
+        _store.put(user.id, _user_to_dict(user))
+        return user
     
     print(f"No se encontró un usuario con el ID: {user.id}")
     return None
@@ -96,20 +158,8 @@ def create_or_update_user(user: User):
     if not isinstance(user, User):
         raise TypeError("Debe ser un objeto de tipo User")
     
-    users_list = _load_users()
-    
-    # Buscar si ya existe
-    for i, existing_user in enumerate(users_list):
-        if existing_user["id"] == user.id:
-            # Actualizar
-            users_list[i] = _user_to_dict(user)
-            _save_users(users_list)
-            return user
-    
-    # Si no existe, crear
-    user_dict = _user_to_dict(user)
-    users_list.append(user_dict)
-    _save_users(users_list)
+    # Crea el registro si no existe o lo reemplaza si ya existe
+    _store.put(user.id, _user_to_dict(user))
     
     return user
 
@@ -128,47 +178,68 @@ def get_user_by_id(user_id):
     Obtiene un usuario específico por su ID.
     Retorna un objeto User o None si no existe.
     """
-    users_list = _load_users()
+    user_dict = _store.get(user_id)
     
-    for user_dict in users_list:
-        if user_dict["id"] == user_id:
-            return _dict_to_user(user_dict)
+    if user_dict is not None:
+        return _dict_to_user(user_dict)
     
     return None
 
 
+def user_exists(user_id):
+    """Indica si existe un usuario con ese ID sin construir el objeto."""
+    return user_id in _store
+
+
 def delete_user(user_id):
     """
     Elimina un usuario por su ID.
     Retorna True si se eliminó, False si no se encontró.
     """
-    users_list = _load_users()
-    
-    # Filtrar para eliminar el usuario con ese ID
-    new_users_list = [user for user in users_list if user["id"] != user_id]
-    
-    if len(new_users_list) == len(users_list):
+    if not _store.delete(user_id):
         print(f"No se encontró un usuario con el ID: {user_id}")
         return False
     
-    _save_users(new_users_list)
     return True
 
 
+def _sort_by_name(user_ids):
+    """IDs ordenados por nombre normalizado (y por ID ante nombres iguales)."""
+    return sorted(user_ids, key=lambda user_id: (normalize_text(_store.get(user_id)["name"]), user_id))
+
+
 def search_users_by_name(name):
     """
-    Busca usuarios por nombre (búsqueda parcial, no case-sensitive).
-    Retorna una lista de objetos User que coinciden.
+    Busca usuarios por nombre (no distingue mayúsculas ni tildes).
+    Cada palabra buscada debe ser el inicio de alguna palabra del nombre:
+    "and ram" encuentra "Andrés Ramírez". Usa el trie de nombres.
+    Retorna una lista de objetos User ordenada por nombre.
     """
-    users_list = _load_users()
-    matching_users = []
-    
-    name_lower = name.lower()
-    for user_dict in users_list:
-        if name_lower in user_dict["name"].lower():
-            matching_users.append(_dict_to_user(user_dict))
-    
-    return matching_users
+    user_ids = _sort_by_name(_names.search(name))
+    return [_dict_to_user(_store.get(user_id)) for user_id in user_ids]
+
+
+def autocomplete_users(prefix, limit=10):
+    """
+    Sugerencias para lo que se lleva escrito del nombre.
+    Retorna hasta `limit` IDs de usuario, en orden alfabético de la palabra
+    del nombre que coincide.
+    """
+    tokens = tokenize(prefix)
+    if len(tokens) != 1:
+        return _sort_by_name(_names.search(prefix))[:limit]
+
+    # Una sola palabra: se recorre el trie en orden alfabético y se corta
+    # en cuanto hay suficientes sugerencias
+    user_ids = []
+    seen = set()
+    for _, ids in _names.trie().iter_prefix(tokens[0]):
+        for user_id in _sort_by_name(ids - seen):
+            seen.add(user_id)
+            user_ids.append(user_id)
+        if len(user_ids) >= limit:
+            break
+    return user_ids[:limit]
 
 
 def get_users_with_active_loans():
@@ -191,15 +262,11 @@ def get_user_statistics():
     Obtiene estadísticas de usuarios.
     Retorna un diccionario con información resumida.
     """
-    users_list = _load_users()
-    
-    total_users = len(users_list)
-    users_with_loans = sum(1 for user in users_list if user.get("loans") and len(user["loans"]) > 0)
-    total_active_loans = sum(len(user.get("loans", [])) for user in users_list)
+    totals = _stats.totals()
     
     return {
-        "total_users": total_users,
-        "users_with_active_loans": users_with_loans,
-        "users_without_loans": total_users - users_with_loans,
-        "total_active_loans": total_active_loans
+        "total_users": totals["total_users"],
+        "users_with_active_loans": totals["users_with_active_loans"],
+        "users_without_loans": totals["total_users"] - totals["users_with_active_loans"],
+        "total_active_loans": totals["total_active_loans"]
     }
\ No newline at end of file
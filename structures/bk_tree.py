@@ -0,0 +1,153 @@
+from algorithms.levenshtein import levenshtein
+from algorithms.text_normalize import tokenize
+
+
+class _Node:
+    def __init__(self, word):
+        self.word = word
+        self.children = {}   # distancia -> _Node
+        self.active = True
+
+
+class BKTree:
+    """
+    Árbol BK (Burkhard-Keller) de palabras según la distancia de Levenshtein.
+
+    Cada hijo cuelga de su padre con la distancia entre ambos, así que al
+    buscar palabras a distancia <= d de la consulta solo se visitan los
+    hijos con distancia en [dist - d, dist + d] (desigualdad triangular).
+
+    Eliminar una palabra solo la marca como inactiva: el nodo se conserva
+    porque sostiene a sus descendientes, y se reactiva si se vuelve a
+    agregar.
+    """
+
+    def __init__(self):
+        self.root = None
+        self.size = 0
+
+    def add(self, word):
+        if self.root is None:
+            self.root = _Node(word)
+            self.size = 1
+            return
+
+        node = self.root
+        while True:
+            distance = levenshtein(word, node.word)
+            if distance == 0:
+                if not node.active:
+                    node.active = True
+                    self.size += 1
+                return
+            child = node.children.get(distance)
+            if child is None:
+                node.children[distance] = _Node(word)
+                self.size += 1
+                return
+            node = child
+
+    def remove(self, word):
+        """Marca la palabra como eliminada. Retorna False si no estaba."""
+        node = self.root
+        while node is not None:
+            distance = levenshtein(word, node.word)
+            if distance == 0:
+                if node.active:
+                    node.active = False
+                    self.size -= 1
+                    return True
+                return False
+            node = node.children.get(distance)
+        return False
+
+    def search(self, word, max_distance):
+        """Lista de (distancia, palabra) a distancia <= max_distance."""
+        results = []
+        pending = [self.root] if self.root is not None else []
+        while pending:
+            node = pending.pop()
+            distance = levenshtein(word, node.word)
+            if distance <= max_distance and node.active:
+                results.append((distance, node.word))
+            low, high = distance - max_distance, distance + max_distance
+            for d, child in node.children.items():
+                if low <= d <= high:
+                    pending.append(child)
+        return results
+
+    def __len__(self):
+        return self.size
+
+
+class FuzzyIndex:
+    """
+    Búsqueda tolerante a errores de escritura sobre textos de documentos.
+
+    Los textos se dividen en palabras normalizadas; cada palabra distinta se
+    guarda una vez en un BKTree y apunta a los documentos que la contienen.
+    Se actualiza de forma incremental con add / remove / update.
+    """
+
+    def __init__(self):
+        self.tree = BKTree()
+        self.postings = {}     # palabra -> set(doc_id)
+        self.doc_tokens = {}   # doc_id -> set(palabra)
+
+    def add(self, doc_id, text):
+        if doc_id in self.doc_tokens:
+            self.remove(doc_id)
+        tokens = set(tokenize(text))
+        self.doc_tokens[doc_id] = tokens
+        for token in tokens:
+            if token not in self.postings:
+                self.postings[token] = set()
+                self.tree.add(token)
+            self.postings[token].add(doc_id)
+
+    def remove(self, doc_id):
+        tokens = self.doc_tokens.pop(doc_id, None)
+        if tokens is None:
+            return False
+        for token in tokens:
+            docs = self.postings[token]
+            docs.discard(doc_id)
+            if not docs:
+                del self.postings[token]
+                self.tree.remove(token)
+        return True
+
+    def update(self, doc_id, text):
+        self.add(doc_id, text)
+
+    def search(self, query, max_distance=2):
+        """
+        Documentos que contienen, para cada palabra de la consulta, alguna
+        palabra parecida. Retorna {doc_id: distancia total}.
+
+        La tolerancia por palabra es min(max_distance, len(palabra) // 3),
+        para que palabras cortas como "de" no coincidan con cualquier cosa.
+        """
+        tokens = set(tokenize(query))
+        if not tokens:
+            return {}
+
+        totals = None
+        for token in tokens:
+            bound = min(max_distance, len(token) // 3)
+            best = {}
+            for distance, word in self.tree.search(token, bound):
+                for doc_id in self.postings[word]:
+                    if distance < best.get(doc_id, bound + 1):
+                        best[doc_id] = distance
+
+            if totals is None:
+                totals = best
+            else:
+                totals = {doc_id: totals[doc_id] + d for doc_id, d in best.items() if doc_id in totals}
+            if not totals:
+                return {}
+        return totals
+
+    def __len__(self):
+        return len(self.doc_tokens)
@@ -0,0 +1,96 @@
+from bisect import bisect_left, insort
+
+from algorithms.text_normalize import tokenize
+
+
+class InvertedIndex:
+    """
+    Índice invertido: palabra normalizada -> documentos que la contienen.
+
+    - add / remove / update mantienen el índice de forma incremental.
+    - search("gabriel garcia") retorna los documentos que contienen TODAS
+      las palabras de la consulta (AND). Con prefix=True cada palabra de la
+      consulta también coincide con las palabras que empiezan por ella
+      ("garc" -> "garcia"), usando el vocabulario ordenado y bisect.
+
+    El costo de una consulta depende del tamaño de las listas de
+    documentos de sus palabras, no del total de documentos.
+    """
+
+    def __init__(self):
+        self.postings = {}       # palabra -> set(doc_id)
+        self.doc_tokens = {}     # doc_id -> set(palabra), para poder eliminar
+        self.vocabulary = []     # palabras ordenadas (búsqueda por prefijo)
+
+    def add(self, doc_id, text):
+        """Indexa (o reindexa) el texto de un documento."""
+        if doc_id in self.doc_tokens:
+            self.remove(doc_id)
+
+        tokens = set(tokenize(text))
+        self.doc_tokens[doc_id] = tokens
+        for token in tokens:
+            if token not in self.postings:
+                self.postings[token] = set()
+                insort(self.vocabulary, token)
+            self.postings[token].add(doc_id)
+
+    def remove(self, doc_id):
+        """Quita un documento del índice. Retorna False si no estaba."""
+        tokens = self.doc_tokens.pop(doc_id, None)
+        if tokens is None:
+            return False
+        for token in tokens:
+            docs = self.postings[token]
+            docs.discard(doc_id)
+            if not docs:
+                del self.postings[token]
+                i = bisect_left(self.vocabulary, token)
+                del self.vocabulary[i]
+        return True
+
+    def update(self, doc_id, text):
+        self.add(doc_id, text)
+
+    def expand_prefix(self, prefix):
+        """Palabras del vocabulario que empiezan por `prefix`."""
+        i = bisect_left(self.vocabulary, prefix)
+        matches = []
+        while i < len(self.vocabulary) and self.vocabulary[i].startswith(prefix):
+            matches.append(self.vocabulary[i])
+            i += 1
+        return matches
+
+    def _docs_for(self, token, prefix):
+        if not prefix:
+            return self.postings.get(token, set())
+        words = self.expand_prefix(token)
+        if len(words) == 1:
+            return self.postings[words[0]]
+        docs = set()
+        for word in words:
+            docs |= self.postings[word]
+        return docs
+
+    def search(self, query, prefix=True):
+        """
+        Documentos que contienen todas las palabras de la consulta.
+        Una consulta sin palabras retorna todos los documentos.
+        """
+        tokens = set(tokenize(query))
+        if not tokens:
+            return set(self.doc_tokens)
+
+        postings = sorted((self._docs_for(token, prefix) for token in tokens), key=len)
+        result = set(postings[0])
+        for docs in postings[1:]:
+            if not result:
+                break
+            result &= docs
+        return result
+
+    def __len__(self):
+        return len(self.doc_tokens)
+
+    def __contains__(self, doc_id):
+        return doc_id in self.doc_tokens
@@ -1,6 +1,14 @@
+from collections import deque
+
+
 class Queue:
-    def __init__(self):
-        self.items = []
+    """
+    Cola FIFO sobre collections.deque: enqueue y dequeue son O(1)
+    (una lista con pop(0) desplaza todos los elementos en cada dequeue).
+    """
+
+    def __init__(self, items=()):
+        self.items = deque(items)
 
     def is_empty(self):
         return len(self.items) == 0
@@ -11,7 +19,7 @@ class Queue:
     def dequeue(self):
         if self.is_empty():
             return None
-        return self.items.pop(0)
+        return self.items.popleft()
 
     def front(self):
         if self.is_empty():
@@ -25,4 +33,4 @@ class Queue:
         return list(self.items)
 
     def __str__(self):
-        return str(self.items)
+        return str(list(self.items))
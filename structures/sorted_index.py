@@ -0,0 +1,99 @@
+from bisect import bisect_left, insort
+
+
+class SortedIndex:
+    """
+    Índice ordenado de pares (clave de orden, elemento).
+
+    Mantiene una lista ordenada con bisect: insertar y eliminar buscan la
+    posición en O(log n) y las consultas por rango solo recorren los
+    elementos que coinciden. Los elementos con la misma clave de orden
+    quedan ordenados por el propio elemento, así que deben ser comparables
+    entre sí (por ejemplo ISBN o IDs de préstamo).
+    """
+
+    def __init__(self, pairs=()):
+        self.items = sorted(pairs)
+
+    def add(self, sort_key, element):
+        insort(self.items, (sort_key, element))
+
+    def remove(self, sort_key, element):
+        """Elimina el par. Retorna False si no estaba en el índice."""
+        i = bisect_left(self.items, (sort_key, element))
+        if i < len(self.items) and self.items[i] == (sort_key, element):
+            del self.items[i]
+            return True
+        return False
+
+    def clear(self):
+        self.items = []
+
+    def _bounds(self, low, high, include_low, include_high):
+        """Posiciones [inicio, fin) de las claves dentro del rango."""
+        if low is None:
+            start = 0
+        elif include_low:
+            start = bisect_left(self.items, (low,))
+        else:
+            start = bisect_left(self.items, (low, _Top))
+        if high is None:
+            end = len(self.items)
+        elif include_high:
+            end = bisect_left(self.items, (high, _Top))
+        else:
+            end = bisect_left(self.items, (high,))
+        return start, max(start, end)
+
+    def range(self, low=None, high=None, include_low=True, include_high=True):
+        """Elementos con clave entre low y high (None = sin límite), en orden."""
+        start, end = self._bounds(low, high, include_low, include_high)
+        return [element for _, element in self.items[start:end]]
+
+    def count(self, low=None, high=None, include_low=True, include_high=True):
+        """Cantidad de elementos en el rango, sin recorrerlos."""
+        start, end = self._bounds(low, high, include_low, include_high)
+        return end - start
+
+    def first_at_least(self, low):
+        """Primer par (clave, elemento) con clave >= low, o None."""
+        i = bisect_left(self.items, (low,))
+        return self.items[i] if i < len(self.items) else None
+
+    def smallest(self, k):
+        """Los k elementos de menor clave."""
+        return [element for _, element in self.items[:max(k, 0)]]
+
+    def largest(self, k):
+        """Los k elementos de mayor clave (de mayor a menor)."""
+        if k <= 0:
+            return []
+        return [element for _, element in reversed(self.items[-k:])]
+
+    def __len__(self):
+        return len(self.items)
+
+    def __iter__(self):
+        return (element for _, element in self.items)
+
+    def __str__(self):
+        return str(self.items)
+
+
+class _TopType:
+    """Valor mayor que cualquier elemento (para cotas superiores con bisect)."""
+
+    def __lt__(self, other):
+        return False
+
+    def __gt__(self, other):
+        return True
+
+    def __eq__(self, other):
+        return isinstance(other, _TopType)
+
+    def __hash__(self):
+        return 0
+
+
+_Top = _TopType()
@@ -0,0 +1,157 @@
+class _TrieNode:
+    __slots__ = ("label", "children", "values")
+
+    def __init__(self, label="", values=None):
+        self.label = label    # Texto de la arista que llega a este nodo
+        self.children = {}    # primer carácter de la arista -> _TrieNode
+        self.values = values  # Conjunto de valores si aquí termina una palabra, o None
+
+
+class Trie:
+    """
+    Árbol de prefijos comprimido (radix trie): palabra -> conjunto de
+    valores (por ejemplo IDs).
+
+    Las cadenas de nodos con un solo hijo se guardan como una única arista
+    con varios caracteres, y solo los nodos donde termina una palabra
+    guardan valores, así que la memoria crece con la cantidad de palabras y
+    no con la cantidad de caracteres.
+
+    Buscar un prefijo cuesta lo que mide el prefijo; recorrer las palabras
+    que empiezan por él cuesta lo que mide ese subárbol, no el total de
+    palabras. Al eliminar se podan las ramas vacías y se vuelven a unir las
+    aristas que quedan con un solo hijo.
+    """
+
+    def __init__(self):
+        self.root = _TrieNode()
+
+    def insert(self, word, value):
+        node = self.root
+        i = 0
+        while i < len(word):
+            child = node.children.get(word[i])
+            if child is None:
+                node.children[word[i]] = _TrieNode(word[i:], {value})
+                return
+
+            label = child.label
+            common = _common_prefix(label, word, i)
+            if common < len(label):
+                # La palabra se separa a mitad de la arista: dividirla
+                middle = _TrieNode(label[:common])
+                child.label = label[common:]
+                middle.children[child.label[0]] = child
+                node.children[word[i]] = middle
+                child = middle
+            node = child
+            i += common
+
+        if node.values is None:
+            node.values = set()
+        node.values.add(value)
+
+    def remove(self, word, value):
+        """Quita el valor de la palabra. Retorna False si no estaba."""
+        path = [self.root]
+        i = 0
+        while i < len(word):
+            child = path[-1].children.get(word[i])
+            if child is None or not word.startswith(child.label, i):
+                return False
+            path.append(child)
+            i += len(child.label)
+
+        node = path[-1]
+        if node.values is None or value not in node.values:
+            return False
+        node.values.discard(value)
+        if node.values:
+            return True
+        node.values = None
+
+        # Podar el nodo si quedó vacío y volver a comprimir la rama
+        if node is not self.root:
+            parent = path[-2]
+            if not node.children:
+                del parent.children[node.label[0]]
+                if parent is not self.root and parent.values is None and len(parent.children) == 1:
+                    _merge_with_child(parent)
+            elif len(node.children) == 1:
+                _merge_with_child(node)
+        return True
+
+    def _find(self, prefix):
+        """
+        Nodo cuyo subárbol contiene las palabras con ese prefijo y la
+        palabra completa hasta ese nodo, o None.
+        """
+        node = self.root
+        word = ""
+        i = 0
+        while i < len(prefix):
+            child = node.children.get(prefix[i])
+            if child is None:
+                return None
+            rest = prefix[i:]
+            if child.label.startswith(rest):
+                # El prefijo termina dentro (o al final) de esta arista
+                return child, word + child.label
+            if not rest.startswith(child.label):
+                return None
+            word += child.label
+            i += len(child.label)
+            node = child
+        return node, word
+
+    def iter_prefix(self, prefix):
+        """Genera (palabra, valores) de las palabras con ese prefijo, en orden alfabético."""
+        found = self._find(prefix)
+        if found is None:
+            return
+        pending = [found]
+        while pending:
+            node, word = pending.pop()
+            if node.values:
+                yield word, node.values
+            # Apilar en orden inverso para visitar en orden alfabético
+            for char in sorted(node.children, reverse=True):
+                child = node.children[char]
+                pending.append((child, word + child.label))
+
+    def values_with_prefix(self, prefix):
+        """Unión de los valores de todas las palabras con ese prefijo."""
+        result = set()
+        for _, values in self.iter_prefix(prefix):
+            result |= values
+        return result
+
+    def words_with_prefix(self, prefix, limit=None):
+        """Palabras con ese prefijo en orden alfabético (hasta `limit`)."""
+        words = []
+        for word, _ in self.iter_prefix(prefix):
+            if limit is not None and len(words) >= limit:
+                break
+            words.append(word)
+        return words
+
+    def __contains__(self, word):
+        found = self._find(word)
+        return found is not None and found[1] == word and bool(found[0].values)
+
+
+def _common_prefix(label, word, start):
+    """Largo del prefijo común entre `label` y word[start:]."""
+    n = min(len(label), len(word) - start)
+    i = 0
+    while i < n and label[i] == word[start + i]:
+        i += 1
+    return i
+
+
+def _merge_with_child(node):
+    """Une un nodo sin valores con su único hijo en una sola arista."""
+    (child,) = node.children.values()
+    node.label += child.label
+    node.children = child.children
+    node.values = child.values
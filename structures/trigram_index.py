@@ -0,0 +1,80 @@
+from algorithms.text_normalize import normalize_text
+
+
+def trigrams(text):
+    """Conjunto de subcadenas de 3 caracteres del texto (ya normalizado)."""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class TrigramIndex:
+    """
+    Índice de trigramas para búsqueda por subcadena.
+
+    Cada documento se guarda normalizado (sin tildes, en minúsculas) y se
+    indexa por todas sus subcadenas de 3 caracteres. Para buscar "soled"
+    se intersectan las listas de "sol", "ole" y "led" (empezando por la más
+    corta) y solo esos candidatos se verifican con `in`.
+
+    Las consultas de menos de 3 caracteres no tienen trigramas y se
+    verifican contra todos los documentos.
+    """
+
+    def __init__(self):
+        self.postings = {}   # trigrama -> set(doc_id)
+        self.texts = {}      # doc_id -> texto normalizado
+
+    def add(self, doc_id, text):
+        """Indexa (o reindexa) el texto de un documento."""
+        if doc_id in self.texts:
+            self.remove(doc_id)
+        text = normalize_text(text)
+        self.texts[doc_id] = text
+        for gram in trigrams(text):
+            self.postings.setdefault(gram, set()).add(doc_id)
+
+    def remove(self, doc_id):
+        """Quita un documento del índice. Retorna False si no estaba."""
+        text = self.texts.pop(doc_id, None)
+        if text is None:
+            return False
+        for gram in trigrams(text):
+            docs = self.postings[gram]
+            docs.discard(doc_id)
+            if not docs:
+                del self.postings[gram]
+        return True
+
+    def update(self, doc_id, text):
+        self.add(doc_id, text)
+
+    def candidates(self, query):
+        """Documentos que contienen todos los trigramas de la consulta."""
+        grams = trigrams(query)
+        if not grams:
+            return set(self.texts)
+
+        postings = []
+        for gram in grams:
+            docs = self.postings.get(gram)
+            if not docs:
+                return set()
+            postings.append(docs)
+        postings.sort(key=len)
+
+        result = set(postings[0])
+        for docs in postings[1:]:
+            result &= docs
+            if not result:
+                break
+        return result
+
+    def search(self, query):
+        """Documentos cuyo texto contiene `query` (sin importar tildes ni mayúsculas)."""
+        query = normalize_text(query)
+        return {doc_id for doc_id in self.candidates(query) if query in self.texts[doc_id]}
+
+    def __len__(self):
+        return len(self.texts)
+
+    def __contains__(self, doc_id):
+        return doc_id in self.texts
@@ -0,0 +1,5 @@
+import sys
+import os
+
+# Agregar el directorio raíz al path para poder importar los módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,152 @@
+"""
+Pruebas del almacén de registros con journal (persistence.record_store):
+reaplicación del journal, transacciones, compactación y cuarentena.
+"""
+
+import json
+
+import pytest
+
+from persistence.record_store import Journal, RecordStore, quarantine_path, save_json
+
+
+def _open(tmp_path, name="books", journal=None):
+    journal = journal or Journal(tmp_path / "journal.jsonl")
+    store = RecordStore(name, tmp_path / f"{name}.json", key="isbn",
+                        index_fields=("author",), journal=journal)
+    return store, journal
+
+
+def _book(isbn, author="A", **extra):
+    return {"isbn": isbn, "title": f"T{isbn}", "author": author, **extra}
+
+
+def _read(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_journal_replay_rebuilds_state(tmp_path):
+    save_json(tmp_path / "books.json", [_book("1"), _book("2")])
+    store, _ = _open(tmp_path)
+    store.put("3", _book("3", author="B"))
+    store.put("1", _book("1", author="B"))
+    store.delete("2")
+
+    # Otro proceso: solo ve el snapshot original más el journal
+    reopened, _ = _open(tmp_path)
+    assert reopened.keys() == ["1", "3"]
+    assert reopened.get("1")["author"] == "B"
+    assert sorted(r["isbn"] for r in reopened.find("author", "B")) == ["1", "3"]
+    assert _read(tmp_path / "books.json") == [_book("1"), _book("2")]
+
+
+def test_journal_ignores_incomplete_line(tmp_path):
+    store, journal = _open(tmp_path)
+    store.put("1", _book("1"))
+    with open(journal.path, "a", encoding="utf-8") as f:
+        f.write('{"ops": [{"store": "books", "op": "put", "key": "2"')
+
+    reopened, _ = _open(tmp_path)
+    assert reopened.keys() == ["1"]
+
+
+def test_transaction_is_one_journal_line(tmp_path):
+    store, journal = _open(tmp_path)
+    with journal.transaction():
+        store.put("1", _book("1"))
+        store.put("2", _book("2"))
+
+    with open(journal.path, encoding="utf-8") as f:
+        lines = f.readlines()
+    assert len(lines) == 1
+    assert len(json.loads(lines[0])["ops"]) == 2
+
+
+def test_transaction_rollback_discards_changes(tmp_path):
+    store, journal = _open(tmp_path)
+    store.put("1", _book("1"))
+
+    with pytest.raises(RuntimeError):
+        with journal.transaction():
+            store.put("2", _book("2"))
+            store.delete("1")
+            raise RuntimeError("falla a mitad de la transacción")
+
+    assert store.keys() == ["1"]
+    assert store.find("author", "A") == [_book("1")]
+    assert journal.pending_operations() == 1
+
+
+def test_compaction_rewrites_snapshot_and_empties_journal(tmp_path):
+    save_json(tmp_path / "books.json", [_book("1")])
+    store, journal = _open(tmp_path)
+    store.put("2", _book("2"))
+    store.delete("1")
+    journal.compact()
+
+    assert _read(tmp_path / "books.json") == [_book("2")]
+    assert journal.pending_operations() == 0
+    assert (tmp_path / "books.idx.json").is_file()
+
+    reopened, _ = _open(tmp_path)
+    assert reopened.items() == [("2", _book("2"))]
+
+
+def test_compaction_keeps_operations_of_unloaded_stores(tmp_path):
+    store, journal = _open(tmp_path)
+    journal.record({"store": "users", "op": "put", "key": "9", "value": {"id": "9"}})
+    store.put("1", _book("1"))
+    journal.compact()
+
+    assert journal.read() == [{"store": "users", "op": "put", "key": "9", "value": {"id": "9"}}]
+
+
+def test_automatic_compaction(tmp_path):
+    journal = Journal(tmp_path / "journal.jsonl", compact_every=3)
+    store, _ = _open(tmp_path, journal=journal)
+    for isbn in "123":
+        store.put(isbn, _book(isbn))
+
+    assert journal.pending_operations() == 0
+    assert [r["isbn"] for r in _read(tmp_path / "books.json")] == ["1", "2", "3"]
+
+
+def test_duplicate_keys_are_quarantined_not_lost(tmp_path, caplog):
+    rows = [_book("1"), _book("1", author="B"), _book("2"), _book("1", author="C")]
+    save_json(tmp_path / "books.json", rows)
+
+    with caplog.at_level("WARNING"):
+        store, journal = _open(tmp_path)
+        assert store.get("1") == _book("1")
+    assert "clave repetida" in caplog.text
+    assert store.duplicates == [_book("1", author="B"), _book("1", author="C")]
+
+    store.put("2", _book("2", author="D"))
+    journal.compact()
+
+    assert _read(tmp_path / "books.json") == [_book("1"), _book("2", author="D")]
+    quarantined = _read(quarantine_path(tmp_path / "books.json"))
+    assert [q["record"] for q in quarantined] == [_book("1", author="B"), _book("1", author="C")]
+
+    # Una segunda compactación no vuelve a copiarlos
+    store.put("3", _book("3"))
+    journal.compact()
+    assert len(_read(quarantine_path(tmp_path / "books.json"))) == 2
+
+
+def test_deleted_keys_track_deletes_until_compaction(tmp_path):
+    save_json(tmp_path / "books.json", [_book("1"), _book("2"), _book("3")])
+    store, journal = _open(tmp_path)
+    store.delete("1")
+    store.delete("2")
+    store.put("2", _book("2"))
+    assert store.deleted_keys == {"1"}
+
+    # Otro proceso las ve al reaplicar el journal
+    reopened, _ = _open(tmp_path)
+    reopened.refresh()
+    assert reopened.deleted_keys == {"1"}
+
+    journal.compact()
+    assert store.deleted_keys == set()
@@ -0,0 +1,49 @@
+"""
+Pruebas de las funciones de reportes (algorithms.report_recursive).
+"""
+
+from models.book import Book
+from structures.stack import Stack
+from structures.queue import Queue
+from algorithms.report_recursive import (
+    iter_stack,
+    iter_queue,
+    show_stack,
+    show_queue,
+    iter_books_by_author,
+    total_value_by_author,
+    average_weight_by_author,
+)
+
+
+def test_stack_and_queue_stream_large_structures(capsys):
+    stack = Stack()
+    for i in range(5000):
+        stack.push(i)
+    queue = Queue(range(5000))
+
+    assert list(iter_stack(stack)) == list(range(4999, -1, -1))
+    assert list(iter_queue(queue)) == list(range(5000))
+
+    show_stack(stack)
+    show_queue(queue, lambda item: f"* {item}")
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0] == "- 4999" and lines[4999] == "- 0"
+    assert lines[5000] == "* 0" and lines[-1] == "* 4999"
+
+    # Las estructuras no cambian
+    assert stack.items == list(range(5000))
+    assert list(queue.items) == list(range(5000))
+
+
+def test_author_helpers_ignore_case_and_accents():
+    books = [
+        Book("1", "Cien años", "Gabriel García", 1.5, 50000),
+        Book("2", "El otoño", "gabriel  garcia", 0.5, 30000),
+        Book("3", "Rayuela", "Julio Cortázar", 1.0, 40000),
+    ] * 500
+
+    assert len(list(iter_books_by_author(books, "GABRIEL GARCIA"))) == 1000
+    assert total_value_by_author(books, "gabriel garcía") == 80000 * 500
+    assert average_weight_by_author(books, "Gabriel García") == 1.0
+    assert average_weight_by_author(books, "Borges") == 0.0
@@ -0,0 +1,41 @@
+"""
+Pruebas de las combinaciones de estantes: la versión por generador (con
+poda) y la paralela deben dar lo mismo que la fuerza bruta manual.
+"""
+
+import random
+
+from models.book import Book
+from algorithms.brute_force_shelf import (
+    brute_force_shelf_manual,
+    count_shelf_combinations,
+    iter_shelf_combinations,
+)
+from algorithms.parallel_shelf import parallel_count_shelf_combinations
+
+
+def _books(weights):
+    return [Book(str(i), f"T{i}", "A", w, 1000) for i, w in enumerate(weights)]
+
+
+def _isbn_sets(combos):
+    return sorted(tuple(sorted(b.isbn for b in combo)) for combo in combos)
+
+
+def test_counts_match_manual_at_float_boundary():
+    # 3.2 + 2.1 + 1.9 + 0.8 suma 8.000000000000002 en punto flotante
+    books = _books([3.2, 2.1, 1.9, 0.8, 4.0, 0.5])
+    manual = brute_force_shelf_manual(books, max_weight=8)
+
+    assert [b.isbn for b in manual[0]] == ["0", "1", "2", "3"]
+    assert count_shelf_combinations(books, max_weight=8) == len(manual)
+
+
+def test_streaming_matches_manual_on_random_books():
+    rng = random.Random(7)
+    books = _books([round(rng.uniform(0.2, 4.0), 1) for _ in range(30)])
+    manual = brute_force_shelf_manual(books, max_weight=8)
+
+    assert count_shelf_combinations(books, max_weight=8) == len(manual)
+    assert _isbn_sets(iter_shelf_combinations(books, max_weight=8)) == _isbn_sets(manual)
+    assert parallel_count_shelf_combinations(books, max_weight=8, workers=1) == len(manual)
@@ -0,0 +1,85 @@
+"""
+Pruebas del planificador de estanterías (algorithms.shelf_planner).
+"""
+
+import random
+import time
+
+from models.book import Book
+from models.shelf import Shelf
+from algorithms.shelf_planner import (
+    best_fit_decreasing,
+    fill_rows_decreasing,
+    improve_rows,
+    min_rows,
+    plan_shelves,
+)
+
+
+def _books(weights):
+    return [Book(str(i), f"T{i}", "A", w, 1000) for i, w in enumerate(weights)]
+
+
+def _check_plan(books, plan):
+    placed = []
+    for layout in plan["shelves"]:
+        assert len(layout) == Shelf.ROWS
+        for row in layout:
+            assert len(row) <= Shelf.COLUMNS
+            assert sum(b.weight for b in row) <= Shelf.MAX_WEIGHT_PER_ROW + 1e-9
+            placed.extend(b.isbn for b in row)
+    placed.extend(b.isbn for b in plan["unplaced"])
+    assert sorted(placed) == sorted(b.isbn for b in books)
+    assert plan["rows"] == sum(1 for layout in plan["shelves"] for row in layout if row)
+
+
+def test_plan_respects_row_limits_and_places_every_book():
+    rng = random.Random(3)
+    for _ in range(50):
+        weights = [round(rng.uniform(0.2, 5.5), 2) for _ in range(rng.randint(1, 150))]
+        books = _books(weights + [9.5])
+        plan = plan_shelves(books)
+
+        _check_plan(books, plan)
+        assert [b.weight for b in plan["unplaced"]] == [9.5]
+        assert plan["rows"] >= min_rows(books[:-1])
+        assert plan["rows"] <= len(best_fit_decreasing(books)[0])
+
+
+def test_fill_rows_balances_heavy_and_light_books():
+    # 4 pesados + 12 livianos: caben exactamente en 4 filas de 4 libros
+    books = _books([5.0] * 4 + [1.0] * 12)
+    rows, unplaced = fill_rows_decreasing(books)
+
+    assert not unplaced
+    assert len(rows) == 4
+    assert all(len(row) == 4 and sum(b.weight for b in row) == 8.0 for row in rows)
+
+
+def test_local_search_empties_rows():
+    a, b, c, d = _books([4.0, 3.0, 1.0, 4.0])
+    rows = improve_rows([[a], [b, c], [d]], lower_bound=2)
+
+    assert len(rows) == 2
+    assert sorted(sum(x.weight for x in row) for row in rows) == [4.0, 8.0]
+
+
+def test_local_search_undoes_failed_moves():
+    a, b, c = _books([5.0, 5.0, 2.0])
+    rows = improve_rows([[a], [b, c]])
+
+    assert sorted([x.isbn for x in row] for row in rows) == [["0"], ["1", "2"]]
+
+
+def test_library_sized_plan_finishes():
+    rng = random.Random(1)
+    books = _books([round(rng.uniform(0.1, 3.5), 2) for _ in range(10_000)])
+
+    start = time.monotonic()
+    plan = plan_shelves(books, time_limit=1.0)
+    elapsed = time.monotonic() - start
+
+    _check_plan(books, plan)
+    assert plan["rows"] == min_rows(books) == 2500
+    assert plan["min_shelves"] == len(plan["shelves"]) == 500
+    assert elapsed < 10
@@ -0,0 +1,64 @@
+"""
+Pruebas de las estructuras de datos.
+"""
+
+import random
+
+from structures.trie import Trie
+
+
+def _reference_prefix(words, prefix):
+    return sorted((w, set(v)) for w, v in words.items() if v and w.startswith(prefix))
+
+
+def test_trie_prefix_search_and_order():
+    trie = Trie()
+    for word, value in [("ana", 1), ("andres", 2), ("andrea", 3), ("an", 4), ("bea", 5), ("ana", 6)]:
+        trie.insert(word, value)
+
+    assert trie.words_with_prefix("an") == ["an", "ana", "andrea", "andres"]
+    assert trie.words_with_prefix("and") == ["andrea", "andres"]
+    assert trie.values_with_prefix("ana") == {1, 6}
+    assert trie.words_with_prefix("andx") == []
+    assert trie.words_with_prefix("", limit=2) == ["an", "ana"]
+    assert "ana" in trie and "and" not in trie and "andr" not in trie
+
+
+def test_trie_is_compressed_and_pruned():
+    trie = Trie()
+    trie.insert("andres", 1)
+    trie.insert("andrea", 2)
+    assert trie.root.children["a"].label == "andre"
+    assert trie.root.children["a"].values is None
+
+    assert trie.remove("andrea", 2)
+    assert not trie.remove("andrea", 2)
+    assert not trie.remove("andr", 1)
+    # La rama vuelve a quedar como una sola arista
+    node = trie.root.children["a"]
+    assert (node.label, node.children, node.values) == ("andres", {}, {1})
+
+    assert trie.remove("andres", 1)
+    assert trie.root.children == {}
+
+
+def test_trie_matches_reference_on_random_operations():
+    rng = random.Random(3)
+    trie = Trie()
+    reference = {}
+    for _ in range(3000):
+        word = "".join(rng.choice("abc") for _ in range(rng.randint(1, 6)))
+        value = rng.randint(1, 5)
+        if rng.random() < 0.6:
+            trie.insert(word, value)
+            reference.setdefault(word, set()).add(value)
+        else:
+            expected = value in reference.get(word, ())
+            assert trie.remove(word, value) == expected
+            if expected:
+                reference[word].discard(value)
+
+    for prefix in ["", "a", "ab", "abc", "ca", "bbb", "cacac"]:
+        assert list((w, set(v)) for w, v in trie.iter_prefix(prefix)) == _reference_prefix(reference, prefix)
+    for word, values in reference.items():
+        assert (word in trie) == bool(values)